@@ -7,21 +7,505 @@ This script:
 2. Classifies proposals by business use case
 3. Classifies proposals by technical architecture
 4. Classifies proposals by implementation complexity
-5. Generates summary statistics
-6. Saves all outputs to the outputs/ directory
+5. Discovers iteration shapes (map-reduce) and classifies proposals into them
+6. Generates summary statistics
+7. Saves all outputs to the outputs/ directory
 
 Usage:
     python analyze.py                       # Full analysis (all 725 proposals)
     python analyze.py --sample 100          # Analyze sample of 100 proposals
+    python analyze.py --sample 0.1 --ci-width 0.05  # Extend a 10% sample until intervals are tight
     python analyze.py --skip-business       # Skip business clustering (use existing)
     python analyze.py --skip-architecture   # Skip architecture classification
     python analyze.py --skip-implementation # Skip implementation complexity classification
+    python analyze.py --skip-iteration-shape  # Skip iteration shape classification
+    python analyze.py --workers 4           # Run 4 LLM calls concurrently (per phase)
+    python analyze.py --sequential          # Run phases one at a time (phases 3 and 4 run concurrently by default)
+    python analyze.py --hierarchical-discovery  # Discover business clusters from all proposals
+    python analyze.py --cascade             # Cheap model first, escalate uncertain labels
+    python analyze.py --propagate-threshold 0.9  # Copy labels to near-duplicate proposals
+    python analyze.py --no-dedup            # Classify near-duplicate proposals individually
+    python analyze.py --compress            # Token-budgeted extractive text compression in prompts
+    python analyze.py --rediscover          # Discover new taxonomies instead of reusing the registered ones
+    python analyze.py --taxonomy business=2 # Classify against business taxonomy version 2
+    python analyze.py --incremental         # Re-extract, classify only new or changed proposals
+    python analyze.py --watch               # Keep outputs and visualizations up to date as proposals land
 """
 
 import argparse
-import random
-from collections import defaultdict
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import partial
+from typing import Set
 from utils import *
+import telemetry
+import profiling
+import events
+import label_cache
+import taxonomy
+import compression
+import sampling
+import database
+from neighbors import plan_propagation, apply_propagation, DEFAULT_AUDIT_RATE
+from schemas import classification_tool, template_schema, validate_classification
+from pipeline import Stage, run_stages
+from records import to_records, copy_record, reset_text_store, ID_FIELDS, TEXT_FIELDS
+from dedup import mark_duplicates, unique_proposals, DEFAULT_THRESHOLD as DEFAULT_DEDUP_THRESHOLD
+from company_index import build_company_index
+from watch import snapshot, wait_for_changes, DEFAULT_INTERVAL as DEFAULT_WATCH_INTERVAL, DEFAULT_DEBOUNCE
+
+
+# Fields written by each classification phase
+BUSINESS_FIELDS = ['business_use_case']
+ARCHITECTURE_FIELDS = [
+    'architecture_pattern', 'reasoning_pattern', 'execution_pattern',
+    'knowledge_representation', 'input_modalities', 'tool_integration',
+    'human_oversight', 'architecture_confidence'
+]
+IMPLEMENTATION_FIELDS = [
+    'data_complexity', 'integration_complexity', 'prompt_complexity',
+    'chain_depth', 'schema_complexity', 'state_management', 'error_handling',
+    'evaluation_complexity', 'domain_expertise', 'latency_requirements',
+    'regulatory_requirements', 'rerepresentation_type'
+]
+ITERATION_SHAPE_FIELDS = ['iteration_shape', 'iteration_shape_confidence', 'iteration_shape_reasoning']
+
+# Fields each phase adds to the proposal files: its labels and propagation flag
+PHASE_COLUMNS = {
+    'business': BUSINESS_FIELDS + ['business_propagated_from'],
+    'architecture': ARCHITECTURE_FIELDS + ['architecture_propagated_from'],
+    'implementation': IMPLEMENTATION_FIELDS + ['implementation_propagated_from'],
+    'iteration_shape': ITERATION_SHAPE_FIELDS + ['iteration_shape_propagated_from'],
+}
+
+
+def proposal_columns(proposals: List[Dict[str, Any]], *phases: str) -> List[str]:
+    """
+    Declared CSV columns of a proposal file, so save_csv streams the rows
+    instead of collecting every key first: identity, the text fields and
+    dedup bookkeeping, then the PHASE_COLUMNS of each phase.
+
+    Text, dedup and each phase's labels are set on all proposals at once, so
+    the first proposal shows which of them the file holds. `phases` names
+    phases whose labels may be missing on some proposals (the phase itself
+    and those it depends on, which may have been loaded from an earlier run,
+    or the labels an incremental run keeps for unchanged proposals).
+    """
+    first = proposals[0] if proposals else {}
+    columns = list(ID_FIELDS)
+    if any(field in first for field in TEXT_FIELDS):
+        columns += TEXT_FIELDS
+    if 'duplicate_of' in first:
+        columns += ['duplicate_of', 'duplicate_count']
+    for phase, fields in PHASE_COLUMNS.items():
+        if phase in phases or fields[0] in first:
+            columns += fields
+    return columns
+
+
+# ============================================================================
+# Batch Classification
+# ============================================================================
+
+def classify_in_batches(proposals: List[Dict[str, Any]], template_name: str,
+                        batch_size: int, max_tokens: int, index_field: str,
+                        apply_classification, apply_defaults,
+                        label_fields: List[str], phase: str,
+                        propagate_threshold: Optional[float] = None,
+                        audit_rate: float = DEFAULT_AUDIT_RATE,
+                        stream: bool = False, structured: bool = False,
+                        max_resubmits: int = 2, max_workers: int = 1,
+                        models: Optional[List[str]] = None,
+                        only_unlabeled: bool = False,
+                        cache_exclude: Sequence[str] = (),
+                        **template_kwargs) -> Optional[Dict[str, Any]]:
+    """
+    Classify proposals in batches, one LLM call per batch.
+
+    Proposals marked as near-duplicates by the dedup stage (`duplicate_of`)
+    are not sent to the LLM; they receive the labels of their canonical
+    proposal once it has been classified.
+
+    Proposals whose input matches an entry of the label cache (see
+    label_cache.py, on unless --no-cache) get the cached labels without an
+    LLM call; newly classified and propagated proposals are added to the cache.
+
+    Args:
+        proposals: Proposals to classify (updated in place)
+        template_name: Classification prompt template
+        batch_size: Number of proposals per prompt
+        max_tokens: Maximum tokens per response
+        index_field: Key holding the 1-based proposal index in each classification
+        apply_classification: Function(proposal, classification) writing the labels
+        apply_defaults: Function(proposal) writing 'Unknown' labels on failure
+        label_fields: Fields written by this phase (copied on propagation)
+        phase: Phase name, used for the `<phase>_propagated_from` flag
+        propagate_threshold: If set, near-duplicates with at least this similarity
+            copy labels from their neighbor instead of calling the LLM
+        audit_rate: Share of propagated proposals still classified as a spot-check
+        stream: Stream responses and apply each classification as soon as it
+            is complete (see call_llm_stream)
+        structured: Force a tool call whose JSON schema enumerates the allowed
+            values of every dimension (see schemas.py) instead of parsing text
+        max_resubmits: How often proposals missing from a response are re-submitted
+        max_workers: Number of batches sent to the API concurrently
+        models: Models to classify with (default: MODEL). With several models
+            this is a cascade, cheapest first: every proposal is classified by
+            the first model, and proposals it labels with low confidence, with
+            values outside the schema, or not at all are re-classified by the
+            next one. Tier statistics go to cascade_report.json.
+        only_unlabeled: Leave proposals that already carry this phase's labels
+            (kept from an earlier run, see --incremental) as they are
+        cache_exclude: Input fields the template does not read, left out of
+            the label cache key (e.g. TEXT_FIELDS for prompts without text)
+        **template_kwargs: Extra variables for the template
+
+    Returns:
+        Propagation statistics, or None if propagation is disabled
+    """
+    # Duplicates whose canonical proposal is in this run reuse its labels
+    by_key = {proposal_key(p): p for p in proposals if not p.get('duplicate_of')}
+    duplicates = [p for p in proposals if p.get('duplicate_of') in by_key]
+    if duplicates:
+        print(f"  Skipping {len(duplicates)} duplicate proposals (labels copied from canonical)")
+        duplicate_ids = set(map(id, duplicates))
+        proposals = [p for p in proposals if id(p) not in duplicate_ids]
+
+    if only_unlabeled:
+        unlabeled = [p for p in proposals if label_fields[0] not in p]
+        if len(unlabeled) < len(proposals):
+            print(f"  Keeping the labels of {len(proposals) - len(unlabeled)} unchanged proposals")
+        proposals = unlabeled
+
+    cache_keys = {}
+    cached = []
+    own_fields = label_fields + [f'{phase}_propagated_from']
+    if label_cache.enabled():
+        phase_hash = label_cache.phase_key(template_name, template_kwargs, models or [MODEL], get_backend().name)
+        for p in proposals:
+            key = label_cache.proposal_key(phase_hash, p, own_fields + list(cache_exclude))
+            labels = label_cache.lookup(phase, key)
+            if labels is not None:
+                p.update(labels)
+                cached.append(p)
+            else:
+                cache_keys[id(p)] = key
+        if cached:
+            print(f"  Reusing cached labels of {len(cached)} proposals")
+            proposals = [p for p in proposals if id(p) in cache_keys]
+
+    plan = None
+    to_classify = proposals
+    if propagate_threshold:
+        plan = plan_propagation(proposals, propagate_threshold, audit_rate)
+        to_classify = [p for i, p in enumerate(proposals)
+                       if i not in plan.followers or i in plan.audited]
+        print(f"  Propagating labels to {len(plan.followers) - len(plan.audited)} near-duplicates "
+              f"(similarity >= {propagate_threshold}, {len(plan.audited)} audited)")
+
+    cascade = models is not None and len(models) > 1
+    if cascade:
+        template_kwargs = {**template_kwargs, 'ask_confidence': True}
+        _, cascade_values = template_schema(template_name, **template_kwargs)
+
+    tool = None
+    allowed_values = None
+    schema_violations = 0
+    if structured:
+        tool = classification_tool(template_name, **template_kwargs)
+        _, allowed_values = template_schema(template_name, **template_kwargs)
+        template_kwargs = {**template_kwargs, 'structured': True}
+
+    def needs_escalation(classif):
+        """Cascade: low confidence or values outside the schema go to the next tier."""
+        if classif.get('confidence') == 'low':
+            return True
+        return bool(validate_classification(dict(classif), cascade_values))
+
+    def run_batch(batch, batch_num, model, flagged):
+        """Classify one batch; returns (classified positions, stop reason, violations, error)."""
+        with profiling.span('render_prompt'):
+            prompt = render_prompt(template_name, proposals=batch, **template_kwargs)
+        classified = set()
+        violations = 0
+        stop_reason = None
+
+        def apply_item(classif):
+            nonlocal violations
+            try:
+                prop_idx = int(classif[index_field]) - 1
+            except (KeyError, TypeError, ValueError):
+                return
+            if 0 <= prop_idx < len(batch) and prop_idx not in classified:
+                if flagged is not None and needs_escalation(classif):
+                    flagged.add(id(batch[prop_idx]))
+                if allowed_values is not None:
+                    violations += len(validate_classification(classif, allowed_values))
+                apply_classification(batch[prop_idx], classif)
+                classified.add(prop_idx)
+
+        try:
+            with telemetry.context(phase=call_phase, batch=batch_num), profiling.span('llm_call'):
+                if stream:
+                    _, stop_reason = call_llm_stream(prompt, apply_item, max_tokens=max_tokens,
+                                                     tool=tool, model=model)
+                elif structured:
+                    result = call_llm_tool(prompt, tool, max_tokens=max_tokens, model=model)
+                    for classif in result.get('classifications', []):
+                        apply_item(classif)
+                else:
+                    response = call_llm(prompt, max_tokens=max_tokens, model=model)
+                    classifications = extract_json_from_response(response)
+                    if not isinstance(classifications, list):
+                        # Salvage complete objects from a truncated response
+                        classifications = parse_json_array_items(response)
+                    for classif in classifications:
+                        apply_item(classif)
+        except Exception as e:
+            return classified, stop_reason, violations, e
+
+        return classified, stop_reason, violations, None
+
+    def run_tier(to_classify, model, flagged):
+        """Classify proposals with one model; returns the ids of the proposals left unlabeled."""
+        nonlocal schema_violations
+        unlabeled = set()
+
+        # Batches run on up to max_workers threads. Proposals missing from a
+        # response (e.g. truncated at max_tokens) are re-submitted in a follow-up
+        # batch instead of being marked 'Unknown'.
+        batches = batch_items(to_classify, batch_size)
+        num_batches = len(batches)
+        events.phase_start(call_phase, len(to_classify), num_batches)
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix=phase) as pool:
+            pending = {
+                pool.submit(run_batch, batch, batch_num, model, flagged): (batch, batch_num, 0)
+                for batch_num, batch in enumerate(batches, 1)
+            }
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in sorted(done, key=lambda f: pending[f][1]):
+                    batch, batch_num, resubmit = pending.pop(future)
+                    classified, stop_reason, violations, error = future.result()
+                    schema_violations += violations
+
+                    label = "Resubmit" if resubmit else "Batch"
+                    print(f"  {label} {batch_num}/{num_batches} ({len(batch)} proposals)...", end=' ')
+
+                    missing = [prop for i, prop in enumerate(batch) if i not in classified]
+                    truncated = "truncated, " if stop_reason == 'max_tokens' else ""
+                    error_text = None
+                    if error is not None:
+                        print(f"✗ ({str(error)[:40]})")
+                        error_text = str(error)[:200]
+                    elif not classified:
+                        print("✗ (parse error)")
+                        missing = batch
+                        error_text = 'parse error'
+                    elif not missing:
+                        print("✓")
+                    elif resubmit < max_resubmits:
+                        print(f"✓ ({len(classified)}/{len(batch)}, {truncated}re-submitting {len(missing)})")
+                        events.batch_done(call_phase, batch_num, len(classified), labels=events.label_rows(
+                            [batch[i] for i in sorted(classified)], label_fields))
+                        num_batches += 1
+                        pending[pool.submit(run_batch, missing, num_batches, model, flagged)] = \
+                            (missing, num_batches, resubmit + 1)
+                        continue
+                    else:
+                        print(f"✓ ({len(classified)}/{len(batch)}, {truncated}{len(missing)} unclassified)")
+
+                    for prop in missing:
+                        apply_defaults(prop)
+                        unlabeled.add(id(prop))
+                    events.batch_done(call_phase, batch_num, len(batch), error=error_text,
+                                      labels=events.label_rows(batch, label_fields))
+
+        events.phase_end(call_phase)
+        return unlabeled
+
+    # Cascade: every tier but the last hands its low-confidence, schema-invalid
+    # and unlabeled proposals to the next (stronger) model
+    tiers = models if cascade else [models[0] if models else None]
+    cascade_tiers = []
+    remaining = to_classify
+    previous_labels = {}
+
+    for tier, model in enumerate(tiers):
+        call_phase = phase if tier == 0 else f"{phase}_escalated" + (str(tier) if tier > 1 else "")
+        final_tier = tier == len(tiers) - 1
+        if cascade:
+            print(f"  Cascade tier {tier + 1}/{len(tiers)}: {len(remaining)} proposals with {model}")
+
+        flagged = None if final_tier else set()
+        unlabeled = run_tier(remaining, model, flagged)
+
+        if tier > 0:
+            # Agreement of the previous tier with this one on the proposals both labeled
+            compared = [p for p in remaining if id(p) in previous_labels and id(p) not in unlabeled]
+            field_matches = Counter(f for p in compared for f in label_fields
+                                    if p.get(f) == previous_labels[id(p)].get(f))
+            cascade_tiers[-1]['agreement'] = (
+                sum(field_matches.values()) / (len(compared) * len(label_fields)) if compared else None)
+            cascade_tiers[-1]['field_agreement'] = {
+                f: field_matches[f] / len(compared) for f in label_fields} if compared else {}
+
+        if final_tier:
+            if cascade:
+                cascade_tiers.append({'model': model, 'classified': len(remaining)})
+            break
+
+        escalate = [p for p in remaining if id(p) in flagged or id(p) in unlabeled]
+        previous_labels = {id(p): {f: p.get(f) for f in label_fields}
+                           for p in escalate if id(p) not in unlabeled}
+        cascade_tiers.append({
+            'model': model,
+            'classified': len(remaining),
+            'escalated': len(escalate),
+            'escalation_rate': len(escalate) / len(remaining) if remaining else 0.0,
+            'low_confidence_or_invalid': len(flagged),
+            'unlabeled': len(unlabeled),
+        })
+        print(f"  Escalating {len(escalate)}/{len(remaining)} proposals "
+              f"({len(flagged)} low confidence or invalid, {len(unlabeled)} unlabeled)")
+        remaining = escalate
+        if not remaining:
+            break
+
+    # Followers of leaders left unlabeled are classified themselves (with the
+    # last model) instead of copying the leader's default labels
+    unlabeled_leaders = set()
+    if plan is not None:
+        unlabeled_leaders = {i for i, p in enumerate(proposals) if i not in plan.followers and id(p) in unlabeled}
+        orphans = [p for i, p in enumerate(proposals)
+                   if plan.followers.get(i) in unlabeled_leaders and i not in plan.audited]
+        if orphans:
+            print(f"  Classifying {len(orphans)} near-duplicates of proposals left unlabeled")
+            unlabeled |= run_tier(orphans, tiers[-1], None)
+            to_classify = to_classify + orphans
+
+    if schema_violations:
+        print(f"  {schema_violations} values outside the schema enums were set to 'Unknown'")
+
+    if cascade:
+        for t in cascade_tiers:
+            if t.get('agreement') is not None:
+                print(f"  Cascade: {t['model']} agreed with the next tier on {t['agreement']:.1%} "
+                      f"of labels of escalated proposals")
+        save_phase_report('cascade_report.json', phase, {'tiers': cascade_tiers})
+
+    stats = None
+    if plan is not None:
+        stats = apply_propagation(proposals, plan, label_fields, f'{phase}_propagated_from',
+                                  unlabeled=unlabeled_leaders)
+        if stats['audited']:
+            print(f"  Propagation audit: {stats['audited']} spot-checks, "
+                  f"{stats['mean_agreement']:.1%} label agreement")
+        save_phase_report('propagation_audit.json', phase, stats)
+
+    # Propagated labels are cached under the follower's own key, so a rerun
+    # needs neither its leader nor an LLM call; proposals that got default
+    # labels are classified again next time
+    label_cache.store(phase, [(cache_keys[id(p)], {f: p[f] for f in own_fields if f in p})
+                              for p in proposals if id(p) in cache_keys and id(p) not in unlabeled])
+    label_cache.release(phase)
+
+    for dup in duplicates:
+        canonical = by_key[dup['duplicate_of']]
+        for field in label_fields + [f'{phase}_propagated_from']:
+            if field in canonical:
+                dup[field] = canonical[field]
+
+    # Labels copied without a batch of their own
+    copied = cached + duplicates
+    if plan is not None:
+        copied += [p for i, p in enumerate(proposals) if i in plan.followers and i not in plan.audited
+                   and plan.followers[i] not in unlabeled_leaders]
+    if copied:
+        events.emit('labels', phase=phase, labels=events.label_rows(copied, label_fields))
+
+    return stats
+
+
+_report_lock = threading.Lock()
+
+
+def save_phase_report(filename: str, phase: str, stats: Dict[str, Any]):
+    """Record statistics for a phase in a JSON report shared by all phases."""
+    with _report_lock:  # Phases running concurrently share the file
+        try:
+            report = load_json(filename)
+        except (OSError, ValueError):
+            report = {}
+        report[phase] = stats
+        save_json(report, filename)
+
+
+# ============================================================================
+# Map-Reduce Discovery
+# ============================================================================
+
+def map_reduce_discovery(items: List[Dict[str, Any]], map_template: str, reduce_template: str,
+                         phase: str, shard_size: int, max_tokens: int = 8000,
+                         reduce_fan_in: int = 8, max_workers: int = 1,
+                         map_kwargs: Optional[Dict[str, Any]] = None) -> Optional[List[Any]]:
+    """
+    Discover a taxonomy over any number of proposals with map-reduce.
+
+    Map: every shard of `shard_size` proposals is rendered with map_template
+    and proposes candidate entries (a JSON array); shards run in parallel.
+    Reduce: candidate lists are merged `reduce_fan_in` at a time with
+    reduce_template (rendered with `candidate_lists` and `final`) until a
+    single consolidated list remains.
+
+    Returns:
+        The consolidated list, or None if discovery failed
+    """
+    shards = batch_items(items, shard_size)
+    print(f"  Map: {len(items)} proposals in {len(shards)} shards of up to {shard_size}...")
+
+    # Rendered lazily: the map prompts together hold the text of every proposal
+    prompts = [partial(render_prompt, map_template, proposals=shard, **(map_kwargs or {})) for shard in shards]
+    with telemetry.context(phase=f'{phase}_map'):
+        responses = call_llm_parallel(prompts, max_tokens=max_tokens, max_workers=max_workers)
+
+    candidate_lists = [extract_json_from_response(r) for r in responses if r]
+    candidate_lists = [c for c in candidate_lists if isinstance(c, list) and c]
+    print(f"  Map: {len(candidate_lists)}/{len(shards)} shards returned candidates")
+
+    if not candidate_lists:
+        return None
+    if len(shards) == 1:
+        return candidate_lists[0]
+
+    round_num = 0
+    while True:
+        round_num += 1
+        groups = batch_items(candidate_lists, reduce_fan_in)
+        final = len(groups) == 1
+        print(f"  Reduce round {round_num}: merging {len(candidate_lists)} candidate lists "
+              f"in {len(groups)} call(s)...")
+
+        prompts = [render_prompt(reduce_template, candidate_lists=group, final=final) for group in groups]
+        with telemetry.context(phase=f'{phase}_reduce'):
+            responses = call_llm_parallel(prompts, max_tokens=max_tokens, max_workers=max_workers)
+
+        merged = []
+        for group, response in zip(groups, responses):
+            result = extract_json_from_response(response) if response else None
+            if isinstance(result, list) and result:
+                merged.append(result)
+            elif not final:
+                # Keep the unmerged candidates for the next round
+                merged.append([c for candidates in group for c in candidates])
+
+        if final:
+            return merged[0] if merged else None
+        candidate_lists = merged
 
 
 # ============================================================================
@@ -37,8 +521,26 @@ def phase1_extract_proposals() -> List[Dict[str, Any]]:
     proposals = extract_proposals_from_companies()
 
     # Save raw proposals
-    save_json(proposals, 'raw_proposals.json')
-    save_csv(proposals, 'raw_proposals.csv')
+    save_proposals(proposals, 'raw_proposals', fieldnames=proposal_columns(proposals))
+
+    return proposals
+
+
+def deduplicate_proposals(proposals: List[Dict[str, Any]],
+                          threshold: float = DEFAULT_DEDUP_THRESHOLD) -> List[Dict[str, Any]]:
+    """Mark near-duplicate proposals so they are classified only once."""
+    print("\n" + "="*80)
+    print("DEDUPLICATING PROPOSALS")
+    print("="*80)
+
+    clusters = mark_duplicates(proposals, threshold)
+    num_unique = len(unique_proposals(proposals))
+
+    print(f"Found {len(clusters)} near-duplicate clusters (Jaccard >= {threshold})")
+    print(f"Unique proposals: {num_unique} of {len(proposals)} "
+          f"({len(proposals) - num_unique} duplicates will reuse canonical labels)")
+
+    save_json(clusters, 'dedup_clusters.json')
 
     return proposals
 
@@ -47,63 +549,99 @@ def phase1_extract_proposals() -> List[Dict[str, Any]]:
 # Phase 2: Business Use Case Clustering
 # ============================================================================
 
-def phase2_business_clustering(proposals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """Classify proposals by business use case."""
+def phase2_business_clustering(proposals: List[Dict[str, Any]],
+                               propagate_threshold: Optional[float] = None,
+                               stream: bool = False, structured: bool = False,
+                               max_workers: int = 1,
+                               hierarchical: bool = False,
+                               models: Optional[List[str]] = None,
+                               incremental: bool = False,
+                               taxonomy_version: Optional[str] = None,
+                               rediscover: bool = False) -> List[Dict[str, Any]]:
+    """
+    Classify proposals by business use case.
+
+    Clusters come from the taxonomy registry (see taxonomy.py): the version
+    `taxonomy_version`, or the latest. They are only discovered when no
+    version exists or `rediscover=True`: from the first 60 proposals, or
+    with `hierarchical=True` from every unique proposal via map-reduce.
+    With `incremental=True`, proposals labeled by an earlier run keep their
+    labels (and without a registered version, their clusters are reused).
+    """
     print("\n" + "="*80)
     print("PHASE 2: BUSINESS USE CASE CLUSTERING")
     print("="*80)
 
-    # Step 1: Discover clusters from sample
-    print("\nStep 1: Discovering business use case clusters...")
-    sample_proposals = proposals[:60]  # Use first 60 for discovery
+    record = None if rediscover else taxonomy.load('business', taxonomy_version)
+    if record is None and incremental and not rediscover:
+        known_types = sorted({p['business_use_case'] for p in proposals
+                              if p.get('business_use_case', 'Unknown') != 'Unknown'})
+        if known_types:
+            record = taxonomy.register('business', known_types, source='previous labels')
+
+    # Step 1: Discover clusters
+    if record is not None:
+        print(f"\nStep 1: Using business taxonomy {taxonomy.describe(record)}")
+        system_types = record['items']
+    elif hierarchical:
+        print("\nStep 1: Discovering business use case clusters (map-reduce over all proposals)...")
+        system_types = map_reduce_discovery(
+            unique_proposals(proposals),
+            map_template='business_clustering_discovery.j2',
+            reduce_template='business_clustering_reduce.j2',
+            phase='business_discovery',
+            shard_size=60,
+            max_workers=max_workers
+        )
+        # Drop names the reduce step repeated verbatim
+        unique_types = {}
+        for st in system_types or []:
+            if isinstance(st, str):
+                unique_types.setdefault(st.strip().lower(), st.strip())
+        system_types = list(unique_types.values())
+    else:
+        print("\nStep 1: Discovering business use case clusters...")
+        sample_proposals = proposals[:60]  # Use first 60 for discovery
 
-    prompt = render_prompt('business_clustering_discovery.j2',
-                          proposals=sample_proposals)
-    response = call_llm(prompt, max_tokens=8000)
+        prompt = render_prompt('business_clustering_discovery.j2',
+                              proposals=sample_proposals)
+        with telemetry.context(phase='business_discovery', batch=1):
+            response = call_llm(prompt, max_tokens=8000)
 
-    system_types = extract_json_from_response(response)
+        system_types = extract_json_from_response(response)
     if not system_types:
         print("ERROR: Failed to discover clusters")
         return proposals
 
-    print(f"Discovered {len(system_types)} business use case clusters:")
+    if record is None:
+        record = taxonomy.register('business', system_types,
+                                   source='map-reduce discovery' if hierarchical else 'discovery')
+        print(f"Discovered {len(system_types)} business use case clusters:")
+    else:
+        print(f"{len(system_types)} business use case clusters:")
     for st in system_types:
         print(f"  - {st}")
+    save_phase_report('taxonomy_versions.json', 'business',
+                      {k: record[k] for k in ('version', 'hash', 'source', 'created')})
 
     # Step 2: Classify all proposals
     print(f"\nStep 2: Classifying {len(proposals)} proposals...")
 
-    batch_size = 12
-    batches = batch_items(proposals, batch_size)
+    def apply_classification(prop, classif):
+        prop['business_use_case'] = classif['type']
 
-    for batch_num, batch in enumerate(batches, 1):
-        print(f"  Batch {batch_num}/{len(batches)} ({len(batch)} proposals)...", end=' ', flush=True)
+    def apply_defaults(prop):
+        prop['business_use_case'] = 'Unknown'
 
-        prompt = render_prompt('business_clustering_classify.j2',
-                              proposals=batch,
-                              system_types=system_types,
-                              enumerate=enumerate)
-
-        try:
-            response = call_llm(prompt, max_tokens=4096)
-            classifications = extract_json_from_response(response)
-
-            if classifications:
-                for classif in classifications:
-                    prop_idx = classif['idx'] - 1
-                    if 0 <= prop_idx < len(batch):
-                        batch[prop_idx]['business_use_case'] = classif['type']
-
-                print("✓")
-            else:
-                print("✗ (parse error)")
-                for prop in batch:
-                    prop['business_use_case'] = 'Unknown'
-
-        except Exception as e:
-            print(f"✗ ({str(e)[:40]})")
-            for prop in batch:
-                prop['business_use_case'] = 'Unknown'
+    classify_in_batches(proposals, 'business_clustering_classify.j2',
+                        batch_size=12, max_tokens=4096, index_field='idx',
+                        apply_classification=apply_classification,
+                        apply_defaults=apply_defaults,
+                        label_fields=BUSINESS_FIELDS, phase='business',
+                        propagate_threshold=propagate_threshold,
+                        stream=stream, structured=structured, max_workers=max_workers, models=models,
+                        only_unlabeled=incremental,
+                        system_types=system_types, enumerate=enumerate)
 
     # Generate statistics
     print("\n" + "-"*80)
@@ -112,13 +650,12 @@ def phase2_business_clustering(proposals: List[Dict[str, Any]]) -> List[Dict[str
     print_distribution(proposals, 'business_use_case', 'Business Use Cases', top_n=20)
 
     # Save results
-    save_json(proposals, 'proposals_with_business.json')
-    save_csv(proposals, 'proposals_with_business.csv')
+    save_proposals(proposals, 'proposals_with_business', fieldnames=proposal_columns(proposals, 'business'))
 
     # Generate cluster summary
     summary = generate_cluster_summary(proposals, 'business_use_case')
     save_json(summary, 'business_clusters_summary.json')
-    save_csv(summary, 'business_clusters_summary.csv')
+    save_csv(summary, 'business_clusters_summary.csv', fieldnames=CLUSTER_SUMMARY_COLUMNS)
 
     return proposals
 
@@ -127,7 +664,12 @@ def phase2_business_clustering(proposals: List[Dict[str, Any]]) -> List[Dict[str
 # Phase 3: Architecture Classification
 # ============================================================================
 
-def phase3_architecture_classification(proposals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def phase3_architecture_classification(proposals: List[Dict[str, Any]],
+                                       propagate_threshold: Optional[float] = None,
+                                       stream: bool = False, structured: bool = False,
+                                       max_workers: int = 1,
+                                       models: Optional[List[str]] = None,
+                                       incremental: bool = False) -> List[Dict[str, Any]]:
     """Classify proposals by technical architecture."""
     print("\n" + "="*80)
     print("PHASE 3: TECHNICAL ARCHITECTURE CLASSIFICATION")
@@ -138,53 +680,37 @@ def phase3_architecture_classification(proposals: List[Dict[str, Any]]) -> List[
         if 'business_use_case' not in p:
             p['business_use_case'] = 'Unknown'
 
-    batch_size = 10  # Smaller batches for detailed prompts
-    batches = batch_items(proposals, batch_size)
-
     print(f"\nClassifying {len(proposals)} proposals...")
 
-    for batch_num, batch in enumerate(batches, 1):
-        print(f"  Batch {batch_num}/{len(batches)} ({len(batch)} proposals)...", end=' ', flush=True)
-
-        prompt = render_prompt('architecture_classify.j2', proposals=batch)
-
-        try:
-            response = call_llm(prompt, max_tokens=8192)
-            classifications = extract_json_from_response(response)
-
-            if classifications:
-                for classif in classifications:
-                    prop_idx = classif['proposal_index'] - 1
-                    if 0 <= prop_idx < len(batch):
-                        batch[prop_idx]['architecture_pattern'] = classif.get('architecture_pattern', 'Unknown')
-                        batch[prop_idx]['reasoning_pattern'] = classif.get('reasoning_pattern', 'Unknown')
-                        batch[prop_idx]['execution_pattern'] = classif.get('execution_pattern', 'Unknown')
-
-                        # Handle knowledge_representation (can be string or array)
-                        kr = classif.get('knowledge_representation', 'Unknown')
-                        if isinstance(kr, list):
-                            batch[prop_idx]['knowledge_representation'] = ', '.join(kr)
-                        else:
-                            batch[prop_idx]['knowledge_representation'] = kr
-
-                        # Handle input_modalities (array)
-                        modalities = classif.get('input_modalities', ['Unknown'])
-                        batch[prop_idx]['input_modalities'] = ', '.join(modalities)
-
-                        batch[prop_idx]['tool_integration'] = classif.get('tool_integration', 'Unknown')
-                        batch[prop_idx]['human_oversight'] = classif.get('human_oversight', 'Unknown')
-                        batch[prop_idx]['architecture_confidence'] = classif.get('confidence', 'unknown')
-
-                print("✓")
-            else:
-                print("✗ (parse error)")
-                for prop in batch:
-                    add_default_architecture_fields(prop)
-
-        except Exception as e:
-            print(f"✗ ({str(e)[:40]})")
-            for prop in batch:
-                add_default_architecture_fields(prop)
+    def apply_classification(prop, classif):
+        prop['architecture_pattern'] = classif.get('architecture_pattern', 'Unknown')
+        prop['reasoning_pattern'] = classif.get('reasoning_pattern', 'Unknown')
+        prop['execution_pattern'] = classif.get('execution_pattern', 'Unknown')
+
+        # Handle knowledge_representation (can be string or array)
+        kr = classif.get('knowledge_representation', 'Unknown')
+        if isinstance(kr, list):
+            prop['knowledge_representation'] = ', '.join(kr)
+        else:
+            prop['knowledge_representation'] = kr
+
+        # Handle input_modalities (array)
+        modalities = classif.get('input_modalities', ['Unknown'])
+        prop['input_modalities'] = ', '.join(modalities)
+
+        prop['tool_integration'] = classif.get('tool_integration', 'Unknown')
+        prop['human_oversight'] = classif.get('human_oversight', 'Unknown')
+        prop['architecture_confidence'] = classif.get('confidence', 'unknown')
+
+    classify_in_batches(proposals, 'architecture_classify.j2',
+                        batch_size=10,  # Smaller batches for detailed prompts
+                        max_tokens=8192, index_field='proposal_index',
+                        apply_classification=apply_classification,
+                        apply_defaults=add_default_architecture_fields,
+                        label_fields=ARCHITECTURE_FIELDS, phase='architecture',
+                        propagate_threshold=propagate_threshold,
+                        stream=stream, structured=structured, max_workers=max_workers, models=models,
+                        only_unlabeled=incremental)
 
     # Generate statistics
     print("\n" + "-"*80)
@@ -200,8 +726,8 @@ def phase3_architecture_classification(proposals: List[Dict[str, Any]]) -> List[
     print_distribution(proposals, 'human_oversight', 'Human Oversight Level')
 
     # Save results
-    save_json(proposals, 'proposals_complete.json')
-    save_csv(proposals, 'proposals_complete.csv')
+    save_proposals(proposals, 'proposals_complete',
+                   fieldnames=proposal_columns(proposals, 'business', 'architecture'))
 
     # Generate architecture summary
     arch_summary = {
@@ -234,59 +760,48 @@ def add_default_architecture_fields(prop: Dict[str, Any]):
 # Phase 4: Implementation Complexity Classification
 # ============================================================================
 
-def phase4_implementation_classification(proposals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+def phase4_implementation_classification(proposals: List[Dict[str, Any]],
+                                         propagate_threshold: Optional[float] = None,
+                                         stream: bool = False, structured: bool = False,
+                                         max_workers: int = 1,
+                                         models: Optional[List[str]] = None,
+                                         incremental: bool = False) -> List[Dict[str, Any]]:
     """Classify proposals by implementation complexity dimensions."""
     print("\n" + "="*80)
     print("PHASE 4: IMPLEMENTATION COMPLEXITY CLASSIFICATION")
     print("="*80)
 
-    batch_size = 8  # Smaller batches for complex prompts with many dimensions
-    batches = batch_items(proposals, batch_size)
-
     print(f"\nClassifying {len(proposals)} proposals across 12 complexity dimensions...")
 
-    for batch_num, batch in enumerate(batches, 1):
-        print(f"  Batch {batch_num}/{len(batches)} ({len(batch)} proposals)...", end=' ', flush=True)
-
-        prompt = render_prompt('implementation_classify.j2', proposals=batch)
-
-        try:
-            response = call_llm(prompt, max_tokens=8192)
-            classifications = extract_json_from_response(response)
-
-            if classifications:
-                for classif in classifications:
-                    prop_idx = classif['proposal_index'] - 1
-                    if 0 <= prop_idx < len(batch):
-                        batch[prop_idx]['data_complexity'] = classif.get('data_complexity', 'Unknown')
-                        batch[prop_idx]['integration_complexity'] = classif.get('integration_complexity', 'Unknown')
-                        batch[prop_idx]['prompt_complexity'] = classif.get('prompt_complexity', 'Unknown')
-                        batch[prop_idx]['chain_depth'] = classif.get('chain_depth', 'Unknown')
-                        batch[prop_idx]['schema_complexity'] = classif.get('schema_complexity', 'Unknown')
-                        batch[prop_idx]['state_management'] = classif.get('state_management', 'Unknown')
-                        batch[prop_idx]['error_handling'] = classif.get('error_handling', 'Unknown')
-                        batch[prop_idx]['evaluation_complexity'] = classif.get('evaluation_complexity', 'Unknown')
-                        batch[prop_idx]['domain_expertise'] = classif.get('domain_expertise', 'Unknown')
-                        batch[prop_idx]['latency_requirements'] = classif.get('latency_requirements', 'Unknown')
-                        batch[prop_idx]['regulatory_requirements'] = classif.get('regulatory_requirements', 'Unknown')
-
-                        # Handle rerepresentation_type (can be string or array)
-                        rerep = classif.get('rerepresentation_type', 'Unknown')
-                        if isinstance(rerep, list):
-                            batch[prop_idx]['rerepresentation_type'] = ', '.join(rerep)
-                        else:
-                            batch[prop_idx]['rerepresentation_type'] = rerep
-
-                print("✓")
-            else:
-                print("✗ (parse error)")
-                for prop in batch:
-                    add_default_implementation_fields(prop)
-
-        except Exception as e:
-            print(f"✗ ({str(e)[:40]})")
-            for prop in batch:
-                add_default_implementation_fields(prop)
+    def apply_classification(prop, classif):
+        prop['data_complexity'] = classif.get('data_complexity', 'Unknown')
+        prop['integration_complexity'] = classif.get('integration_complexity', 'Unknown')
+        prop['prompt_complexity'] = classif.get('prompt_complexity', 'Unknown')
+        prop['chain_depth'] = classif.get('chain_depth', 'Unknown')
+        prop['schema_complexity'] = classif.get('schema_complexity', 'Unknown')
+        prop['state_management'] = classif.get('state_management', 'Unknown')
+        prop['error_handling'] = classif.get('error_handling', 'Unknown')
+        prop['evaluation_complexity'] = classif.get('evaluation_complexity', 'Unknown')
+        prop['domain_expertise'] = classif.get('domain_expertise', 'Unknown')
+        prop['latency_requirements'] = classif.get('latency_requirements', 'Unknown')
+        prop['regulatory_requirements'] = classif.get('regulatory_requirements', 'Unknown')
+
+        # Handle rerepresentation_type (can be string or array)
+        rerep = classif.get('rerepresentation_type', 'Unknown')
+        if isinstance(rerep, list):
+            prop['rerepresentation_type'] = ', '.join(rerep)
+        else:
+            prop['rerepresentation_type'] = rerep
+
+    classify_in_batches(proposals, 'implementation_classify.j2',
+                        batch_size=8,  # Smaller batches for complex prompts with many dimensions
+                        max_tokens=8192, index_field='proposal_index',
+                        apply_classification=apply_classification,
+                        apply_defaults=add_default_implementation_fields,
+                        label_fields=IMPLEMENTATION_FIELDS, phase='implementation',
+                        propagate_threshold=propagate_threshold,
+                        stream=stream, structured=structured, max_workers=max_workers, models=models,
+                        only_unlabeled=incremental)
 
     # Generate statistics
     print("\n" + "-"*80)
@@ -307,8 +822,8 @@ def phase4_implementation_classification(proposals: List[Dict[str, Any]]) -> Lis
     print_distribution(proposals, 'rerepresentation_type', 'Rerepresentation Type')
 
     # Save results
-    save_json(proposals, 'proposals_with_implementation.json')
-    save_csv(proposals, 'proposals_with_implementation.csv')
+    save_proposals(proposals, 'proposals_with_implementation',
+                   fieldnames=proposal_columns(proposals, 'business', 'implementation'))
 
     # Generate implementation summary
     impl_summary = {
@@ -346,57 +861,638 @@ def add_default_implementation_fields(prop: Dict[str, Any]):
     prop['rerepresentation_type'] = 'Unknown'
 
 
+# ============================================================================
+# Phase 6: Iteration Shape Classification
+# ============================================================================
+
+def phase6_iteration_shapes(proposals: List[Dict[str, Any]],
+                            propagate_threshold: Optional[float] = None,
+                            stream: bool = False, structured: bool = False,
+                            max_workers: int = 1,
+                            shard_size: int = 80,
+                            models: Optional[List[str]] = None,
+                            incremental: bool = False,
+                            taxonomy_version: Optional[str] = None,
+                            rediscover: bool = False) -> List[Dict[str, Any]]:
+    """
+    Classify proposals into iteration shapes.
+
+    Shapes come from the taxonomy registry (see taxonomy.py), like the
+    business clusters of phase 2, and are only discovered with map-reduce
+    when no version exists or `rediscover=True`. With `incremental=True`,
+    proposals labeled by an earlier run keep their labels (and without a
+    registered version, the shapes in iteration_shapes.json are reused).
+    """
+    print("\n" + "="*80)
+    print("PHASE 6: ITERATION SHAPE CLASSIFICATION")
+    print("="*80)
+
+    record = None if rediscover else taxonomy.load('iteration_shape', taxonomy_version)
+    if record is None and incremental and not rediscover and any('iteration_shape' in p for p in proposals):
+        try:
+            record = taxonomy.register('iteration_shape', load_json('iteration_shapes.json'),
+                                       source='iteration_shapes.json')
+        except (OSError, ValueError):
+            print("Warning: Could not load iteration_shapes.json, rediscovering shapes")
+
+    if record is not None:
+        iteration_shapes = record['items']
+        print(f"\nStep 1: Using iteration shape taxonomy {taxonomy.describe(record)}")
+    else:
+        # Step 1: Discover shapes from compact dimension vectors of all unique proposals
+        print("\nStep 1: Discovering iteration shapes (map-reduce)...")
+        iteration_shapes = map_reduce_discovery(
+            unique_proposals(proposals),
+            map_template='iteration_shape_discovery.j2',
+            reduce_template='iteration_shape_reduce.j2',
+            phase='iteration_discovery',
+            shard_size=shard_size,
+            max_workers=max_workers,
+            map_kwargs={'compact': True}
+        )
+        if not iteration_shapes:
+            print("ERROR: Failed to discover iteration shapes")
+            return proposals
+
+        record = taxonomy.register('iteration_shape', iteration_shapes, source='map-reduce discovery')
+        print(f"Discovered {len(iteration_shapes)} iteration shapes:")
+        for shape in iteration_shapes:
+            print(f"  - {shape.get('shape_name')} (~{shape.get('estimated_proposals_matching', '?')} proposals)")
+    save_json(iteration_shapes, 'iteration_shapes.json')
+    save_phase_report('taxonomy_versions.json', 'iteration_shape',
+                      {k: record[k] for k in ('version', 'hash', 'source', 'created')})
+
+    # Step 2: Classify all proposals
+    print(f"\nStep 2: Classifying {len(proposals)} proposals...")
+
+    def apply_classification(prop, classif):
+        prop['iteration_shape'] = classif.get('iteration_shape', 'Unknown')
+        prop['iteration_shape_confidence'] = classif.get('confidence', 'unknown')
+        prop['iteration_shape_reasoning'] = classif.get('reasoning', '')
+
+    def apply_defaults(prop):
+        prop['iteration_shape'] = 'Unknown'
+        prop['iteration_shape_confidence'] = 'low'
+        prop['iteration_shape_reasoning'] = ''
+
+    classify_in_batches(proposals, 'iteration_shape_classify.j2',
+                        batch_size=15, max_tokens=8192, index_field='idx',
+                        apply_classification=apply_classification,
+                        apply_defaults=apply_defaults,
+                        label_fields=ITERATION_SHAPE_FIELDS, phase='iteration_shape',
+                        propagate_threshold=propagate_threshold,
+                        stream=stream, structured=structured, max_workers=max_workers, models=models,
+                        only_unlabeled=incremental, cache_exclude=TEXT_FIELDS,
+                        iteration_shapes=iteration_shapes)
+
+    # Generate statistics
+    print("\n" + "-"*80)
+    print("ITERATION SHAPE DISTRIBUTION")
+    print("-"*80)
+    print_distribution(proposals, 'iteration_shape', 'Iteration Shapes', top_n=20)
+
+    # Save results
+    save_proposals(proposals, 'proposals_with_iteration_shape',
+                   fieldnames=proposal_columns(proposals, *PHASE_COLUMNS))
+
+    summary = generate_cluster_summary(proposals, 'iteration_shape')
+    save_json(summary, 'iteration_shape_summary.json')
+
+    return proposals
+
+
 # ============================================================================
 # Phase 5: Generate Final Summary
 # ============================================================================
 
-def phase5_generate_summary(proposals: List[Dict[str, Any]]):
-    """Generate final summary report."""
+# Distributions in analysis_summary.json: key and proposal field
+SUMMARY_DISTRIBUTIONS = [
+    ('business_use_cases', 'business_use_case'),
+    ('architecture_patterns', 'architecture_pattern'),
+    ('reasoning_patterns', 'reasoning_pattern'),
+    ('execution_patterns', 'execution_pattern'),
+    ('tool_integration', 'tool_integration'),
+    ('human_oversight', 'human_oversight'),
+]
+
+
+def phase5_generate_summary(proposals: List[Dict[str, Any]], sample: Optional[Dict[str, Any]] = None):
+    """
+    Generate final summary report. The distributions are counted by the
+    proposals database (see phase5_export_database), which holds the same
+    proposals.
+
+    Args:
+        proposals: The classified proposals
+        sample: With --sample, the corpus size and seed ({'population', 'seed'});
+            every distribution then also gets bootstrap confidence intervals
+    """
     print("\n" + "="*80)
     print("PHASE 5: GENERATING SUMMARY")
     print("="*80)
 
-    summary = {
-        'total_proposals': len(proposals),
-        'num_companies': len(set(p['company'] for p in proposals)),
-        'business_use_cases': count_values(proposals, 'business_use_case'),
-        'architecture_patterns': count_values(proposals, 'architecture_pattern'),
-        'reasoning_patterns': count_values(proposals, 'reasoning_pattern'),
-        'execution_patterns': count_values(proposals, 'execution_pattern'),
-        'tool_integration': count_values(proposals, 'tool_integration'),
-        'human_oversight': count_values(proposals, 'human_oversight'),
-    }
+    has_shapes = any('iteration_shape' in p for p in proposals)
+    distributions = SUMMARY_DISTRIBUTIONS + ([('iteration_shapes', 'iteration_shape')] if has_shapes else [])
+
+    connection = database.connect()
+    try:
+        summary = {
+            'total_proposals': len(proposals),
+            'num_companies': len(set(p['company'] for p in proposals)),
+            **{key: database.value_counts(connection, field) for key, field in distributions},
+        }
+
+        # Counts with near-duplicates collapsed to their canonical proposal
+        unique = unique_proposals(proposals)
+        summary['deduplicated'] = {
+            'total_proposals': len(unique),
+            **{key: database.value_counts(connection, field, unique=True) for key, field in distributions},
+        }
+    finally:
+        connection.close()
+
+    if sample is not None:
+        summary['sample'] = {
+            'population': sample['population'],
+            'size': len(proposals),
+            'fraction': round(len(proposals) / sample['population'], 4),
+            'seed': sample['seed'],
+            'confidence': sampling.CONFIDENCE,
+            'bootstrap_samples': sampling.BOOTSTRAP_SAMPLES,
+        }
+        summary['confidence_intervals'] = {
+            key: sampling.bootstrap_intervals(proposals, field, population=sample['population'],
+                                              seed=sample['seed'])
+            for key, field in distributions
+        }
 
     save_json(summary, 'analysis_summary.json')
 
     # Print summary
-    print(f"\nTotal Proposals: {summary['total_proposals']}")
+    print(f"\nTotal Proposals: {summary['total_proposals']} ({len(unique)} unique)")
     print(f"Companies: {summary['num_companies']}")
     print(f"Business Use Cases: {len(summary['business_use_cases'])}")
     print(f"Architecture Patterns: {len(summary['architecture_patterns'])}")
+    if sample is not None:
+        print(f"Sample: {len(proposals):,} of {sample['population']:,} proposals, widest "
+              f"{sampling.CONFIDENCE:.0%} interval {sampling.widest_interval(summary['confidence_intervals']):.1%}")
+
+
+# ============================================================================
+# Incremental Updates
+# ============================================================================
+
+# Proposal file of each classification phase and the fields it holds
+PHASE_OUTPUTS = [
+    ('proposals_with_business.json', PHASE_COLUMNS['business']),
+    ('proposals_complete.json', PHASE_COLUMNS['architecture']),
+    ('proposals_with_implementation.json', PHASE_COLUMNS['implementation']),
+    ('proposals_with_iteration_shape.json', PHASE_COLUMNS['iteration_shape']),
+]
+
+
+def load_previous_labels() -> Dict[str, Dict[str, Any]]:
+    """Labels of every phase from the outputs of the previous run, by proposal key."""
+    labels = defaultdict(dict)
+    for filename, fields in PHASE_OUTPUTS:
+        try:
+            for p in iter_json_array(filename):
+                labels[proposal_key(p)].update({f: p[f] for f in fields if f in p})
+        except (OSError, ValueError):
+            continue
+    return labels
+
+
+def update_proposals(changed: Optional[Set[str]] = None) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+    """
+    Re-extract the proposals of changed companies and carry over the labels
+    of every proposal whose text did not change.
+
+    Args:
+        changed: Companies whose proposals file changed; the others are
+            taken from raw_proposals.json (None: re-extract every company)
+
+    Returns:
+        The proposals (unlabeled if new or changed) and counts of new,
+        changed, unchanged and removed proposals
+    """
+    try:
+        previous = to_records(iter_json_array('raw_proposals.json'))
+    except (OSError, ValueError):
+        previous = []
+    previous_by_company = defaultdict(list)
+    for p in previous:
+        previous_by_company[p['company']].append(p)
+
+    files = company_proposal_files()
+    if changed is None:
+        changed = set(files)
+    # Companies missing from raw_proposals.json (e.g. after --sample) are extracted too
+    changed = set(changed) | (set(files) - set(previous_by_company))
+
+    proposals = []
+    for company, path in files.items():
+        if company in changed:
+            try:
+                proposals.extend(to_records(extract_company_proposals(company, path)))
+                continue
+            except Exception as e:
+                print(f"Error processing {company}: {e} (keeping its previous proposals)")
+        proposals.extend(previous_by_company[company])
+
+    def text_of(p):
+        return tuple(p.get(field) for field in TEXT_FIELDS)
+
+    previous_text = {proposal_key(p): text_of(p) for p in previous if p['company'] in changed}
+    labels = load_previous_labels()
+    counts = Counter()
+    for p in proposals:
+        key = proposal_key(p)
+        if key not in labels:
+            counts['new'] += 1
+        elif key in previous_text and previous_text[key] != text_of(p):
+            counts['changed'] += 1
+        else:
+            p.update(labels[key])
+            counts['unchanged'] += 1
+
+    current_keys = {proposal_key(p) for p in proposals}
+    counts['removed'] = sum(1 for p in previous if proposal_key(p) not in current_keys)
+    print(f"Proposals: {counts['new']} new, {counts['changed']} changed, "
+          f"{counts['unchanged']} unchanged, {counts['removed']} removed")
+    return proposals, counts
+
+
+def refresh_visualizations():
+    """Regenerate the static visualizations from the updated outputs."""
+    import visualize
+
+    proposals = visualize.load_proposals()
+    for create in visualize.VISUALIZATIONS.values():
+        create(proposals)
+
+
+def publish_update(counts: Dict[str, int], companies: Optional[Set[str]], total: int):
+    """
+    Write outputs/last_update.json and tell open dashboards (via the
+    events stream of serve_dashboard.py) to reload their data.
+    """
+    update = {
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'companies': sorted(companies) if companies is not None else None,
+        'total_proposals': total,
+        **{k: counts[k] for k in ('new', 'changed', 'unchanged', 'removed')},
+    }
+    save_json(update, 'last_update.json')
+    events.emit('update', companies=update['companies'], total_proposals=total)
+
+
+def watch_companies(args, cascade_models: Dict[str, List[str]], taxonomy_versions: Dict[str, str]) -> int:
+    """
+    Keep the outputs up to date: bring them in sync once, then run an
+    incremental update whenever company proposal files change (--watch).
+    """
+    state = snapshot()
+    changed = None
+    print(f"\nWatching {len(state)} companies for new proposals "
+          f"(polling every {args.watch_interval:g}s, debounce {args.debounce:g}s; Ctrl+C to stop)")
+    try:
+        while True:
+            proposals, counts = update_proposals(changed)
+            if counts['new'] or counts['changed'] or counts['removed']:
+                telemetry.start_run(TRACE_FILE)
+                events.start_run(EVENTS_FILE)
+                save_proposals(proposals, 'raw_proposals',
+                               fieldnames=proposal_columns(proposals, *PHASE_COLUMNS))
+                run_pipeline(proposals, args, cascade_models, taxonomy_versions, incremental=True)
+                args.rediscover = None  # Only the first update rediscovers
+                refresh_visualizations()
+                publish_update(counts, changed, len(proposals))
+                events.end_run(total_proposals=len(proposals))
+            else:
+                print("✓ Outputs are up to date")
+            # No record of this update is read again: start the next one with an empty text file
+            proposals = None
+            reset_text_store()
+
+            state, changed = wait_for_changes(state, interval=args.watch_interval, debounce=args.debounce)
+            print("\n" + "="*80)
+            print(f"CHANGES IN {len(changed)} COMPANIES: {', '.join(sorted(changed)[:10])}"
+                  + (" ..." if len(changed) > 10 else ""))
+            print("="*80)
+    except KeyboardInterrupt:
+        print("\n✓ Stopped watching")
+        return 0
 
 
 # ============================================================================
 # Main Pipeline
 # ============================================================================
 
+CLASSIFICATION_PHASES = ['business', 'architecture', 'implementation', 'iteration_shape']
+
+
+def parse_cascade_models(specs: List[str], cascade_all: bool) -> Dict[str, List[str]]:
+    """
+    Model tiers per classification phase from --cascade/--cascade-models.
+
+    Args:
+        specs: "PHASE=MODEL,MODEL,..." strings (cheapest model first)
+        cascade_all: Use CASCADE_MODELS for phases without a spec
+
+    Raises:
+        ValueError: On an unknown phase or a spec without models
+    """
+    tiers = {phase: list(CASCADE_MODELS) for phase in CLASSIFICATION_PHASES} if cascade_all else {}
+    for spec in specs or []:
+        phase, _, models = spec.partition('=')
+        models = [m.strip() for m in models.split(',') if m.strip()]
+        if phase not in CLASSIFICATION_PHASES or not models:
+            raise ValueError(f"Invalid --cascade-models '{spec}' (expected PHASE=MODEL[,MODEL...] "
+                             f"with PHASE one of {', '.join(CLASSIFICATION_PHASES)})")
+        tiers[phase] = models
+    return tiers
+
+
+def parse_taxonomy_versions(specs: List[str]) -> Dict[str, str]:
+    """
+    Pinned taxonomy versions from --taxonomy.
+
+    Args:
+        specs: "KIND=VERSION" strings (VERSION: number, content hash prefix or 'latest')
+
+    Raises:
+        ValueError: On an unknown kind or a version that is not registered
+    """
+    versions = {}
+    for spec in specs or []:
+        kind, _, version = spec.partition('=')
+        if kind not in taxonomy.KINDS or not version:
+            raise ValueError(f"Invalid --taxonomy '{spec}' (expected KIND=VERSION "
+                             f"with KIND one of {', '.join(taxonomy.KINDS)})")
+        taxonomy.resolve(kind, version)
+        versions[kind] = version
+    return versions
+
+
+def run_pipeline(proposals: List[Dict[str, Any]], args, cascade_models: Dict[str, List[str]],
+                 taxonomy_versions: Dict[str, str], incremental: bool = False,
+                 sample: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Deduplicate and run the classification and summary phases.
+
+    Args:
+        proposals: Extracted proposals
+        args: Parsed command line arguments
+        cascade_models: Model tiers per phase (see parse_cascade_models)
+        taxonomy_versions: Pinned taxonomy version per kind (see parse_taxonomy_versions)
+        incremental: Keep the labels proposals already carry (see update_proposals)
+            and only classify the others
+        sample: Population and seed when proposals are a sample (see run_sample)
+
+    Returns:
+        The classified proposals
+    """
+    # Dedup: classify each near-duplicate cluster only once
+    if not args.no_dedup:
+        with profiling.span('dedup'):
+            proposals = deduplicate_proposals(proposals, threshold=args.dedup_threshold)
+
+    def rediscover(kind: str) -> bool:
+        return args.rediscover is not None and (not args.rediscover or kind in args.rediscover)
+
+    # Options shared by the classification phases
+    classify_options = {
+        'propagate_threshold': args.propagate_threshold,
+        'stream': args.stream,
+        'structured': args.structured,
+        'max_workers': args.workers,
+    }
+
+    def load_existing(phase_label: str, filename: str):
+        """Stage that loads the output of a previous run instead of calling the LLM."""
+        def load(proposals):
+            print(f"\nSkipping {phase_label}, loading existing data...")
+            try:
+                return to_records(iter_json_array(filename), keep_text=False)
+            except (OSError, ValueError):
+                print(f"Warning: Could not load existing {filename}")
+                return proposals
+        return load
+
+    if args.skip_business:
+        business_stage = load_existing('business clustering', 'proposals_with_business.json')
+    else:
+        def business_stage(proposals):
+            return phase2_business_clustering(proposals, hierarchical=args.hierarchical_discovery,
+                                              models=cascade_models.get('business'), incremental=incremental,
+                                              taxonomy_version=taxonomy_versions.get('business'),
+                                              rediscover=rediscover('business'), **classify_options)
+
+    if args.skip_architecture:
+        architecture_stage = load_existing('architecture classification', 'proposals_complete.json')
+    else:
+        def architecture_stage(proposals):
+            return phase3_architecture_classification(proposals, models=cascade_models.get('architecture'),
+                                                      incremental=incremental, **classify_options)
+
+    if args.skip_implementation:
+        implementation_stage = load_existing('implementation complexity classification',
+                                             'proposals_with_implementation.json')
+    else:
+        def implementation_stage(proposals):
+            return phase4_implementation_classification(proposals, models=cascade_models.get('implementation'),
+                                                        incremental=incremental, **classify_options)
+
+    if args.skip_iteration_shape:
+        iteration_shape_stage = load_existing('iteration shape classification',
+                                              'proposals_with_iteration_shape.json')
+    else:
+        def iteration_shape_stage(proposals):
+            return phase6_iteration_shapes(proposals, models=cascade_models.get('iteration_shape'),
+                                           incremental=incremental,
+                                           taxonomy_version=taxonomy_versions.get('iteration_shape'),
+                                           rediscover=rediscover('iteration_shape'), **classify_options)
+
+    def save_combined_outputs(proposals):
+        """Phase 4 does not see the architecture labels; rewrite the files of phases 3 and 4 with every earlier label."""
+        for filename, skipped in [('proposals_complete', args.skip_architecture),
+                                  ('proposals_with_implementation', args.skip_implementation)]:
+            if not skipped:
+                save_proposals(proposals, filename, fieldnames=proposal_columns(
+                    proposals, 'business', 'architecture', 'implementation'))
+
+    # Phases 3 and 4 show the business use case in their prompts, so they
+    # wait for phase 2 and then run concurrently; iteration shapes and the
+    # company index need all three, the summary everything.
+    stages = [
+        Stage('business', business_stage, BUSINESS_FIELDS + ['business_propagated_from']),
+        Stage('architecture', architecture_stage, ARCHITECTURE_FIELDS + ['architecture_propagated_from'],
+              depends_on=['business']),
+        Stage('implementation', implementation_stage,
+              IMPLEMENTATION_FIELDS + ['implementation_propagated_from'], depends_on=['business']),
+        Stage('combined_outputs', save_combined_outputs,
+              depends_on=['business', 'architecture', 'implementation']),
+        Stage('iteration_shape', iteration_shape_stage,
+              ITERATION_SHAPE_FIELDS + ['iteration_shape_propagated_from'],
+              depends_on=['business', 'architecture', 'implementation'],
+              reads_text=args.propagate_threshold is not None),
+        Stage('database', database.phase5_export_database,
+              depends_on=['business', 'architecture', 'implementation', 'iteration_shape']),
+        Stage('summary', partial(phase5_generate_summary, sample=sample),
+              depends_on=['business', 'architecture', 'implementation', 'iteration_shape', 'database'],
+              reads_text=False),
+        Stage('company_index', build_company_index,
+              depends_on=['business', 'architecture', 'implementation'], reads_text=False),
+    ]
+    for stage in stages:
+        stage.run = profiling.wrap(stage.name, stage.run)
+    # Long text fields are dropped once the stages that read them are done
+    proposals = run_stages(proposals, stages, sequential=args.sequential, release_text=True)
+
+    # LLM call telemetry
+    call_summary = telemetry.summarize()
+    if call_summary:
+        telemetry.print_summary(call_summary)
+        save_json(call_summary, 'telemetry_summary.json')
+
+    return proposals
+
+
+def run_sample(proposals: List[Dict[str, Any]], args, cascade_models: Dict[str, List[str]],
+               taxonomy_versions: Dict[str, str]) -> List[Dict[str, Any]]:
+    """
+    Classify a company-stratified sample of the proposals (see sampling.py).
+
+    With --ci-width, the sample is doubled until the widest confidence
+    interval in analysis_summary.json is at most that wide (or the whole
+    corpus is classified). Each round extends the previous sample, whose
+    proposals keep their labels, so only the added proposals are classified.
+
+    Returns:
+        The classified sample
+    """
+    population = len(proposals)
+    order = sampling.stratified_order(proposals, args.sample_seed)
+    size = sampling.sample_size(args.sample, population)
+    labels = {}
+    while True:
+        print(f"\n>>> Sampling {size:,} of {population:,} proposals (stratified by company, "
+              f"seed {args.sample_seed})")
+        sample = [copy_record(proposals[i]) for i in order[:size]]
+        for p in sample:
+            p.update(labels.get(proposal_key(p), {}))
+        classified = run_pipeline(sample, args, cascade_models, taxonomy_versions, incremental=bool(labels),
+                                  sample={'population': population, 'seed': args.sample_seed})
+        if args.ci_width is None or size >= population:
+            return classified
+
+        width = sampling.widest_interval(load_json('analysis_summary.json')['confidence_intervals'])
+        if width <= args.ci_width:
+            print(f"\n✓ Widest confidence interval {width:.1%} <= {args.ci_width:.1%}")
+            return classified
+        labels = {proposal_key(p): {f: p[f] for _, fields in PHASE_OUTPUTS for f in fields if f in p}
+                  for p in classified}
+        size = min(2 * size, population)
+        print(f"\n⚠️  Widest confidence interval {width:.1%} > {args.ci_width:.1%}: extending the sample")
+        # Later rounds classify against the taxonomies of the first one
+        args = argparse.Namespace(**{**vars(args), 'rediscover': None})
+
+
+def sample_spec(value: str) -> float:
+    """--sample argument: a number of proposals, or a fraction of them (between 0 and 1)."""
+    spec = float(value)
+    if spec <= 0 or (spec > 1 and not spec.is_integer()):
+        raise argparse.ArgumentTypeError(f"expected a number of proposals or a fraction in (0, 1), got {value}")
+    return spec
+
+
 def main():
     parser = argparse.ArgumentParser(description='Analyze AI system proposals')
-    parser.add_argument('--sample', type=int, help='Analyze only a sample of N proposals')
+    parser.add_argument('--sample', type=sample_spec, metavar='N',
+                        help='Analyze only a company-stratified sample of N proposals (or a fraction '
+                             'of them, e.g. 0.1), reporting distributions with confidence intervals')
+    parser.add_argument('--sample-seed', type=int, default=sampling.DEFAULT_SEED,
+                        help=f'Seed of --sample; a larger sample with the same seed extends a smaller '
+                             f'one (default: {sampling.DEFAULT_SEED})')
+    parser.add_argument('--ci-width', type=float, metavar='W',
+                        help='With --sample, keep doubling the sample until every confidence interval '
+                             'is at most W wide (e.g. 0.05 for ±2.5 points)')
     parser.add_argument('--skip-extract', action='store_true', help='Skip extraction (use existing)')
     parser.add_argument('--skip-business', action='store_true', help='Skip business clustering')
     parser.add_argument('--skip-architecture', action='store_true', help='Skip architecture classification')
     parser.add_argument('--skip-implementation', action='store_true', help='Skip implementation complexity classification')
+    parser.add_argument('--skip-iteration-shape', action='store_true', help='Skip iteration shape classification')
     parser.add_argument('--validate', action='store_true', help='Validate environment and exit')
+    parser.add_argument('--backend', choices=['anthropic', 'stub'], default='anthropic',
+                        help='LLM backend; "stub" answers offline with random schema-valid output (default: anthropic)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of LLM calls to run concurrently per phase (default: 1)')
+    parser.add_argument('--sequential', action='store_true',
+                        help='Run phases one after another instead of running independent phases concurrently')
+    parser.add_argument('--output-format', choices=['json', 'jsonl'], default='json',
+                        help='Format of the proposal files: a JSON array or JSON Lines, streamed '
+                             'one record per line (default: json)')
+    parser.add_argument('--profile', nargs='?', const='spans', choices=['spans', 'sample'],
+                        help='Time every phase; "--profile sample" also samples stacks for a flamegraph '
+                             'and hotspot report (written to outputs/profile/)')
+    parser.add_argument('--dedup-threshold', type=float, default=DEFAULT_DEDUP_THRESHOLD,
+                        help=f'Jaccard similarity above which proposals count as duplicates '
+                             f'(default: {DEFAULT_DEDUP_THRESHOLD})')
+    parser.add_argument('--no-dedup', action='store_true', help='Classify every proposal, even near-duplicates')
+    parser.add_argument('--stream', action='store_true',
+                        help='Stream responses, applying each classification as it arrives')
+    parser.add_argument('--structured', action='store_true',
+                        help='Force schema-validated tool-use output instead of parsing JSON from text')
+    parser.add_argument('--hierarchical-discovery', action='store_true',
+                        help='Discover business clusters from all proposals (map-reduce) instead of the first 60')
+    parser.add_argument('--cascade', action='store_true',
+                        help=f'Classify with {FAST_MODEL} first and escalate low-confidence or invalid '
+                             f'labels to {MODEL}')
+    parser.add_argument('--cascade-models', action='append', metavar='PHASE=MODEL[,MODEL...]',
+                        help='Model tiers for one phase, cheapest first (repeatable; phases: '
+                             f'{", ".join(CLASSIFICATION_PHASES)}); a single model disables the cascade')
+    parser.add_argument('--propagate-threshold', type=float, default=None,
+                        help='Copy labels from near-duplicate proposals with at least this similarity (0-1) '
+                             'instead of calling the LLM')
+    parser.add_argument('--taxonomy', action='append', metavar='KIND=VERSION',
+                        help='Classify against a registered taxonomy version (number or content hash; '
+                             f'repeatable; kinds: {", ".join(taxonomy.KINDS)}); default: the latest')
+    parser.add_argument('--rediscover', nargs='*', choices=taxonomy.KINDS, metavar='KIND',
+                        help='Discover the taxonomies (or only the given kinds) again instead of '
+                             'reusing the registered version; a changed result is registered as a new version')
+    parser.add_argument('--compress', action='store_true',
+                        help='Fit proposal text into per-template token budgets by extractive sentence '
+                             'selection instead of cutting it at a character limit')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Classify every proposal again instead of reusing cached labels')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Re-extract proposals and classify only new or changed ones, keeping the '
+                             'labels of the previous run')
+    parser.add_argument('--watch', action='store_true',
+                        help='Keep running: update outputs and visualizations whenever company proposal '
+                             'files change')
+    parser.add_argument('--watch-interval', type=float, default=DEFAULT_WATCH_INTERVAL,
+                        help=f'Seconds between checks for changed proposal files in --watch mode '
+                             f'(default: {DEFAULT_WATCH_INTERVAL:g})')
+    parser.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE,
+                        help=f'Seconds without further changes before --watch runs an update '
+                             f'(default: {DEFAULT_DEBOUNCE:g})')
 
     args = parser.parse_args()
 
+    try:
+        cascade_models = parse_cascade_models(args.cascade_models, args.cascade)
+        taxonomy_versions = parse_taxonomy_versions(args.taxonomy)
+    except ValueError as e:
+        parser.error(str(e))
+
     print("\n" + "="*80)
     print("AI SYSTEM PROPOSAL ANALYSIS PIPELINE")
     print("="*80)
 
     # Validate environment
-    if not validate_environment(require_api_key=True):
+    if not validate_environment(require_api_key=args.backend == 'anthropic'):
         return 1
 
     # If only validating, exit now
@@ -404,50 +1500,47 @@ def main():
         print("✓ All checks passed! Ready to run analysis.\n")
         return 0
 
-    # Phase 1: Extract
-    if args.skip_extract:
-        print("\nSkipping extraction, loading existing data...")
-        proposals = load_json('raw_proposals.json')
-    else:
-        proposals = phase1_extract_proposals()
+    if args.backend != 'anthropic':
+        print(f"\n>>> Using the {args.backend} LLM backend (labels are not real classifications)")
+        set_backend(create_backend(args.backend))
 
-    # Sample if requested
-    if args.sample and args.sample < len(proposals):
-        print(f"\n>>> Sampling {args.sample} proposals for analysis")
-        proposals = random.sample(proposals, args.sample)
+    set_proposals_format(args.output_format)
+    compression.set_enabled(args.compress)
+    telemetry.start_run(TRACE_FILE)
+    events.start_run(EVENTS_FILE)
+    if not args.no_cache:
+        label_cache.start(OUTPUTS_DIR / 'label_cache')
+    if args.profile:
+        profiling.start('analyze', sample=args.profile == 'sample')
 
-    # Phase 2: Business Clustering
-    if args.skip_business:
-        print("\nSkipping business clustering, loading existing data...")
-        try:
-            proposals = load_json('proposals_with_business.json')
-        except:
-            print("Warning: Could not load existing business classifications")
-    else:
-        proposals = phase2_business_clustering(proposals)
+    if args.watch:
+        return watch_companies(args, cascade_models, taxonomy_versions)
 
-    # Phase 3: Architecture Classification
-    if args.skip_architecture:
-        print("\nSkipping architecture classification, loading existing data...")
-        try:
-            proposals = load_json('proposals_complete.json')
-        except:
-            print("Warning: Could not load existing architecture classifications")
+    # Phase 1: Extract
+    if args.incremental:
+        print("\nRe-extracting proposals, keeping the labels of unchanged ones...")
+        with profiling.span('extract'):
+            proposals, counts = update_proposals()
+        save_proposals(proposals, 'raw_proposals', fieldnames=proposal_columns(proposals, *PHASE_COLUMNS))
+    elif args.skip_extract:
+        print("\nSkipping extraction, loading existing data...")
+        with profiling.span('load'):
+            proposals = to_records(iter_json_array('raw_proposals.json'))
     else:
-        proposals = phase3_architecture_classification(proposals)
+        with profiling.span('extract'):
+            proposals = to_records(phase1_extract_proposals())
 
-    # Phase 4: Implementation Complexity Classification
-    if args.skip_implementation:
-        print("\nSkipping implementation complexity classification, loading existing data...")
-        try:
-            proposals = load_json('proposals_with_implementation.json')
-        except:
-            print("Warning: Could not load existing implementation classifications")
+    # Sample if requested
+    if args.sample and not args.incremental:
+        proposals = run_sample(proposals, args, cascade_models, taxonomy_versions)
     else:
-        proposals = phase4_implementation_classification(proposals)
+        proposals = run_pipeline(proposals, args, cascade_models, taxonomy_versions,
+                                 incremental=args.incremental)
+    if args.incremental:
+        publish_update(counts, None, len(proposals))
+    events.end_run(total_proposals=len(proposals))
 
-    # Phase 5: Summary
-    phase5_generate_summary(proposals)
+    profiling.stop(OUTPUTS_DIR / 'profile')
 
     print("\n" + "="*80)
     print("ANALYSIS COMPLETE!")
@@ -460,7 +1553,18 @@ def main():
     print("- business_clusters_summary.json/csv")
     print("- architecture_summary.json")
     print("- implementation_summary.json")
+    print("- proposals_with_iteration_shape.json/csv")
+    print("- iteration_shapes.json, iteration_shape_summary.json")
     print("- analysis_summary.json")
+    print("- dedup_clusters.json")
+    print("- company_index.npz")
+    print("- proposals.db")
+    print("- taxonomies/, taxonomy_versions.json")
+    if cascade_models:
+        print("- cascade_report.json")
+    print("- llm_trace.jsonl, telemetry_summary.json, pipeline_events.jsonl")
+    if args.profile:
+        print("- profile/ (timing spans, hotspots)")
     print("\nNext step: Run 'python visualize.py' to generate visualizations")
 
 
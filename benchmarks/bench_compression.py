@@ -0,0 +1,199 @@
+"""
+Benchmark of prompt text compression (analyze.py --compress) against the
+character truncation it replaces.
+
+For every template whose text fields go through the `fit` filter, renders
+the corpus in batches of the phase's batch size with compression off and on
+and reports:
+- input tokens per batch (estimated like the stub backend, 4 characters per token)
+- term coverage: the share of each field's distinct content words that
+  survive into the prompt, a local proxy for how much salient text is kept.
+  It is also given for truncation to the compressed token budget, which
+  separates the effect of selecting sentences from that of sending less text
+- compression time per proposal
+
+With --agreement N, phases 3 and 4 also classify N proposals both ways and
+report how often the labels agree. This needs --backend anthropic (and an
+API key): the stub backend answers at random, so its agreement is chance.
+
+Usage:
+    python benchmarks/bench_compression.py                        # outputs/raw_proposals.csv
+    python benchmarks/bench_compression.py --corpus outputs/raw_proposals.json --no-record
+    python benchmarks/bench_compression.py --agreement 100 --backend anthropic
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import re
+import sys
+import tempfile
+import time
+from pathlib import Path
+from statistics import mean
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import analyze
+import compression
+import telemetry
+import utils
+from history import RESULTS_DIR, git_commit, append_results, previous_results
+
+ROOT = Path(__file__).resolve().parent.parent
+HISTORY_FILE = RESULTS_DIR / 'compression_history.jsonl'
+DEFAULT_CORPUS = ROOT / 'outputs' / 'raw_proposals.csv'
+
+# Template, batch size of its phase, extra template variables
+TEMPLATES = [
+    ('business_clustering_discovery.j2', 60, {}),
+    ('business_clustering_classify.j2', 12, {'system_types': ['Customer Support'], 'enumerate': enumerate}),
+    ('architecture_classify.j2', 10, {}),
+    ('implementation_classify.j2', 8, {}),
+]
+
+# Label fields compared by --agreement
+AGREEMENT_PHASES = [
+    ('architecture', analyze.phase3_architecture_classification, analyze.ARCHITECTURE_FIELDS),
+    ('implementation', analyze.phase4_implementation_classification, analyze.IMPLEMENTATION_FIELDS),
+]
+
+_FIT = re.compile(r'prop\.(\w+) \| fit\((\d+), (\d+)\)')
+
+
+def load_corpus(path: Path) -> list:
+    """Proposals from a CSV, JSON or JSON Lines file."""
+    if path.suffix == '.csv':
+        csv.field_size_limit(sys.maxsize)
+        with open(path, newline='', encoding='utf-8') as f:
+            return list(csv.DictReader(f))
+    return list(utils.iter_json_array(path.name, path.parent))
+
+
+def _terms(text: str) -> set:
+    return set(compression._content_words(text))
+
+
+# ============================================================================
+# Measurement
+# ============================================================================
+
+def measure_template(proposals: list, template: str, batch_size: int, variables: dict) -> dict:
+    """Tokens per batch and term coverage of a template, truncated vs compressed."""
+    fields = _FIT.findall((utils.PROMPTS_DIR / template).read_text(encoding='utf-8'))
+    batches = utils.batch_items(proposals, batch_size)
+    result = {'template': template, 'batches': len(batches)}
+
+    for mode in ('truncated', 'compressed'):
+        compression.set_enabled(mode == 'compressed')
+        started = time.perf_counter()
+        tokens = [compression.estimate_tokens(utils.render_prompt(template, proposals=batch, **variables))
+                  for batch in batches]
+        result[f'{mode}_seconds'] = time.perf_counter() - started
+
+        coverage = []
+        for p in proposals:
+            for field, chars, budget in fields:
+                full = _terms(p.get(field) or '')
+                if full:
+                    kept = _terms(compression.fit(p.get(field), int(chars), int(budget)))
+                    coverage.append(len(full & kept) / len(full))
+        result[f'{mode}_tokens_per_batch'] = mean(tokens)
+        result[f'{mode}_term_coverage'] = mean(coverage) if coverage else None
+
+    coverage = []
+    for p in proposals:
+        for field, _, budget in fields:
+            full = _terms(p.get(field) or '')
+            if full:
+                kept = _terms(p[field][:int(budget) * compression.CHARS_PER_TOKEN])
+                coverage.append(len(full & kept) / len(full))
+    result['budget_truncated_term_coverage'] = mean(coverage) if coverage else None
+
+    compression.set_enabled(False)
+    result['token_reduction'] = 1 - result['compressed_tokens_per_batch'] / result['truncated_tokens_per_batch']
+    return result
+
+
+def measure_agreement(proposals: list, n: int) -> dict:
+    """Share of labels that agree between truncated and compressed prompts, per phase."""
+    sample = proposals[:n]
+    labels = {}
+    for mode in ('truncated', 'compressed'):
+        compression.set_enabled(mode == 'compressed')
+        for phase, run_phase, fields in AGREEMENT_PHASES:
+            copies = [dict(p) for p in sample]
+            with contextlib.redirect_stdout(io.StringIO()):
+                run_phase(copies, max_workers=4)
+            labels[mode, phase] = [{f: p.get(f) for f in fields} for p in copies]
+    compression.set_enabled(False)
+
+    agreement = {}
+    for phase, _, fields in AGREEMENT_PHASES:
+        pairs = list(zip(labels['truncated', phase], labels['compressed', phase]))
+        matches = sum(a[f] == b[f] for a, b in pairs for f in fields)
+        agreement[phase] = matches / (len(pairs) * len(fields)) if pairs else None
+    return agreement
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark prompt text compression against truncation')
+    parser.add_argument('--corpus', type=Path, default=DEFAULT_CORPUS,
+                        help=f'Proposals with text fields (default: {DEFAULT_CORPUS.relative_to(ROOT)})')
+    parser.add_argument('--agreement', type=int, metavar='N',
+                        help='Also classify N proposals both ways and compare labels (phases 3 and 4)')
+    parser.add_argument('--backend', choices=['anthropic', 'stub'], default='stub',
+                        help='LLM backend for --agreement (default: stub, whose labels are random)')
+    parser.add_argument('--no-record', action='store_true', help=f'Do not append results to {HISTORY_FILE.name}')
+    args = parser.parse_args()
+
+    proposals = load_corpus(args.corpus)
+    commit = git_commit()
+    previous = previous_results(HISTORY_FILE, commit, ('template',), value_field='compressed_tokens_per_batch')
+    print(f"\n{len(proposals):,} proposals from {args.corpus}")
+    print("-" * 112)
+    print(f"  {'Template':34s} {'Tokens/batch':>13s} {'Compressed':>11s} {'Saved':>7s} "
+          f"{'Coverage':>9s} {'Same budget':>12s} {'Compressed':>11s} {'ms/prop':>8s} {'Previous':>9s}")
+
+    records = []
+    for template, batch_size, variables in TEMPLATES:
+        r = measure_template(proposals, template, batch_size, variables)
+        overhead_ms = (r['compressed_seconds'] - r['truncated_seconds']) * 1000 / len(proposals)
+        before = previous.get((template,))
+        print(f"  {template:34s} {r['truncated_tokens_per_batch']:13.0f} {r['compressed_tokens_per_batch']:11.0f} "
+              f"{r['token_reduction']:7.1%} {r['truncated_term_coverage']:9.1%} "
+              f"{r['budget_truncated_term_coverage']:12.1%} {r['compressed_term_coverage']:11.1%} "
+              f"{overhead_ms:8.2f} {f'{before[1]:.0f}' if before else '':>9s}")
+        records.append({
+            'template': template,
+            'proposals': len(proposals),
+            'truncated_tokens_per_batch': round(r['truncated_tokens_per_batch'], 1),
+            'compressed_tokens_per_batch': round(r['compressed_tokens_per_batch'], 1),
+            'truncated_term_coverage': round(r['truncated_term_coverage'], 4),
+            'budget_truncated_term_coverage': round(r['budget_truncated_term_coverage'], 4),
+            'compressed_term_coverage': round(r['compressed_term_coverage'], 4),
+            'compression_ms_per_proposal': round(overhead_ms, 3),
+        })
+
+    if args.agreement:
+        if args.backend == 'stub':
+            print("\n⚠️  The stub backend labels at random: agreement below is chance, not prompt quality")
+        utils.set_backend(utils.create_backend(args.backend))
+        telemetry.start_run(None)
+        with tempfile.TemporaryDirectory() as tmp:
+            utils.OUTPUTS_DIR = Path(tmp)
+            agreement = measure_agreement(proposals, args.agreement)
+        print(f"\nLabel agreement, truncated vs compressed ({args.agreement} proposals, {args.backend})")
+        for phase, share in agreement.items():
+            print(f"  {phase:16s} {share:.1%}")
+            if args.backend != 'stub':
+                records.append({'template': f'agreement:{phase}', 'proposals': args.agreement,
+                                'label_agreement': round(share, 4)})
+
+    if not args.no_record:
+        append_results(HISTORY_FILE, commit, records)
+
+
+if __name__ == "__main__":
+    main()
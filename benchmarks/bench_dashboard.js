@@ -0,0 +1,85 @@
+// Times the dashboard's aggregation and chart-building functions in Node.
+//
+// Loads dashboard_worker.js (aggregation) and the inline <script> of
+// dashboard.html (chart building, in a sandbox where Plotly and the DOM are
+// replaced by no-op stand-ins), so only the JavaScript that runs before Plotly
+// renders is measured. Each chart is timed as the worker's aggregation plus
+// the page's chart building; `memoized` repeats the heatmap request, which
+// the worker answers from its memo.
+//
+// Usage: node benchmarks/bench_dashboard.js corpus.jsonl
+// Prints a JSON object: {"<function>": seconds, ...}; 1D charts use PRIMARY,
+// 2D charts PRIMARY x SECONDARY and countValues the multi-value dimension.
+
+const fs = require('fs');
+const path = require('path');
+const vm = require('vm');
+
+const PRIMARY = 'business_use_case';
+const SECONDARY = 'architecture_pattern';
+const MULTI_VALUE = 'knowledge_representation';
+
+function loadCorpus(file) {
+    // JSON lines: a single JSON array of 1M proposals exceeds V8's string limit
+    const proposals = [];
+    const buffer = fs.readFileSync(file);
+    let start = 0;
+    while (start < buffer.length) {
+        let end = buffer.indexOf(10, start);
+        if (end === -1) end = buffer.length;
+        if (end > start) proposals.push(JSON.parse(buffer.toString('utf8', start, end)));
+        start = end + 1;
+    }
+    return proposals;
+}
+
+function element() {
+    return { textContent: '', value: '', style: {}, classList: { add() {}, remove() {} }, on() {} };
+}
+
+const root = path.join(__dirname, '..');
+const html = fs.readFileSync(path.join(root, 'dashboard.html'), 'utf8');
+const scripts = [...html.matchAll(/<script>([\s\S]*?)<\/script>/g)].map(m => m[1]);
+
+const errors = [];
+const page = vm.createContext({
+    console,
+    window: {},
+    document: { getElementById: () => element() },
+    Plotly: { newPlot() {} },
+});
+scripts.forEach(code => vm.runInContext(code, page));
+page.__errors = errors;
+vm.runInContext('showError = message => __errors.push(message);', page);
+
+// Run in this realm rather than a vm context: globals (even Math) are much
+// slower to access in a vm context than in a real worker
+const workerSource = fs.readFileSync(path.join(root, 'dashboard_worker.js'), 'utf8');
+const worker = new Function(`${workerSource}\nreturn { setProposals, stats, valueCounts, aggregate };`)();
+worker.setProposals(loadCorpus(process.argv[2]));
+
+const oneDimension = chart => worker.aggregate({ chart, primary: PRIMARY, topN: 20 });
+const twoDimensions = chart => worker.aggregate({ chart, primary: PRIMARY, secondary: SECONDARY });
+
+const cases = [
+    ['stats', () => worker.stats()],
+    ['countValues', () => worker.valueCounts(MULTI_VALUE)],
+    ['createBarChart', () => page.createBarChart(PRIMARY, 20, oneDimension('bar'))],
+    ['createPieChart', () => page.createPieChart(PRIMARY, 20, oneDimension('pie'))],
+    ['createTreemap', () => page.createTreemap(PRIMARY, 20, oneDimension('treemap'))],
+    ['createSunburst', () => page.createSunburst(PRIMARY, SECONDARY, twoDimensions('sunburst'))],
+    ['createHeatmap', () => page.createHeatmap(PRIMARY, SECONDARY, twoDimensions('heatmap'))],
+    ['createScatterPlot', () => page.createScatterPlot(PRIMARY, SECONDARY, twoDimensions('scatter'))],
+    ['createSankeyDiagram', () => page.createSankeyDiagram(PRIMARY, SECONDARY, twoDimensions('sankey'))],
+    ['memoized', () => page.createHeatmap(PRIMARY, SECONDARY, twoDimensions('heatmap'))],
+];
+
+const results = {};
+for (const [name, run] of cases) {
+    const started = process.hrtime.bigint();
+    run();
+    results[name] = Number(process.hrtime.bigint() - started) / 1e9;
+}
+if (errors.length) results.errors = errors;
+
+console.log(JSON.stringify(results));
@@ -0,0 +1,127 @@
+"""
+Peak memory benchmark for analyze.py and visualize.py.
+
+Writes synthetic corpora with full-length text fields (raw_proposals.json
+for analyze.py, proposals_complete.json for visualize.py) to a temporary
+outputs directory, then runs in a fresh interpreter each:
+- analyze.py --backend stub --skip-extract (every phase, stub LLM without latency)
+- visualize.py (all visualizations)
+
+and reports peak RSS and wall time. Results are appended to
+benchmarks/results/memory_history.jsonl and compared with the latest result
+recorded at a different commit.
+
+Usage:
+    python benchmarks/bench_memory.py                        # 100k proposals
+    python benchmarks/bench_memory.py --sizes 10000 --no-record
+    python benchmarks/bench_memory.py --only visualize
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from synthetic_corpus import generate_corpus, synthetic_raw_proposals, write_corpus
+from history import RESULTS_DIR, git_commit, append_results, previous_results
+
+ROOT = Path(__file__).resolve().parent.parent
+HISTORY_FILE = RESULTS_DIR / 'memory_history.jsonl'
+
+# Runs an entry point with its outputs redirected, then reports its peak RSS
+RUNNER = '''
+import json, resource, sys, time
+from pathlib import Path
+sys.path.insert(0, {root!r})
+import utils
+utils.OUTPUTS_DIR = Path({outputs!r})
+import {module} as entry
+entry.OUTPUTS_DIR = utils.OUTPUTS_DIR
+entry.TRACE_FILE = utils.OUTPUTS_DIR / 'llm_trace.jsonl'
+entry.EVENTS_FILE = utils.OUTPUTS_DIR / 'pipeline_events.jsonl'
+entry.VIZ_DIR = utils.OUTPUTS_DIR / 'visualizations'
+sys.argv = [{module!r}] + {argv!r}
+started = time.perf_counter()
+entry.main()
+print(json.dumps({{'seconds': time.perf_counter() - started,
+                  'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}}))
+'''
+
+TARGETS = {
+    'analyze': ('analyze', ['--backend', 'stub', '--skip-extract', '--workers', '8']),
+    'visualize': ('visualize', []),
+}
+
+
+# ============================================================================
+# Measurement
+# ============================================================================
+
+def write_inputs(n: int, outputs: Path, seed: int):
+    """Write raw and classified corpora of n proposals with full text fields."""
+    raw = synthetic_raw_proposals(n, seed=seed)
+    write_corpus(raw, outputs / 'raw_proposals.json')
+
+    classified = generate_corpus(n, seed=seed)
+    for text, labels in zip(raw, classified):
+        text.update({k: v for k, v in labels.items() if k not in ('company', 'proposal_name')})
+    write_corpus(raw, outputs / 'proposals_complete.json')
+
+
+def measure(target: str, outputs: Path) -> dict:
+    """Run one entry point in a fresh interpreter; returns seconds and peak RSS."""
+    module, argv = TARGETS[target]
+    code = RUNNER.format(root=str(ROOT), outputs=str(outputs), module=module, argv=argv)
+    # analyze.py validates that a data directory exists even with --skip-extract
+    (outputs / 'companies').mkdir(exist_ok=True)
+    env = {**os.environ, 'BUTTON_DATA_PATH': str(outputs)}
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, cwd=ROOT, env=env)
+    if result.returncode != 0:
+        raise RuntimeError(f"{target} failed: {result.stderr.strip()[-300:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark peak memory of analyze.py and visualize.py')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100000],
+                        help='Corpus sizes (default: 100000)')
+    parser.add_argument('--only', choices=sorted(TARGETS), help='Measure only one entry point')
+    parser.add_argument('--no-record', action='store_true', help=f'Do not append results to {HISTORY_FILE.name}')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    commit = git_commit()
+    previous = previous_results(HISTORY_FILE, commit, ('size', 'target'), value_field='peak_rss_mb')
+    targets = [args.only] if args.only else list(TARGETS)
+    records = []
+
+    for n in args.sizes:
+        print(f"\n{n:,} proposals")
+        print("-" * 72)
+        print(f"  {'Target':12s} {'Peak RSS MB':>12s} {'Seconds':>9s} {'Previous MB':>20s}")
+        with tempfile.TemporaryDirectory() as tmp:
+            outputs = Path(tmp)
+            write_inputs(n, outputs, args.seed)
+            for target in targets:
+                result = measure(target, outputs)
+                before = previous.get((n, target))
+                before_text = f"{before[1]:9.0f} ({before[0]})" if before else ''
+                print(f"  {target:12s} {result['peak_rss_mb']:12.0f} {result['seconds']:9.1f} {before_text:>20s}")
+                records.append({
+                    'size': n,
+                    'target': target,
+                    'seconds': round(result['seconds'], 2),
+                    'peak_rss_mb': round(result['peak_rss_mb'], 1),
+                })
+
+    if not args.no_record:
+        append_results(HISTORY_FILE, commit, records)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+End-to-end throughput benchmark for the classification phases (2-4).
+
+Runs the real phase functions from analyze.py against synthetic proposals,
+with the in-process stub LLM backend standing in for the API (no key
+needed, nothing is billed). Outputs are written to a temporary directory.
+
+Reports per phase and corpus size:
+- proposals/sec (phase wall time, including prompt rendering and saving)
+- end-to-end wall time of the three phases (phases 3 and 4 run
+  concurrently after phase 2 like analyze.py, or one after another with
+  --sequential)
+- p95 batch latency (LLM call wall time including retries, from telemetry)
+- estimated cost (token counts priced per model; compare with --cascade)
+- failure recovery: retried calls, calls that failed for good, truncated
+  responses, and the share of proposals that still got a label
+
+With --rerun every size runs a second time against the label cache of the
+first run (see label_cache.py), with stub failures switched off so that
+every proposal gets a label. The script fails if the rerun makes any LLM
+call.
+
+Usage:
+    python benchmarks/bench_pipeline.py                       # 1k, 10k and 100k proposals
+    python benchmarks/bench_pipeline.py --sizes 1000 --workers 16
+    python benchmarks/bench_pipeline.py --error-rate 0.05 --rate-limit-rate 0.05 --truncation-rate 0.05
+    python benchmarks/bench_pipeline.py --sizes 1000 --propagate-threshold 0.3 --rerun
+    python benchmarks/bench_pipeline.py --output benchmarks/results/pipeline.json
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import analyze
+import label_cache
+import telemetry
+import utils
+from llm_backends import StubBackend
+from pipeline import Stage, run_stages
+from synthetic_corpus import synthetic_raw_proposals
+from history import git_commit
+
+
+# Field used to check whether a proposal got a label in each phase
+PHASES = [
+    ('business', analyze.phase2_business_clustering, 'business_use_case', []),
+    ('architecture', analyze.phase3_architecture_classification, 'architecture_pattern', ['business']),
+    ('implementation', analyze.phase4_implementation_classification, 'data_complexity', ['business']),
+]
+
+
+# ============================================================================
+# Benchmark
+# ============================================================================
+
+def run_size(n: int, args) -> dict:
+    """Run phases 2-4 on n synthetic proposals and collect metrics."""
+    utils.set_backend(StubBackend(
+        latency_median=args.latency_median,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        truncation_rate=args.truncation_rate,
+        seed=args.seed,
+    ))
+    proposals = synthetic_raw_proposals(n, seed=args.seed)
+    elapsed = {}
+
+    def timed(phase, run_phase):
+        def run(stage_proposals):
+            started = time.perf_counter()
+            result = run_phase(stage_proposals, max_workers=args.workers,
+                               models=utils.CASCADE_MODELS if args.cascade else None,
+                               propagate_threshold=args.propagate_threshold)
+            elapsed[phase] = time.perf_counter() - started
+            return result
+        return run
+
+    # The phases run as stages with the dependencies of analyze.py
+    stages = [Stage(phase, timed(phase, run_phase), [label_field], depends_on=depends_on)
+              for phase, run_phase, label_field, depends_on in PHASES]
+    telemetry.start_run(None)
+    started = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        proposals = run_stages(proposals, stages, sequential=args.sequential)
+    total = time.perf_counter() - started
+
+    results = {}
+    for phase, _, label_field, _ in PHASES:
+        calls = [r for r in telemetry.get_records()
+                 if r.get('phase') == phase or r.get('phase', '').startswith(f'{phase}_escalated')]
+        latencies = [r['wall_time'] for r in calls if r['status'] == 'ok']
+        labeled = sum(1 for p in proposals if p.get(label_field, 'Unknown') != 'Unknown')
+
+        results[phase] = {
+            'seconds': round(elapsed[phase], 3),
+            'proposals_per_sec': round(n / elapsed[phase], 1),
+            'calls': len(calls),
+            'p50_batch_latency': telemetry.percentile(latencies, 50),
+            'p95_batch_latency': telemetry.percentile(latencies, 95),
+            'retries': sum(r['retries'] for r in calls),
+            'failed_calls': sum(1 for r in calls if r['status'] == 'error'),
+            'truncated': sum(1 for r in calls if r['stop_reason'] == 'max_tokens'),
+            'labeled_share': round(labeled / n, 4),
+            'escalated_calls': sum(1 for r in calls if r['phase'] != phase),
+            'estimated_cost': round(sum(r['cost'] or 0 for r in calls), 4),
+        }
+
+    results['end_to_end'] = {
+        'seconds': round(total, 3),
+        'proposals_per_sec': round(n / total, 1),
+    }
+    return results
+
+
+def print_results(n: int, results: dict):
+    print(f"\n{n:,} proposals")
+    print("-" * 100)
+    print(f"  {'Phase':16s} {'Seconds':>8s} {'Prop/s':>8s} {'Calls':>7s} {'p95 s':>7s} "
+          f"{'Retries':>8s} {'Failed':>7s} {'Trunc':>6s} {'Labeled':>8s} {'Cost $':>8s}")
+    for phase, r in results.items():
+        if phase == 'end_to_end':
+            print(f"  {phase:16s} {r['seconds']:8.1f} {r['proposals_per_sec']:8.1f}")
+            continue
+        p95 = f"{r['p95_batch_latency']:7.3f}" if r['p95_batch_latency'] is not None else f"{'-':>7s}"
+        print(f"  {phase:16s} {r['seconds']:8.1f} {r['proposals_per_sec']:8.1f} {r['calls']:7d} {p95} "
+              f"{r['retries']:8d} {r['failed_calls']:7d} {r['truncated']:6d} {r['labeled_share'] * 100:7.1f}% "
+              f"{r['estimated_cost']:8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark classification phases against the stub LLM backend')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+                        help='Corpus sizes to benchmark (default: 1000 10000 100000)')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent LLM calls per phase (default: 8)')
+    parser.add_argument('--cascade', action='store_true',
+                        help='Classify with the fast model first and escalate uncertain labels (see analyze.py --cascade)')
+    parser.add_argument('--propagate-threshold', type=float, metavar='SIM',
+                        help='Copy labels to near-duplicates (see analyze.py --propagate-threshold)')
+    parser.add_argument('--rerun', action='store_true',
+                        help='Run every size again from the label cache and fail unless the rerun makes no LLM calls')
+    parser.add_argument('--sequential', action='store_true',
+                        help='Run the phases one after another instead of concurrently')
+    parser.add_argument('--latency-median', type=float, default=0.05,
+                        help='Median stub call latency in seconds (default: 0.05)')
+    parser.add_argument('--latency-sigma', type=float, default=0.5,
+                        help='Log-normal spread of stub latency (default: 0.5)')
+    parser.add_argument('--error-rate', type=float, default=0.02, help='Share of calls failing with 500')
+    parser.add_argument('--rate-limit-rate', type=float, default=0.02, help='Share of calls failing with 429')
+    parser.add_argument('--truncation-rate', type=float, default=0.02, help='Share of truncated responses')
+    parser.add_argument('--retry-delay', type=float, default=0.01,
+                        help='Base retry backoff in seconds (default: 0.01)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', type=Path, help='Write results as JSON to this file')
+    args = parser.parse_args()
+
+    utils.RETRY_BASE_DELAY = args.retry_delay
+    if args.rerun:
+        # Proposals that only got default labels are classified again on a rerun
+        args.error_rate = args.rate_limit_rate = args.truncation_rate = 0.0
+    all_results = {}
+    rerun_calls = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        utils.OUTPUTS_DIR = Path(tmp)
+        for n in args.sizes:
+            if args.rerun:
+                label_cache.start(Path(tmp) / f'label_cache_{n}')
+            all_results[n] = run_size(n, args)
+            print_results(n, all_results[n])
+            if args.rerun:
+                rerun = run_size(n, args)
+                print_results(n, rerun)
+                rerun_calls[n] = sum(r['calls'] for phase, r in rerun.items() if phase != 'end_to_end')
+                all_results[n] = {'first_run': all_results[n], 'rerun': rerun}
+
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({
+                'commit': git_commit(),
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'config': {k: v for k, v in vars(args).items() if k != 'output'},
+                'results': all_results,
+            }, f, indent=2)
+        print(f"\n✓ Saved {args.output}")
+
+    if args.rerun:
+        for n, calls in rerun_calls.items():
+            print(f"\nRerun of {n:,} proposals: {calls} LLM calls")
+        if any(rerun_calls.values()):
+            sys.exit("✗ Reruns should be served from the label cache without LLM calls")
+
+
+if __name__ == "__main__":
+    main()
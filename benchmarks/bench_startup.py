@@ -0,0 +1,93 @@
+"""
+Startup benchmark for the command-line entry points.
+
+Measures, each in a fresh interpreter:
+- the cumulative import time of the project modules (`python -X importtime`)
+- the wall time of `--help` for each entry point (argument parsing only,
+  which is what interactive use pays before any work starts)
+
+Results are appended to benchmarks/results/startup_history.jsonl and
+compared with the latest result recorded at a different commit.
+
+Usage:
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeat 10 --no-record
+"""
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from history import RESULTS_DIR, git_commit, append_results, previous_results
+
+ROOT = Path(__file__).resolve().parent.parent
+HISTORY_FILE = RESULTS_DIR / 'startup_history.jsonl'
+
+MODULES = ['utils', 'llm_backends', 'analyze', 'visualize', 'serve_dashboard']
+COMMANDS = {
+    'analyze --help': ['analyze.py', '--help'],
+    'visualize --help': ['visualize.py', '--help'],
+    'serve_dashboard --help': ['serve_dashboard.py', '--help'],
+}
+
+
+# ============================================================================
+# Timing
+# ============================================================================
+
+def import_seconds(module: str) -> float:
+    """Cumulative import time of a module in a fresh interpreter."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True, cwd=ROOT)
+    for line in reversed(result.stderr.splitlines()):
+        match = re.match(r'import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)$', line)
+        if match and match.group(2) == module:
+            return int(match.group(1)) / 1e6
+    raise RuntimeError(f"Could not import {module}: {result.stderr.strip()[-200:]}")
+
+
+def command_seconds(args: list) -> float:
+    """Wall time of a command in a fresh interpreter."""
+    started = time.perf_counter()
+    subprocess.run([sys.executable] + args, capture_output=True, cwd=ROOT, check=True)
+    return time.perf_counter() - started
+
+
+def median_of(func, arg, repeat: int) -> float:
+    return statistics.median(func(arg) for _ in range(repeat))
+
+
+# ============================================================================
+# Report
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark module import and CLI startup times')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement; the median is kept (default: 5)')
+    parser.add_argument('--no-record', action='store_true', help=f'Do not append results to {HISTORY_FILE.name}')
+    args = parser.parse_args()
+
+    commit = git_commit()
+    previous = previous_results(HISTORY_FILE, commit, ('target',))
+
+    results = {f"import {module}": median_of(import_seconds, module, args.repeat) for module in MODULES}
+    results.update({name: median_of(command_seconds, command, args.repeat) for name, command in COMMANDS.items()})
+
+    print(f"\n  {'Target':32s} {'Seconds':>9s} {'Previous':>18s}")
+    print("-" * 64)
+    for target, seconds in results.items():
+        before = previous.get((target,))
+        before_text = f"{before[1]:8.3f} ({before[0]})" if before else ''
+        print(f"  {target:32s} {seconds:9.3f} {before_text:>18s}")
+
+    if not args.no_record:
+        append_results(HISTORY_FILE, commit,
+                       [{'target': target, 'seconds': round(seconds, 4)} for target, seconds in results.items()])
+
+
+if __name__ == "__main__":
+    main()
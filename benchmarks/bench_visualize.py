@@ -0,0 +1,145 @@
+"""
+Scale benchmark for visualize.py and the dashboard aggregations.
+
+Generates synthetic classified corpora (see synthetic_corpus.py), times every
+`create_*` function of visualize.py (HTML written to a temporary directory)
+and, if Node.js is installed, the chart functions of dashboard.html (see
+bench_dashboard.js).
+
+Results are appended to benchmarks/results/visualize_history.jsonl with the
+current commit, and each timing is compared with the latest result recorded
+at a different commit.
+
+A function slower than --budget seconds is skipped at larger sizes.
+
+Usage:
+    python benchmarks/bench_visualize.py                   # 10k, 100k and 1M proposals
+    python benchmarks/bench_visualize.py --sizes 10000 --no-record
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import visualize
+from synthetic_corpus import fit_distributions, generate_corpus, write_corpus
+from history import RESULTS_DIR, git_commit, append_results, previous_results
+
+BENCH_DIR = Path(__file__).resolve().parent
+HISTORY_FILE = RESULTS_DIR / 'visualize_history.jsonl'
+
+
+# ============================================================================
+# Timing
+# ============================================================================
+
+def visualize_functions():
+    """All create_* functions of visualize.py, in definition order."""
+    return [func for name, func in vars(visualize).items()
+            if name.startswith('create_') and callable(func)
+            and getattr(func, '__module__', None) == visualize.__name__]
+
+
+def time_visualize(proposals, skip: set, budget: float) -> dict:
+    """Time each create_* function; functions in skip are not run."""
+    results = {}
+    for func in visualize_functions():
+        target = f"visualize.{func.__name__}"
+        if target in skip:
+            results[target] = None
+            continue
+        started = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            func(proposals)
+        results[target] = time.perf_counter() - started
+        if results[target] > budget:
+            skip.add(target)
+    return results
+
+
+def time_dashboard(proposals, tmp: Path) -> dict:
+    """Time the dashboard chart functions with Node.js (empty if Node is not installed)."""
+    node = shutil.which('node')
+    if node is None:
+        return {}
+
+    corpus = tmp / 'corpus.jsonl'
+    write_corpus(proposals, corpus, jsonl=True)
+    result = subprocess.run([node, '--max-old-space-size=8192', str(BENCH_DIR / 'bench_dashboard.js'), str(corpus)],
+                            capture_output=True, text=True)
+    corpus.unlink()
+    if result.returncode != 0:
+        print(f"✗ Dashboard benchmark failed: {result.stderr.strip()[-200:]}")
+        return {}
+
+    timings = json.loads(result.stdout)
+    for error in timings.pop('errors', []):
+        print(f"⚠️  Dashboard: {error}")
+    return {f"dashboard.{name}": seconds for name, seconds in timings.items()}
+
+
+# ============================================================================
+# Report
+# ============================================================================
+
+def print_results(n: int, results: dict, previous: dict):
+    print(f"\n{n:,} proposals")
+    print("-" * 80)
+    print(f"  {'Target':48s} {'Seconds':>9s} {'Previous':>18s}")
+    for target, seconds in results.items():
+        before = previous.get((n, target))
+        before_text = f"{before[1]:8.3f} ({before[0]})" if before else ''
+        seconds_text = f"{seconds:9.3f}" if seconds is not None else f"{'skipped':>9s}"
+        print(f"  {target[:48]:48s} {seconds_text} {before_text:>18s}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark visualizations on synthetic corpora')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 100000, 1000000],
+                        help='Corpus sizes (default: 10000 100000 1000000)')
+    parser.add_argument('--budget', type=float, default=60.0,
+                        help='Skip a function at larger sizes once it takes longer than this (default: 60s)')
+    parser.add_argument('--no-dashboard', action='store_true', help='Skip the dashboard.html benchmark')
+    parser.add_argument('--no-record', action='store_true', help=f'Do not append results to {HISTORY_FILE.name}')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    commit = git_commit()
+    previous = previous_results(HISTORY_FILE, commit, ('size', 'target'))
+    distributions = fit_distributions()
+    skip = set()
+    records = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        visualize.VIZ_DIR = tmp
+
+        for n in sorted(args.sizes):
+            proposals = generate_corpus(n, distributions, seed=args.seed)
+            results = time_visualize(proposals, skip, args.budget)
+            if not args.no_dashboard:
+                results.update(time_dashboard(proposals, tmp))
+            print_results(n, results, previous)
+
+            records.extend({
+                'size': n,
+                'target': target,
+                'seconds': round(seconds, 4) if seconds is not None else None,
+            } for target, seconds in results.items())
+            del proposals
+
+    if not args.no_record:
+        append_results(HISTORY_FILE, commit, records)
+
+
+if __name__ == "__main__":
+    main()
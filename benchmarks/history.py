@@ -0,0 +1,48 @@
+"""
+Benchmark result history.
+
+Benchmarks append one JSON record per measurement to a history file under
+benchmarks/results/, tagged with the commit it was measured at, so results
+can be compared across commits.
+"""
+
+import json
+import subprocess
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Tuple
+
+RESULTS_DIR = Path(__file__).resolve().parent / 'results'
+
+
+def git_commit() -> str:
+    """Short hash of the checked-out commit ('' outside a git checkout)."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+                              text=True, cwd=RESULTS_DIR.parent).stdout.strip()
+    except OSError:
+        return ''
+
+
+def append_results(history_file: Path, commit: str, results: List[Dict[str, Any]]):
+    """Append measurement records (each gets the commit and a timestamp)."""
+    history_file.parent.mkdir(parents=True, exist_ok=True)
+    timestamp = time.strftime('%Y-%m-%dT%H:%M:%S')
+    with open(history_file, 'a', encoding='utf-8') as f:
+        for result in results:
+            f.write(json.dumps({'commit': commit, 'timestamp': timestamp, **result}) + '\n')
+    print(f"\n✓ Appended {len(results)} results to {history_file}")
+
+
+def previous_results(history_file: Path, commit: str, key_fields: Tuple[str, ...],
+                     value_field: str = 'seconds') -> Dict[tuple, Tuple[str, float]]:
+    """Latest (commit, value) per key recorded at a commit other than `commit`."""
+    previous = {}
+    if history_file.exists():
+        with open(history_file, encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                if record['commit'] != commit and record.get(value_field) is not None:
+                    key = tuple(record[field] for field in key_fields)
+                    previous[key] = (record['commit'], record[value_field])
+    return previous
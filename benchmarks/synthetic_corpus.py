@@ -0,0 +1,270 @@
+"""
+Synthetic proposal corpora for scale testing.
+
+Classified corpora are drawn from dimension distributions fitted on the
+summaries of the real analysis (outputs/*_summary.json): business use cases,
+the 7 architecture and 12 implementation dimensions, and multi-value fields
+with the real average number of values per proposal (stored comma-separated,
+like the pipeline output). Company sizes, for classified and raw corpora
+alike, are resampled from the number of proposals of each company in
+outputs/raw_proposals.*, so the spread between small and large companies is
+kept; without raw outputs every company gets the mean number of proposals.
+
+Usage:
+    python benchmarks/synthetic_corpus.py 100000                 # outputs/synthetic/proposals_100000.json
+    python benchmarks/synthetic_corpus.py 1000000 --jsonl        # One proposal per line
+"""
+
+import argparse
+import csv
+import json
+import random
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from utils import OUTPUTS_DIR, output_path, iter_json_array
+from schemas import ARCHITECTURE_VALUES, IMPLEMENTATION_VALUES, MULTI_VALUE_FIELDS
+
+
+WORDS = (
+    "agent claims invoice customer policy workflow document review approval risk fraud model "
+    "pipeline data extraction compliance audit report schedule forecast quality inspection "
+    "contract clause patient triage ticket routing knowledge search summary recommendation "
+    "vendor payment reconciliation escalation analyst manual spreadsheet email portal system"
+).split()
+
+# Approximate field lengths (characters) of real proposals, as read by the prompts
+FIELD_LENGTHS = {
+    'current_state': 800,
+    'problems': 450,
+    'functionality': 1000,
+    'problem_solving': 600,
+}
+
+
+# ============================================================================
+# Fitting
+# ============================================================================
+
+def _fit_field(counts: Dict[str, int], allowed: Optional[List[str]] = None) -> Dict[str, int]:
+    """
+    Clean up the counts of one dimension.
+
+    Summaries count comma-separated values piece by piece, so allowed values
+    that contain a comma (e.g. 'Multimodal, Simple') appear as fragments.
+    Their weight is estimated as the smallest count of their fragments.
+    """
+    counts = {k: v for k, v in counts.items() if k != 'Unknown'}
+    if not allowed:
+        return counts
+
+    fitted = {}
+    fragments = set()
+    for value in allowed:
+        if value in counts:
+            fitted[value] = counts[value]
+        elif ', ' in value:
+            parts = value.split(', ')
+            fragments.update(parts)
+            weight = min(counts.get(part, 0) for part in parts)
+            if weight:
+                fitted[value] = weight
+
+    # Keep values seen in the data but missing from the schema (model drift)
+    for value, count in counts.items():
+        if value not in fitted and value not in fragments:
+            fitted[value] = count
+
+    return fitted
+
+
+def fit_company_sizes(outputs_dir: Path = OUTPUTS_DIR) -> Optional[List[int]]:
+    """Number of proposals of each company in outputs/raw_proposals.* (None without raw outputs)."""
+    counts = Counter()
+    if output_path('raw_proposals.json', outputs_dir).exists():
+        for p in iter_json_array('raw_proposals.json', outputs_dir):
+            counts[p['company']] += 1
+    elif (outputs_dir / 'raw_proposals.csv').exists():
+        with open(outputs_dir / 'raw_proposals.csv', encoding='utf-8', newline='') as f:
+            for row in csv.DictReader(f):
+                counts[row['company']] += 1
+    return sorted(counts.values()) or None
+
+
+def fit_distributions(outputs_dir: Path = OUTPUTS_DIR) -> Dict[str, Any]:
+    """
+    Fit corpus statistics from the analysis summaries.
+
+    Returns:
+        Dict with 'fields' (field -> {value: weight}), 'values_per_proposal'
+        (multi-value field -> mean number of values), 'proposals_per_company'
+        and 'company_sizes' (see fit_company_sizes)
+    """
+    with open(outputs_dir / 'analysis_summary.json', encoding='utf-8') as f:
+        analysis = json.load(f)
+
+    total = analysis['total_proposals']
+    fields = {'business_use_case': _fit_field(analysis['business_use_cases'])}
+
+    for filename, schema_values in [('architecture_summary.json', ARCHITECTURE_VALUES),
+                                    ('implementation_summary.json', IMPLEMENTATION_VALUES)]:
+        path = outputs_dir / filename
+        if not path.exists():
+            continue
+        with open(path, encoding='utf-8') as f:
+            summary = json.load(f)
+        for field, counts in summary.items():
+            fields[field] = _fit_field(counts, schema_values.get(field))
+
+    values_per_proposal = {
+        field: max(1.0, sum(fields[field].values()) / total)
+        for field in MULTI_VALUE_FIELDS if field in fields
+    }
+
+    return {
+        'fields': fields,
+        'values_per_proposal': values_per_proposal,
+        'proposals_per_company': total / analysis['num_companies'],
+        'company_sizes': fit_company_sizes(outputs_dir),
+    }
+
+
+# ============================================================================
+# Generation
+# ============================================================================
+
+def _paragraph_pool(rng: random.Random, length: int, size: int) -> List[str]:
+    pool = []
+    for _ in range(size):
+        words = []
+        while sum(len(w) + 1 for w in words) < length:
+            words.append(rng.choice(WORDS))
+        pool.append(' '.join(words))
+    return pool
+
+
+def assign_companies(n: int, company_sizes: List[int], seed: int = 0,
+                     name: str = 'company_{:06d}') -> List[str]:
+    """
+    Company of each of n proposals: one company after another, each with a
+    number of proposals drawn from company_sizes (the last one cut off at n).
+    """
+    rng = random.Random(f'{seed}-companies')  # Leaves the other draws of a seed unchanged
+    companies = []
+    company = 0
+    while len(companies) < n:
+        companies.extend([name.format(company)] * max(1, rng.choice(company_sizes)))
+        company += 1
+    return companies[:n]
+
+
+def synthetic_raw_proposals(n: int, seed: int = 0, pool_size: int = 500,
+                            company_sizes: Optional[List[int]] = None) -> List[Dict[str, Any]]:
+    """
+    Generate n unclassified proposals (company, name and the text fields the prompts read).
+
+    Text fields are drawn from a pool of pre-generated paragraphs so that
+    100k+ proposals stay cheap to hold in memory. Company sizes are drawn
+    from company_sizes (default: fitted from outputs/raw_proposals.*, else
+    5 proposals per company).
+    """
+    rng = random.Random(seed)
+    pools = {field: _paragraph_pool(rng, length, pool_size) for field, length in FIELD_LENGTHS.items()}
+    companies = assign_companies(n, company_sizes or fit_company_sizes() or [5], seed, name='Company {}')
+
+    proposals = []
+    for i in range(n):
+        proposal = {
+            'company': companies[i],
+            'proposal_name': f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} Assistant {i}",
+        }
+        for field, pool in pools.items():
+            proposal[field] = rng.choice(pool)
+        proposals.append(proposal)
+
+    return proposals
+
+
+def generate_corpus(n: int, distributions: Optional[Dict[str, Any]] = None,
+                    seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    Generate n classified proposals with the fitted distributions.
+
+    Args:
+        n: Number of proposals
+        distributions: Output of fit_distributions() (fitted from outputs/ if omitted)
+        seed: Random seed
+
+    Returns:
+        Proposals shaped like proposals_with_implementation.json (without long text fields)
+    """
+    if distributions is None:
+        distributions = fit_distributions()
+    rng = random.Random(seed)
+
+    company_sizes = distributions.get('company_sizes') or [round(distributions['proposals_per_company'])]
+    companies = assign_companies(n, company_sizes, seed)
+
+    columns = {}
+    for field, counts in distributions['fields'].items():
+        values, weights = list(counts), list(counts.values())
+        mean_values = distributions['values_per_proposal'].get(field)
+
+        if mean_values is None:
+            columns[field] = rng.choices(values, weights, k=n)
+            continue
+
+        # Multi-value field: draw 1 or more distinct values per proposal
+        extra = mean_values - 1
+        column = []
+        for _ in range(n):
+            k = 1 + int(extra) + (rng.random() < extra - int(extra))
+            picked = list(dict.fromkeys(rng.choices(values, weights, k=k)))
+            column.append(', '.join(picked))
+        columns[field] = column
+
+    proposals = []
+    for i in range(n):
+        business_use_case = columns['business_use_case'][i]
+        proposal = {
+            'company': companies[i],
+            'proposal_name': f"{business_use_case} Assistant {i}",
+        }
+        for field, column in columns.items():
+            proposal[field] = column[i]
+        proposals.append(proposal)
+
+    return proposals
+
+
+def write_corpus(proposals: List[Dict[str, Any]], path: Path, jsonl: bool = False):
+    """Write a corpus as a JSON array (like the pipeline outputs) or as JSON lines."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        if jsonl:
+            for p in proposals:
+                f.write(json.dumps(p) + '\n')
+        else:
+            json.dump(proposals, f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic classified proposal corpus')
+    parser.add_argument('size', type=int, help='Number of proposals')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--jsonl', action='store_true', help='Write one proposal per line')
+    parser.add_argument('--output', type=Path, help='Output file (default: outputs/synthetic/proposals_<size>.json)')
+    args = parser.parse_args()
+
+    output = args.output or OUTPUTS_DIR / 'synthetic' / f"proposals_{args.size}.{'jsonl' if args.jsonl else 'json'}"
+    proposals = generate_corpus(args.size, seed=args.seed)
+    write_corpus(proposals, output, jsonl=args.jsonl)
+    print(f"✓ Saved {len(proposals)} proposals to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Company similarity index: "companies like X".
+
+Rolls the proposal classifications up to one profile per company: for every
+dimension value (e.g. architecture_pattern=Agentic RAG), the share of the
+company's proposals that have it (values of multi-value fields count
+individually, 'Unknown' is left out). Values most companies share say little about
+similarity, so shares are weighted by inverse document frequency over
+companies, and each profile is scaled to unit length. Cosine similarity is
+then one matrix-vector product over all companies, followed by a partial
+sort for the top k: a few milliseconds for tens of thousands of companies.
+
+analyze.py writes the index to outputs/company_index.npz after the
+classification phases; serve_dashboard.py answers /api/similar-companies
+from it for the dashboard's Similar Companies panel.
+
+Usage:
+    python company_index.py "Acme Corp"          # The 10 most similar companies
+    python company_index.py "Acme Corp" --top 25 --json
+    python company_index.py --build              # Rebuild from the classified proposals in outputs/
+"""
+
+import argparse
+import json
+import os
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Sequence
+import utils
+from records import load_classified_proposals, encode_dimension, split_values, CLASSIFICATION_DIMENSIONS
+
+INDEX_FILE = 'company_index.npz'
+DEFAULT_TOP_K = 10
+EXPLAIN_FEATURES = 3  # Shared values reported per similar company
+
+_lock = threading.Lock()
+_loaded: Dict[Path, Any] = {}  # path -> (mtime, index)
+
+
+# ============================================================================
+# Building
+# ============================================================================
+
+def build_index(proposals: List[Dict[str, Any]],
+                dimensions: Sequence[str] = CLASSIFICATION_DIMENSIONS) -> Dict[str, Any]:
+    """
+    Company profiles of classified proposals.
+
+    Returns:
+        {'companies': names, 'features': 'dimension=value' names,
+         'vectors': unit-length float32 profiles (companies × features),
+         'proposals': proposals per company}
+    """
+    import numpy as np
+    companies, company_codes = encode_dimension(proposals, 'company')
+    per_company = np.bincount(company_codes, minlength=len(companies))
+    blocks, features = [], []
+
+    for field in dimensions:
+        values, rows, value_codes = split_values(field, *encode_dimension(proposals, field),
+                                                 exclude={'Unknown'})
+        if not values:
+            continue
+        counts = np.bincount(company_codes[rows] * len(values) + value_codes,
+                             minlength=len(companies) * len(values))
+        blocks.append(counts.reshape(len(companies), len(values)).astype(np.float32))
+        features.extend(f"{field}={value}" for value in values)
+
+    if blocks:
+        vectors = np.hstack(blocks) / np.maximum(per_company, 1)[:, None].astype(np.float32)
+    else:
+        vectors = np.zeros((len(companies), 0), dtype=np.float32)
+    # Inverse document frequency (smoothed) over companies
+    having = (vectors > 0).sum(axis=0)
+    vectors *= (np.log((1 + len(companies)) / (1 + having)) + 1).astype(np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors /= np.where(norms > 0, norms, 1)
+
+    return {
+        'companies': [str(c) for c in companies],
+        'features': features,
+        'vectors': vectors.astype(np.float32),
+        'proposals': per_company,
+    }
+
+
+def save_index(index: Dict[str, Any], directory: Optional[Path] = None) -> Path:
+    """Write the index to directory/company_index.npz (OUTPUTS_DIR unless a directory is given)."""
+    import numpy as np
+    path = Path(directory or utils.OUTPUTS_DIR) / INDEX_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Written next to the index and moved over it, so the dashboard server
+    # never loads a half-written file
+    temporary = path.with_name(path.name + '.tmp')
+    with open(temporary, 'wb') as f:
+        np.savez(f, companies=np.array(index['companies'], dtype=str),
+                 features=np.array(index['features'], dtype=str),
+                 vectors=index['vectors'], proposals=index['proposals'])
+    os.replace(temporary, path)
+    return path
+
+
+def build_company_index(proposals: List[Dict[str, Any]]):
+    """Pipeline stage: build and save the index of the classified proposals."""
+    print("\nBuilding company similarity index...")
+    index = build_index(proposals)
+    save_index(index)
+    print(f"✓ Indexed {len(index['companies'])} companies over {len(index['features'])} dimension values "
+          f"({INDEX_FILE})")
+
+
+# ============================================================================
+# Queries
+# ============================================================================
+
+def load_index(directory: Optional[Path] = None) -> Dict[str, Any]:
+    """The saved index in directory or OUTPUTS_DIR (cached until the file changes)."""
+    import numpy as np
+    path = Path(directory or utils.OUTPUTS_DIR) / INDEX_FILE
+    mtime = path.stat().st_mtime
+    with _lock:
+        cached = _loaded.get(path)
+        if cached is None or cached[0] != mtime:
+            with np.load(path) as data:
+                companies = data['companies'].tolist()
+                index = {
+                    'companies': companies,
+                    'features': data['features'].tolist(),
+                    'vectors': data['vectors'],
+                    'proposals': data['proposals'],
+                    'positions': {company: i for i, company in enumerate(companies)},
+                }
+            cached = _loaded[path] = (mtime, index)
+        return cached[1]
+
+
+def find_company(index: Dict[str, Any], name: str) -> int:
+    """
+    Position of a company in the index: exact name, else case-insensitive,
+    else the only company whose name contains it.
+
+    Raises:
+        KeyError: No company, or several, match
+    """
+    positions = index.get('positions') or {c: i for i, c in enumerate(index['companies'])}
+    if name in positions:
+        return positions[name]
+    lowered = name.lower()
+    matches = [i for c, i in positions.items() if c.lower() == lowered] or \
+              [i for c, i in positions.items() if lowered in c.lower()]
+    if len(matches) == 1:
+        return matches[0]
+    if not matches:
+        raise KeyError(f"No company matches '{name}'")
+    examples = ', '.join(index['companies'][i] for i in matches[:5])
+    raise KeyError(f"{len(matches)} companies match '{name}' (e.g. {examples})")
+
+
+def similar_companies(index: Dict[str, Any], company: str, k: int = DEFAULT_TOP_K) -> List[Dict[str, Any]]:
+    """
+    The k companies with the most similar profiles.
+
+    Args:
+        index: A built or loaded index
+        company: Company name (see find_company)
+        k: Number of companies to return
+
+    Returns:
+        [{'company', 'similarity', 'proposals', 'shared'}, ...], most similar
+        first; 'shared' lists the dimension values contributing most to the similarity
+    """
+    import numpy as np
+    vectors = index['vectors']
+    position = find_company(index, company)
+    similarity = vectors @ vectors[position]
+    similarity[position] = -np.inf
+    k = min(k, len(similarity) - 1)
+    if k <= 0:
+        return []
+    top = np.argpartition(-similarity, k - 1)[:k]
+    top = top[np.argsort(-similarity[top], kind='stable')]
+
+    results = []
+    for i in top:
+        contributions = vectors[i] * vectors[position]
+        shared = np.argsort(-contributions)[:EXPLAIN_FEATURES]
+        results.append({
+            'company': index['companies'][i],
+            'similarity': round(float(similarity[i]), 4),
+            'proposals': int(index['proposals'][i]),
+            'shared': [index['features'][f] for f in shared if contributions[f] > 0],
+        })
+    return results
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def main():
+    parser = argparse.ArgumentParser(description='Find companies with similar AI system portfolios')
+    parser.add_argument('company', nargs='?', help='Company to find similar companies for')
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP_K,
+                        help=f'Number of similar companies (default: {DEFAULT_TOP_K})')
+    parser.add_argument('--build', action='store_true',
+                        help=f'Rebuild outputs/{INDEX_FILE} from the classified proposals first')
+    parser.add_argument('--json', action='store_true', help='Print the results as JSON')
+    args = parser.parse_args()
+
+    if args.build or not (utils.OUTPUTS_DIR / INDEX_FILE).exists():
+        try:
+            build_company_index(load_classified_proposals(keep_text=False))
+        except FileNotFoundError as e:
+            print(f"✗ {e}")
+            return 1
+    if args.company is None:
+        return 0
+
+    index = load_index()
+    try:
+        results = similar_companies(index, args.company, args.top)
+    except KeyError as e:
+        print(f"✗ {e.args[0]}")
+        return 1
+
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return 0
+    name = index['companies'][find_company(index, args.company)]
+    print(f"\nCompanies most similar to {name}:")
+    print("-" * 80)
+    for r in results:
+        print(f"  {r['similarity']:6.3f}  {r['company'][:40]:40s} {r['proposals']:4d} proposals")
+        if r['shared']:
+            print(f"          shared: {'; '.join(r['shared'])}")
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
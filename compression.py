@@ -0,0 +1,189 @@
+"""
+Token-aware compression of proposal text for prompts.
+
+Templates used to cut every text field at a fixed number of characters
+(`prop.functionality[:800]`), which keeps bullet markers, repeated sentences
+and boilerplate while cutting the salient part mid-sentence. Templates now
+pass each field through the `fit` filter with two limits:
+
+    {{ prop.functionality | fit(800, 150) }}
+
+Without compression it applies the character limit as before. With
+compression on (analyze.py --compress), it fits the text into the token
+budget instead:
+1. control characters and runs of whitespace are normalized, bullet markers dropped
+2. the text is split into sentences (bullet items count as sentences)
+3. sentences repeating an earlier one (same content words, or nearly) are dropped
+4. sentences are picked greedily by value per length: content words not
+   yet covered by picked sentences (weighted by how often the field repeats
+   them), specific terms (acronyms, numbers, product names), and a bonus
+   for the first sentence of a bullet item or of the text, which states its
+   gist. Covering every bullet briefly beats keeping the first ones whole.
+5. budget left over (at least MIN_FILL characters) goes to the first
+   sentence not picked, cut at a word boundary
+6. the picked sentences are joined in their original order
+
+Compression is local and deterministic (no model), so prompts and label
+cache keys are stable across runs. Results are cached per text and budget,
+so resubmitted batches and cascade tiers do not compress again.
+"""
+
+import math
+import re
+import threading
+from collections import Counter
+from functools import lru_cache
+from typing import List, Tuple
+
+CHARS_PER_TOKEN = 4  # Rough average for English prose (as used for cost estimates elsewhere)
+CACHE_SIZE = 4096
+MIN_FILL = 40  # Leftover characters worth filling with part of a sentence
+
+STOPWORDS = frozenset("""
+a an and are as at be been but by can could for from has have in into is it its
+of on or over such that the their them these this those through to via was were
+which while will with within without would across all also any each more most
+other per than then there they using used based both including
+""".split())
+
+_BULLET = re.compile(r'^\s*(?:[•\-*▪◦‣·]|\d+[.)])\s+')
+_SENTENCE_END = re.compile(r'(?<=[.!?])\s+(?=[A-Z0-9"(\[])')
+_CONTROL = re.compile(r'[\x00-\x1f\x7f]')
+_WORD = re.compile(r"[A-Za-z0-9][A-Za-z0-9&/'+-]*")
+
+_enabled = False
+_lock = threading.Lock()
+
+
+def set_enabled(enabled: bool):
+    """Turn compression on or off for every template rendered from now on."""
+    global _enabled
+    with _lock:
+        _enabled = enabled
+    _compress.cache_clear()
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def estimate_tokens(text: str) -> int:
+    """Approximate token count of text."""
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+# ============================================================================
+# Sentences
+# ============================================================================
+
+def normalize(text: str) -> str:
+    """Control characters and runs of whitespace become single spaces."""
+    return ' '.join(_CONTROL.sub(' ', text).split())
+
+
+def split_sentences(text: str) -> List[Tuple[str, bool]]:
+    """
+    Normalized sentences of text, each with whether it starts a line or
+    bullet item (lines always end a sentence).
+    """
+    sentences = []
+    for line in re.split(r'[\n\r]+|(?<=\S)\s*•\s+', text):
+        line = normalize(_BULLET.sub('', line))
+        if line:
+            parts = [part for part in _SENTENCE_END.split(line) if part]
+            sentences.extend((part, i == 0) for i, part in enumerate(parts))
+    return sentences
+
+
+def _content_words(sentence: str) -> List[str]:
+    return [w for w in (m.lower() for m in _WORD.findall(sentence))
+            if len(w) > 2 and w not in STOPWORDS]
+
+
+def _is_specific(word: str) -> bool:
+    """Acronyms, numbers and mixed-case names (RAG, 12, SAP, eCommerce)."""
+    return (word.isupper() and len(word) > 1) or any(c.isdigit() for c in word) or \
+        (not word.islower() and not word.istitle())
+
+
+def dedupe(sentences: List[Tuple[str, bool]], threshold: float = 0.8) -> List[Tuple[str, bool]]:
+    """Drop sentences whose content words mostly repeat an earlier sentence's."""
+    kept, seen = [], []
+    for sentence, head in sentences:
+        words = set(_content_words(sentence))
+        if any(len(words & other) >= threshold * max(len(words), 1) for other in seen):
+            continue
+        kept.append((sentence, head))
+        seen.append(words)
+    return kept
+
+
+def select(sentences: List[Tuple[str, bool]], budget: int) -> List[int]:
+    """Indices of the sentences to keep within budget characters (see module docstring)."""
+    words = [set(_content_words(s)) for s, _ in sentences]
+    frequency = Counter(w for ws in words for w in ws)
+    specific = [{t for t in _WORD.findall(s) if _is_specific(t)} for s, _ in sentences]
+    bonus = [1.5 if head or i == 0 else 0.0 for i, (_, head) in enumerate(sentences)]
+
+    chosen, covered, covered_specific, used = [], set(), set(), 0
+    candidates = set(range(len(sentences)))
+    while candidates:
+        best, best_value = None, 0.0
+        for i in sorted(candidates):
+            cost = len(sentences[i][0]) + (1 if chosen else 0)
+            if used + cost > budget:
+                continue
+            value = (sum(1 + 0.5 * (frequency[w] - 1) for w in words[i] - covered)
+                     + 0.5 * len(specific[i] - covered_specific) + bonus[i])
+            value /= math.sqrt(cost)
+            if value > best_value:
+                best, best_value = i, value
+        if best is None:
+            break
+        candidates.discard(best)
+        chosen.append(best)
+        covered |= words[best]
+        covered_specific |= specific[best]
+        used += len(sentences[best][0]) + (1 if len(chosen) > 1 else 0)
+    return sorted(chosen)
+
+
+# ============================================================================
+# Compression
+# ============================================================================
+
+def compress(text: str, max_tokens: int) -> str:
+    """Text fitted into max_tokens (see module docstring)."""
+    if not text:
+        return ''
+    return _compress(text, max_tokens)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _compress(text: str, max_tokens: int) -> str:
+    sentences = [(s if s[-1] in '.!?:;' else s + '.', head)
+                 for s, head in dedupe(split_sentences(text))]
+    budget = max_tokens * CHARS_PER_TOKEN
+    if sum(len(s) + 1 for s, _ in sentences) <= budget + 1:
+        return ' '.join(s for s, _ in sentences)
+
+    parts = {i: sentences[i][0] for i in select(sentences, budget)}
+    left = budget - sum(len(s) + 1 for s in parts.values()) - 2
+    if left >= MIN_FILL:
+        # Cut the first sentence not picked (every sentence if none fit) at a word boundary
+        i = next(i for i in range(len(sentences)) if i not in parts)
+        parts[i] = sentences[i][0][:left].rsplit(' ', 1)[0] + ' …'
+    return ' '.join(parts[i] for i in sorted(parts))
+
+
+def fit(text, max_chars: int, max_tokens: int) -> str:
+    """
+    Jinja filter: text cut to max_chars, or compressed to max_tokens when
+    compression is on.
+    """
+    if not text:
+        return ''
+    text = str(text)
+    if not _enabled:
+        return text[:max_chars]
+    return compress(text, max_tokens)
@@ -0,0 +1,269 @@
+// Data aggregation for dashboard.html, run in a Web Worker so that changing
+// a dropdown never blocks the page.
+//
+// The worker fetches and holds the proposals. Every dimension a chart uses is
+// dictionary-encoded once into a typed array of value codes (in order of first
+// appearance), chart data is computed from the codes, and results are memoized
+// per (chart, dimension, secondary dimension, top N) until the data changes.
+// The page only sends requests and renders the replies.
+//
+// Messages carry an `id` that is echoed in the reply ({id, result} or {id, error}):
+//   {type: 'load', urls}                                 fetch the first URL that exists -> stats
+//   {type: 'merge', rows}                                merge labels of a running analysis -> stats
+//   {type: 'aggregate', chart, primary, secondary, topN} -> chart data (see CHARTS)
+//   {type: 'counts', dimension}                          -> [[value, count], ...], most frequent first
+//   {type: 'details', index}                             -> the fields of one proposal (scatter hover)
+//
+// Everything is a plain global function, so benchmarks/bench_dashboard.js can
+// run it in Node without a worker.
+
+const MULTI_VALUE_SEPARATOR = ', ';
+const MAX_DENSE_CELLS = 1 << 22;  // Larger 2D tables are counted in a Map
+const JITTER = 0.35;              // Scatter points spread up to ±0.35 around their category
+
+let proposals = [];
+let proposalIndex = new Map();
+let columns = new Map();  // dimension -> {labels, codes}
+let memo = new Map();     // request key -> result
+
+function proposalKey(p) {
+    return `${p.company}: ${p.proposal_name}`;
+}
+
+// ============================================================================
+// Data
+// ============================================================================
+
+function setProposals(rows) {
+    proposals = rows;
+    proposalIndex = new Map(rows.map(p => [proposalKey(p), p]));
+    columns.clear();
+    memo.clear();
+    return stats();
+}
+
+async function loadProposals(urls) {
+    for (const url of urls) {
+        const response = await fetch(url, { cache: 'no-store' });
+        if (response.ok) return setProposals(await response.json());
+    }
+    throw new Error(`Could not load ${urls.join(' or ')}`);
+}
+
+// Labels of a running analysis are merged into the loaded proposals
+function mergeRows(rows) {
+    let added = false;
+    const changed = new Set();
+    rows.forEach(row => {
+        const key = proposalKey(row);
+        const existing = proposalIndex.get(key);
+        if (existing) {
+            Object.assign(existing, row);
+        } else {
+            const proposal = { ...row };
+            proposals.push(proposal);
+            proposalIndex.set(key, proposal);
+            added = true;
+        }
+        Object.keys(row).forEach(field => changed.add(field));
+    });
+    if (added) {
+        columns.clear();
+    } else {
+        changed.forEach(field => columns.delete(field));
+    }
+    memo.clear();
+    return stats();
+}
+
+function stats() {
+    return { total: proposals.length, companies: column('company').labels.length };
+}
+
+// Distinct values of a dimension and the code of every proposal's value
+function column(dimension) {
+    let encoded = columns.get(dimension);
+    if (!encoded) {
+        const labels = [];
+        const lookup = new Map();
+        const codes = new Uint32Array(proposals.length);
+        for (let i = 0; i < proposals.length; i++) {
+            const value = String(proposals[i][dimension] || 'Unknown');
+            let code = lookup.get(value);
+            if (code === undefined) {
+                code = labels.length;
+                lookup.set(value, code);
+                labels.push(value);
+            }
+            codes[i] = code;
+        }
+        encoded = { labels, codes };
+        columns.set(dimension, encoded);
+    }
+    return encoded;
+}
+
+function memoized(key, compute) {
+    const cacheKey = JSON.stringify(key);
+    if (!memo.has(cacheKey)) memo.set(cacheKey, compute());
+    return memo.get(cacheKey);
+}
+
+// ============================================================================
+// Aggregation
+// ============================================================================
+
+// Count of every value, comma-separated values counted individually
+function valueCounts(dimension) {
+    return memoized(['counts', dimension], () => {
+        const { labels, codes } = column(dimension);
+        const perLabel = new Uint32Array(labels.length);
+        for (let i = 0; i < codes.length; i++) perLabel[codes[i]]++;
+
+        const counts = new Map();
+        labels.forEach((label, code) => {
+            label.split(MULTI_VALUE_SEPARATOR).forEach(value => {
+                counts.set(value, (counts.get(value) || 0) + perLabel[code]);
+            });
+        });
+        return [...counts].sort((a, b) => b[1] - a[1]);
+    });
+}
+
+// Proposals per (primary value, secondary value) pair, as [row, column, count] by row then column
+function crossCounts(primary, secondary) {
+    const a = column(primary);
+    const b = column(secondary);
+    const width = b.labels.length;
+    const size = a.labels.length * width;
+    const cells = [];
+
+    if (size <= MAX_DENSE_CELLS) {
+        const table = new Uint32Array(size);
+        for (let i = 0; i < a.codes.length; i++) table[a.codes[i] * width + b.codes[i]]++;
+        for (let cell = 0; cell < size; cell++) {
+            if (table[cell]) cells.push([Math.floor(cell / width), cell % width, table[cell]]);
+        }
+    } else {
+        const table = new Map();
+        for (let i = 0; i < a.codes.length; i++) {
+            const cell = a.codes[i] * width + b.codes[i];
+            table.set(cell, (table.get(cell) || 0) + 1);
+        }
+        [...table.keys()].sort((x, y) => x - y).forEach(cell => {
+            cells.push([Math.floor(cell / width), cell % width, table.get(cell)]);
+        });
+    }
+    return { rows: a.labels, columns: b.labels, cells };
+}
+
+// Value codes plus a fixed pseudo-random offset per proposal, so points of
+// one category spread out instead of overlapping, and stay put on redraws
+function jittered(codes, seed) {
+    const values = new Float32Array(codes.length);
+    for (let i = 0; i < codes.length; i++) {
+        let hash = Math.imul(i + 1, seed) >>> 0;
+        hash = Math.imul(hash ^ (hash >>> 15), 0x2c1b3c6d) >>> 0;
+        values[i] = codes[i] + JITTER * (2 * hash / 4294967296 - 1);
+    }
+    return values;
+}
+
+function proposalDetails(index) {
+    if (index < 0 || index >= proposals.length) throw new Error(`No proposal at index ${index}`);
+    return proposals[index];
+}
+
+function topValues({ primary, topN }) {
+    return valueCounts(primary).slice(0, topN);
+}
+
+const CHARTS = {
+    bar: topValues,
+    pie: topValues,
+    treemap: topValues,
+
+    // {total, groups: [{label, count, children: [[label, count], ...]}, ...]}
+    sunburst({ primary, secondary }) {
+        const { rows, columns: labels, cells } = crossCounts(primary, secondary);
+        const groups = rows.map(label => ({ label, count: 0, children: [] }));
+        cells.forEach(([row, col, count]) => {
+            groups[row].count += count;
+            groups[row].children.push([labels[col], count]);
+        });
+        return { total: proposals.length, groups };
+    },
+
+    // {x, y, z}: sorted secondary and primary values, counts by row
+    heatmap({ primary, secondary }) {
+        const { rows, columns: labels, cells } = crossCounts(primary, secondary);
+        const y = [...rows].sort();
+        const x = [...labels].sort();
+        const rowIndex = new Map(y.map((label, i) => [label, i]));
+        const colIndex = new Map(x.map((label, i) => [label, i]));
+        const rowOf = rows.map(label => rowIndex.get(label));
+        const colOf = labels.map(label => colIndex.get(label));
+        const z = y.map(() => new Array(x.length).fill(0));
+        cells.forEach(([row, col, count]) => { z[rowOf[row]][colOf[col]] = count; });
+        return { x, y, z };
+    },
+
+    // Jittered value codes of every proposal (Float32Arrays, indexed like the
+    // proposals) with their labels; hover details are requested per point
+    scatter({ primary, secondary }) {
+        const a = column(primary);
+        const b = column(secondary);
+        return {
+            x: jittered(a.codes, 0x9e3779b1), xLabels: a.labels,
+            y: jittered(b.codes, 0x85ebca6b), yLabels: b.labels,
+            colors: a.codes,
+        };
+    },
+
+    // {nodes, source, target, value}: primary values, then secondary values not among them
+    sankey({ primary, secondary }) {
+        const { rows, columns: labels, cells } = crossCounts(primary, secondary);
+        const nodes = [...rows];
+        const nodeIndex = new Map(rows.map((label, i) => [label, i]));
+        const targetNode = labels.map(label => {
+            if (!nodeIndex.has(label)) {
+                nodeIndex.set(label, nodes.length);
+                nodes.push(label);
+            }
+            return nodeIndex.get(label);
+        });
+        return {
+            nodes,
+            source: cells.map(([row]) => row),
+            target: cells.map(([, col]) => targetNode[col]),
+            value: cells.map(([, , count]) => count),
+        };
+    },
+};
+
+function aggregate({ chart, primary, secondary = null, topN = null }) {
+    if (!CHARTS[chart]) throw new Error(`Unknown chart type: ${chart}`);
+    return memoized([chart, primary, secondary, topN], () => CHARTS[chart]({ primary, secondary, topN }));
+}
+
+// ============================================================================
+// Messages
+// ============================================================================
+
+const HANDLERS = {
+    load: message => loadProposals(message.urls),
+    merge: message => mergeRows(message.rows),
+    aggregate: message => aggregate(message),
+    counts: message => valueCounts(message.dimension),
+    details: message => proposalDetails(message.index),
+};
+
+if (typeof importScripts === 'function') {
+    self.onmessage = async ({ data }) => {
+        try {
+            self.postMessage({ id: data.id, result: await HANDLERS[data.type](data) });
+        } catch (error) {
+            self.postMessage({ id: data.id, error: error.message });
+        }
+    };
+}
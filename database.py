@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Embedded SQLite database of the classified proposals.
+
+analyze.py materializes outputs/proposals.db in phase 5, so ad-hoc questions
+no longer mean parsing the CSV or JSON outputs into pandas:
+- `proposals`: one row per proposal (id, company, name, text fields,
+  every label, dedup and propagation bookkeeping)
+- `proposal_<field>` bridge tables (proposal_id, value) for the
+  multi-value fields (schemas.MULTI_VALUE_FIELDS), one row per value
+- indexes on company and on every classification dimension, and on both
+  columns of each bridge table
+
+The file is written to a temporary name and renamed, so readers (the
+summary phase, serve_dashboard.py) never see a half-written database.
+Queries go through read-only connections: query() only authorizes reads.
+
+Usage:
+    python database.py --group-by architecture_pattern human_oversight
+    python database.py "SELECT company, COUNT(*) FROM proposals GROUP BY company ORDER BY 2 DESC LIMIT 5"
+    python database.py --build       # Rebuild from the classified proposals in outputs/
+"""
+
+import argparse
+import json
+import os
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Sequence, Tuple
+import utils
+from records import load_classified_proposals, TEXT_FIELDS, CLASSIFICATION_DIMENSIONS
+from schemas import MULTI_VALUE_FIELDS
+
+DATABASE_FILE = 'proposals.db'
+
+# Indexed label columns: the classification dimensions and iteration shapes
+DIMENSIONS = [*CLASSIFICATION_DIMENSIONS, 'iteration_shape']
+
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+# Statements query() lets through (reads, functions and WITH RECURSIVE)
+_READ_ACTIONS = {sqlite3.SQLITE_SELECT, sqlite3.SQLITE_READ, sqlite3.SQLITE_FUNCTION,
+                 getattr(sqlite3, 'SQLITE_RECURSIVE', 33)}
+
+# Limits of the statements serve_dashboard.py runs for /api/sql
+SERVER_QUERY_TIMEOUT = 10.0   # seconds
+SERVER_QUERY_ROWS = 10000
+
+# SQLite virtual machine instructions between two deadline checks
+_PROGRESS_INTERVAL = 10000
+
+
+def database_path(directory: Optional[Path] = None) -> Path:
+    return Path(directory or utils.OUTPUTS_DIR) / DATABASE_FILE
+
+
+def bridge_table(field: str) -> str:
+    return f'proposal_{field}'
+
+
+def _values(value: Any) -> List[str]:
+    """Values of a multi-value field (comma-separated, as in count_values)."""
+    if isinstance(value, list):
+        return [str(v) for v in value]
+    return str(value).split(', ')
+
+
+def _cell(value: Any) -> Any:
+    """A field value as SQLite stores it (lists and dicts as JSON)."""
+    if value is None or isinstance(value, (str, int, float)):
+        return value
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+# ============================================================================
+# Export
+# ============================================================================
+
+def export_database(proposals: List[Dict[str, Any]], directory: Optional[Path] = None) -> Path:
+    """
+    Write the proposals to directory/proposals.db (OUTPUTS_DIR unless a
+    directory is given; see module docstring).
+
+    Rows are streamed into executemany from generators, so no more than one
+    proposal's text is held in memory at a time.
+
+    Returns:
+        Path of the database
+    """
+    columns = ['company', 'proposal_name', *TEXT_FIELDS, *DIMENSIONS]
+    seen = set(columns)
+    for p in proposals:
+        for field in p:
+            if field not in seen and _IDENTIFIER.match(field):
+                seen.add(field)
+                columns.append(field)
+    text_columns = {'company', 'proposal_name', *TEXT_FIELDS, *DIMENSIONS}
+    bridges = [field for field in MULTI_VALUE_FIELDS if field in seen]
+
+    path = database_path(directory)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary = path.with_name(path.name + '.tmp')
+    if temporary.exists():
+        temporary.unlink()
+
+    connection = sqlite3.connect(temporary)
+    try:
+        connection.execute('PRAGMA journal_mode = OFF')
+        connection.execute('PRAGMA synchronous = OFF')
+        definitions = ', '.join(f'"{c}" TEXT' if c in text_columns else f'"{c}"' for c in columns)
+        connection.execute(f'CREATE TABLE proposals (id INTEGER PRIMARY KEY, {definitions})')
+        for field in bridges:
+            connection.execute(f'CREATE TABLE {bridge_table(field)} ('
+                               f'proposal_id INTEGER NOT NULL REFERENCES proposals(id), value TEXT NOT NULL)')
+
+        insert = (f'INSERT INTO proposals (id, {", ".join(chr(34) + c + chr(34) for c in columns)}) '
+                  f'VALUES ({", ".join("?" * (len(columns) + 1))})')
+        connection.executemany(insert, ((i, *(_cell(p.get(c)) for c in columns))
+                                        for i, p in enumerate(proposals, start=1)))
+        for field in bridges:
+            connection.executemany(f'INSERT INTO {bridge_table(field)} VALUES (?, ?)',
+                                   ((i, v) for i, p in enumerate(proposals, start=1)
+                                    for v in _values(p.get(field, 'Unknown'))))
+
+        # Indexes are built after the inserts (faster than maintaining them row by row)
+        for column in ['company', *DIMENSIONS, 'duplicate_of']:
+            if column in seen:
+                connection.execute(f'CREATE INDEX idx_proposals_{column} ON proposals ("{column}")')
+        for field in bridges:
+            table = bridge_table(field)
+            connection.execute(f'CREATE INDEX idx_{table}_value ON {table} (value, proposal_id)')
+            connection.execute(f'CREATE INDEX idx_{table}_proposal ON {table} (proposal_id)')
+        connection.execute('ANALYZE')
+        connection.commit()
+    finally:
+        connection.close()
+    os.replace(temporary, path)
+    return path
+
+
+def phase5_export_database(proposals: List[Dict[str, Any]]):
+    """Pipeline stage: materialize outputs/proposals.db."""
+    print("\nExporting proposals database...")
+    path = export_database(proposals)
+    print(f"✓ Saved {path.name} ({len(proposals)} proposals, {path.stat().st_size / 1e6:.1f} MB)")
+
+
+# ============================================================================
+# Queries
+# ============================================================================
+
+def connect(directory: Optional[Path] = None) -> sqlite3.Connection:
+    """
+    Read-only connection to the database (in OUTPUTS_DIR unless a directory is given).
+
+    Raises:
+        FileNotFoundError: No database has been exported yet
+    """
+    path = database_path(directory)
+    if not path.exists():
+        raise FileNotFoundError(f"No {DATABASE_FILE} in {path.parent}: run analyze.py or "
+                                f"'python database.py --build'")
+    return sqlite3.connect(f'{path.resolve().as_uri()}?mode=ro', uri=True, check_same_thread=False)
+
+
+def _authorize_reads(action, *_):
+    return sqlite3.SQLITE_OK if action in _READ_ACTIONS else sqlite3.SQLITE_DENY
+
+
+def query(connection: sqlite3.Connection, sql: str, params: Sequence[Any] = (),
+          limit: Optional[int] = None,
+          timeout: Optional[float] = None) -> Tuple[List[str], List[Tuple[Any, ...]], bool]:
+    """
+    Run a read-only SQL statement (anything but reads is denied).
+
+    Args:
+        connection: A connection from connect()
+        sql: The statement
+        params: Its parameters
+        limit: Return at most this many rows
+        timeout: Interrupt the statement after this many seconds
+
+    Returns:
+        (column names, rows, whether rows were cut off at limit)
+
+    Raises:
+        sqlite3.OperationalError: The statement ran longer than timeout
+    """
+    connection.set_authorizer(_authorize_reads)
+    if timeout is not None:
+        deadline = time.monotonic() + timeout
+        connection.set_progress_handler(lambda: time.monotonic() > deadline, _PROGRESS_INTERVAL)
+    try:
+        cursor = connection.execute(sql, params)
+        columns = [d[0] for d in cursor.description or []]
+        if limit is None:
+            return columns, cursor.fetchall(), False
+        rows = cursor.fetchmany(limit + 1)
+        return columns, rows[:limit], len(rows) > limit
+    except sqlite3.OperationalError as e:
+        if timeout is not None and 'interrupted' in str(e):
+            raise sqlite3.OperationalError(f"Query took longer than {timeout:g} seconds") from e
+        raise
+    finally:
+        connection.set_authorizer(None)
+        connection.set_progress_handler(None, 0)
+
+
+def group_counts(connection: sqlite3.Connection, dimensions: Sequence[str],
+                 unique: bool = False, where: Optional[Dict[str, str]] = None) -> List[Tuple[Any, ...]]:
+    """
+    Proposals per combination of dimension values (multi-value fields
+    counted per value through their bridge table, like count_values).
+
+    Args:
+        connection: A connection from connect()
+        dimensions: Columns of the proposals table to group by
+        unique: Count only canonical proposals (near-duplicates collapsed)
+        where: Only proposals with these column values, e.g. {'company': 'nvidia'}
+
+    Returns:
+        (value, ..., count) rows, in order of first appearance
+
+    Raises:
+        ValueError: Unknown column
+    """
+    known = {row[1] for row in connection.execute('PRAGMA table_info(proposals)')}
+    for column in [*dimensions, *(where or {})]:
+        if column not in known:
+            raise ValueError(f"Unknown column: {column}")
+
+    # Multi-value dimensions alone are counted from their bridge tables
+    # without touching the proposals table
+    needs_proposals = unique or where or any(d not in MULTI_VALUE_FIELDS for d in dimensions)
+    proposal_id = 'p.id' if needs_proposals else 'b0.proposal_id'
+    sources = ['proposals p'] if needs_proposals else []
+    selects, conditions, params = [], [], []
+    for i, dimension in enumerate(dimensions):
+        if dimension in MULTI_VALUE_FIELDS:
+            table = bridge_table(dimension)
+            sources.append(f'JOIN {table} b{i} ON b{i}.proposal_id = {proposal_id}' if sources else f'{table} b{i}')
+            selects.append(f'b{i}.value')
+        else:
+            selects.append(f'p."{dimension}"')
+    if unique and 'duplicate_of' in known:
+        conditions.append("(p.duplicate_of IS NULL OR p.duplicate_of = '')")
+    for column, value in (where or {}).items():
+        conditions.append(f'p."{column}" = ?')
+        params.append(value)
+
+    # Grouping by the bare columns lets SQLite scan their covering indexes;
+    # missing values (NULL) are merged into 'Unknown' afterwards
+    sql = (f'SELECT {", ".join(selects)}, COUNT(*), MIN({proposal_id}) FROM {" ".join(sources)} '
+           f'{"WHERE " + " AND ".join(conditions) if conditions else ""} '
+           f'GROUP BY {", ".join(str(i + 1) for i in range(len(selects)))}')
+    groups = {}
+    for *values, count, first in connection.execute(sql, params):
+        key = tuple('Unknown' if v is None else v for v in values)
+        previous_count, previous_first = groups.get(key, (0, first))
+        groups[key] = (previous_count + count, min(previous_first, first))
+    return [(*key, count) for key, (count, _) in sorted(groups.items(), key=lambda item: item[1][1])]
+
+
+def value_counts(connection: sqlite3.Connection, dimension: str, unique: bool = False) -> Dict[str, int]:
+    """{value: proposals} of one dimension (see group_counts)."""
+    return {value: count for value, count in group_counts(connection, [dimension], unique=unique)}
+
+
+# ============================================================================
+# Main
+# ============================================================================
+
+def print_rows(columns: List[str], rows: List[Tuple[Any, ...]]):
+    widths = [min(max([len(str(c))] + [len(str(r[i])) for r in rows]), 50) for i, c in enumerate(columns)]
+    print('  '.join(str(c)[:50].ljust(w) for c, w in zip(columns, widths)))
+    print('  '.join('-' * w for w in widths))
+    for row in rows:
+        print('  '.join(str(v)[:50].ljust(w) for v, w in zip(row, widths)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Query the proposals database (outputs/proposals.db)')
+    parser.add_argument('sql', nargs='?', help='Read-only SQL statement to run')
+    parser.add_argument('--group-by', nargs='+', metavar='DIMENSION',
+                        help='Count proposals per combination of these dimensions')
+    parser.add_argument('--unique', action='store_true', help='With --group-by, count only canonical proposals')
+    parser.add_argument('--build', action='store_true',
+                        help=f'Rebuild outputs/{DATABASE_FILE} from the classified proposals first')
+    args = parser.parse_args()
+
+    if args.build or not database_path().exists():
+        try:
+            phase5_export_database(load_classified_proposals())
+        except FileNotFoundError as e:
+            print(f"✗ {e}")
+            return 1
+
+    connection = connect()
+    try:
+        if args.group_by:
+            rows = group_counts(connection, args.group_by, unique=args.unique)
+            print_rows([*args.group_by, 'proposals'], sorted(rows, key=lambda r: -r[-1]))
+        if args.sql:
+            columns, rows, _ = query(connection, args.sql)
+            print_rows(columns, rows)
+    except (ValueError, sqlite3.Error) as e:
+        print(f"✗ {e}")
+        return 1
+    finally:
+        connection.close()
+    return 0
+
+
+if __name__ == '__main__':
+    exit(main())
@@ -0,0 +1,191 @@
+"""
+Near-duplicate proposal detection with MinHash and locality-sensitive hashing.
+
+Proposals are reduced to MinHash signatures over word shingles, bucketed with
+LSH banding so only likely duplicates are compared, and grouped into clusters
+with union-find. Runtime grows roughly linearly with the number of proposals.
+"""
+
+import itertools
+import re
+import random
+import zlib
+from collections import defaultdict
+from typing import List, Dict, Any, Tuple
+from utils import proposal_key
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+MERSENNE_PRIME = (1 << 31) - 1
+
+# Fields compared when looking for duplicates
+DEDUP_FIELDS = ['proposal_name', 'current_state', 'problems', 'functionality', 'problem_solving']
+
+DEFAULT_THRESHOLD = 0.85
+DEFAULT_NUM_PERM = 64
+SHINGLE_SIZE = 3
+
+# LSH buckets up to this size are compared pairwise; larger ones (e.g. many
+# near-empty proposals) only against their first member
+MAX_PAIRWISE_BUCKET = 500
+
+
+# ============================================================================
+# MinHash
+# ============================================================================
+
+def shingle_hashes(text: str, size: int = SHINGLE_SIZE) -> List[int]:
+    """Return the 31-bit hashes of all word shingles in a text."""
+    tokens = TOKEN_RE.findall(text.lower())
+    if len(tokens) < size:
+        shingles = {' '.join(tokens)}
+    else:
+        shingles = {' '.join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+    return [zlib.crc32(s.encode('utf-8')) & MERSENNE_PRIME for s in shingles]
+
+
+class MinHasher:
+    """Computes MinHash signatures with `num_perm` universal hash functions."""
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.a = [rng.randrange(1, MERSENNE_PRIME) for _ in range(num_perm)]
+        self.b = [rng.randrange(0, MERSENNE_PRIME) for _ in range(num_perm)]
+        try:
+            import numpy as np
+        except ImportError:
+            np = None  # Fall back to the pure-Python MinHash
+        self._np = np
+        if np is not None:
+            self._a = np.array(self.a, dtype=np.uint64)[:, None]
+            self._b = np.array(self.b, dtype=np.uint64)[:, None]
+
+    def signature(self, hashes: List[int]) -> Tuple[int, ...]:
+        """MinHash signature of a set of shingle hashes."""
+        if not hashes:
+            return tuple([MERSENNE_PRIME] * self.num_perm)
+        if self._np is not None:
+            h = self._np.array(hashes, dtype=self._np.uint64)[None, :]
+            return tuple(((self._a * h + self._b) % MERSENNE_PRIME).min(axis=1).tolist())
+        return tuple(
+            min((a * h + b) % MERSENNE_PRIME for h in hashes)
+            for a, b in zip(self.a, self.b)
+        )
+
+
+def choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    Pick (bands, rows) with bands * rows == num_perm whose LSH threshold
+    (1/bands)^(1/rows) is closest to, but not above, the target threshold.
+    """
+    best = (num_perm, 1)
+    best_gap = float('inf')
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        lsh_threshold = (1 / bands) ** (1 / rows)
+        gap = threshold - lsh_threshold
+        if 0 <= gap < best_gap:
+            best, best_gap = (bands, rows), gap
+    return best
+
+
+# ============================================================================
+# Clustering
+# ============================================================================
+
+def find_duplicate_clusters(proposals: List[Dict[str, Any]],
+                            threshold: float = DEFAULT_THRESHOLD,
+                            num_perm: int = DEFAULT_NUM_PERM) -> List[List[int]]:
+    """
+    Group near-duplicate proposals.
+
+    Args:
+        proposals: Proposals to compare
+        threshold: Minimum estimated Jaccard similarity of shingle sets
+        num_perm: Number of MinHash permutations
+
+    Returns:
+        Clusters of proposal positions (only clusters with 2+ members),
+        each sorted so the first position is the canonical representative
+    """
+    hasher = MinHasher(num_perm)
+    signatures = [
+        hasher.signature(shingle_hashes(' '.join(str(p.get(f, '') or '') for f in DEDUP_FIELDS)))
+        for p in proposals
+    ]
+
+    bands, rows = choose_bands(num_perm, threshold)
+    parent = list(range(len(proposals)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for band in range(bands):
+        buckets = defaultdict(list)
+        start = band * rows
+        for i, sig in enumerate(signatures):
+            buckets[sig[start:start + rows]].append(i)
+
+        for members in buckets.values():
+            if len(members) <= MAX_PAIRWISE_BUCKET:
+                pairs = itertools.combinations(members, 2)
+            else:
+                pairs = ((members[0], other) for other in members[1:])
+            for a, b in pairs:
+                root_a, root_b = find(a), find(b)
+                if root_a == root_b:
+                    continue
+                agreement = sum(x == y for x, y in zip(signatures[a], signatures[b])) / num_perm
+                if agreement >= threshold:
+                    parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    clusters = defaultdict(list)
+    for i in range(len(proposals)):
+        clusters[find(i)].append(i)
+
+    return sorted((sorted(c) for c in clusters.values() if len(c) > 1), key=lambda c: c[0])
+
+
+def mark_duplicates(proposals: List[Dict[str, Any]],
+                    threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Annotate proposals with their canonical representative.
+
+    Sets `duplicate_of` to the canonical proposal's key ('' for canonical
+    proposals) and `duplicate_count` to the size of the proposal's cluster.
+
+    Returns:
+        Cluster records with the canonical key and member keys
+    """
+    clusters = find_duplicate_clusters(proposals, threshold)
+
+    for p in proposals:
+        p['duplicate_of'] = ''
+        p['duplicate_count'] = 1
+
+    records = []
+    for cluster in clusters:
+        canonical = proposals[cluster[0]]
+        canonical_key = proposal_key(canonical)
+        for pos in cluster:
+            proposals[pos]['duplicate_count'] = len(cluster)
+        for pos in cluster[1:]:
+            proposals[pos]['duplicate_of'] = canonical_key
+
+        records.append({
+            'canonical': canonical_key,
+            'size': len(cluster),
+            'members': [proposal_key(proposals[pos]) for pos in cluster],
+        })
+
+    return records
+
+
+def unique_proposals(proposals: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Return only canonical proposals (those that are not a duplicate of another)."""
+    return [p for p in proposals if not p.get('duplicate_of')]
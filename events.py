@@ -0,0 +1,132 @@
+"""
+Live pipeline events for the dashboard.
+
+While analyze.py runs, every completed classification batch is appended as
+one JSON line to outputs/pipeline_events.jsonl, together with the labels it
+produced and the progress of its phase (proposals done, throughput, ETA,
+errors). serve_dashboard.py tails the file and streams new lines to open
+dashboards as Server-Sent Events (/events), which merge the labels into
+their data and redraw without reloading.
+
+An appended file rather than a socket keeps the pipeline independent of the
+server: nothing blocks when no dashboard is open, and a dashboard opened
+mid-run replays the run so far. Events are only recorded after start_run().
+"""
+
+import json
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Sequence
+
+_lock = threading.Lock()
+_path: Optional[Path] = None
+_run_id: Optional[str] = None
+_phases: Dict[str, Dict[str, Any]] = {}
+
+
+# ============================================================================
+# Recording
+# ============================================================================
+
+def start_run(path: Optional[Path] = None) -> str:
+    """Start a new run, replacing the events of the previous one in path (JSONL)."""
+    global _path, _run_id
+    with _lock:
+        _path = Path(path) if path is not None else None
+        _run_id = uuid.uuid4().hex[:12]
+        _phases.clear()
+        if _path is not None:
+            _path.parent.mkdir(parents=True, exist_ok=True)
+            # A new file (not a truncated one) tells readers a new run started
+            _path.unlink(missing_ok=True)
+    emit('run_start')
+    return _run_id
+
+
+def end_run(**fields):
+    """Record the end of the run and stop recording."""
+    global _path
+    emit('run_end', **fields)
+    with _lock:
+        _path = None
+
+
+def emit(event: str, **fields):
+    """Append one event (no-op unless a run was started with a path)."""
+    if _path is None:
+        return
+    line = json.dumps({'event': event, 'run_id': _run_id, 'timestamp': time.time(), **fields},
+                      default=str)
+    with _lock:
+        if _path is not None:
+            with open(_path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+
+
+def label_rows(proposals: Sequence[Dict[str, Any]], fields: Sequence[str]) -> List[Dict[str, Any]]:
+    """Identity and label fields of proposals, as sent to the dashboard."""
+    return [{'company': p.get('company'), 'proposal_name': p.get('proposal_name'),
+             **{f: p[f] for f in fields if f in p}} for p in proposals]
+
+
+# ============================================================================
+# Phase Progress
+# ============================================================================
+
+def phase_start(phase: str, total: int, batches: int):
+    """Start tracking a classification phase of `total` proposals."""
+    if _path is None:
+        return
+    with _lock:
+        _phases[phase] = {'total': total, 'done': 0, 'batches': 0, 'errors': 0,
+                          'started': time.perf_counter()}
+    emit('phase_start', phase=phase, total=total, batches=batches)
+
+
+def progress(phase: str) -> Dict[str, Any]:
+    """Proposals done, throughput (proposals/s) and ETA (s) of a phase."""
+    state = _phases.get(phase)
+    if state is None:
+        return {}
+    elapsed = time.perf_counter() - state['started']
+    rate = state['done'] / elapsed if elapsed > 0 else 0.0
+    remaining = state['total'] - state['done']
+    return {
+        'done': state['done'],
+        'total': state['total'],
+        'batches_done': state['batches'],
+        'errors': state['errors'],
+        'elapsed': round(elapsed, 2),
+        'throughput': round(rate, 3),
+        'eta': round(remaining / rate, 1) if rate > 0 else None,
+    }
+
+
+def batch_done(phase: str, batch: int, done: int, error: Optional[str] = None,
+               labels: Optional[List[Dict[str, Any]]] = None):
+    """
+    Record a completed batch.
+
+    Args:
+        phase: Phase (telemetry phase name, e.g. 'architecture_escalated')
+        batch: Batch number
+        done: Proposals the batch finished (labeled or given default labels)
+        error: Error message if the call failed or its response did not parse
+        labels: Labels produced by the batch (see label_rows)
+    """
+    if _path is None:
+        return
+    with _lock:
+        state = _phases.get(phase)
+        if state is not None:
+            state['done'] += done
+            state['batches'] += 1
+            state['errors'] += error is not None
+    emit('batch', phase=phase, batch=batch, error=error, labels=labels or [], **progress(phase))
+
+
+def phase_end(phase: str, labels: Optional[List[Dict[str, Any]]] = None):
+    """Record the end of a phase, with labels set outside batches (duplicates, propagation)."""
+    emit('phase_end', phase=phase, labels=labels or [], **progress(phase))
@@ -0,0 +1,138 @@
+"""
+Per-proposal classification cache.
+
+Labels are stored per phase in outputs/label_cache/<phase>.jsonl, keyed by a
+hash of everything that determines them:
+- the prompt template's source and variables (e.g. the pinned taxonomy, see
+  taxonomy.py), and whether text compression is on (compression.py)
+- the models and the LLM backend
+- the proposal's input fields (everything except this phase's own labels,
+  the dedup/propagation bookkeeping and fields the template does not read,
+  such as the text fields for iteration shapes)
+
+A rerun therefore reuses the labels of every proposal whose input did not
+change without an LLM call, while editing a template, switching taxonomy
+versions or changing an upstream label misses the cache. The cache is only
+used after start(); analyze.py --no-cache leaves it off.
+
+Labels stay on disk: while a phase classifies, memory holds only an index
+from each key's digest to the position of its line in the file, and
+release() drops the index when the phase is done.
+"""
+
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterable, Tuple
+import compression
+from utils import PROMPTS_DIR
+
+# Fields that never affect a phase's labels
+BOOKKEEPING_FIELDS = ('duplicate_of', 'duplicate_count')
+
+_lock = threading.Lock()
+_directory: Optional[Path] = None
+_index: Dict[str, Dict[bytes, Tuple[int, int]]] = {}  # phase -> {key digest: (offset, length) of its line}
+_readers: Dict[str, Any] = {}                          # phase -> open cache file
+
+
+def start(directory: Path):
+    """Use the cache in directory for the rest of the run."""
+    global _directory
+    with _lock:
+        _directory = Path(directory)
+        _index.clear()
+        for reader in _readers.values():
+            reader.close()
+        _readers.clear()
+
+
+def release(phase: str):
+    """Drop the index of a phase whose classification has finished (rebuilt on next use)."""
+    with _lock:
+        _index.pop(phase, None)
+        reader = _readers.pop(phase, None)
+    if reader is not None:
+        reader.close()
+
+
+def enabled() -> bool:
+    return _directory is not None
+
+
+def _digest(*parts: Any) -> str:
+    canonical = json.dumps(parts, sort_keys=True, ensure_ascii=False, default=str, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+
+def phase_key(template_name: str, template_kwargs: Dict[str, Any], models: List[str], backend: str) -> str:
+    """Hash of everything a phase's labels depend on besides the proposal itself."""
+    source = (PROMPTS_DIR / template_name).read_text(encoding='utf-8')
+    variables = {k: v for k, v in template_kwargs.items() if not callable(v)}
+    return _digest(template_name, source, variables, list(models), backend, compression.is_enabled())
+
+
+def proposal_key(phase_hash: str, proposal: Dict[str, Any], exclude: Iterable[str]) -> str:
+    """Cache key of one proposal: its input fields under a phase_key."""
+    exclude = set(exclude) | set(BOOKKEEPING_FIELDS)
+    inputs = {k: v for k, v in proposal.items()
+              if k not in exclude and not k.endswith('_propagated_from')}
+    return _digest(phase_hash, inputs)
+
+
+def _load(phase: str) -> Dict[bytes, Tuple[int, int]]:
+    """Index of a phase (built from disk on first use; caller holds _lock)."""
+    if phase not in _index:
+        index = {}
+        path = _directory / f'{phase}.jsonl'
+        if path.exists():
+            offset = 0
+            with open(path, 'rb') as f:
+                for line in f:
+                    try:
+                        index[bytes.fromhex(json.loads(line)['key'])] = (offset, len(line))
+                    except (ValueError, KeyError):
+                        pass  # Partial line from an interrupted run
+                    offset += len(line)
+        _index[phase] = index
+    return _index[phase]
+
+
+def _read(phase: str, position: Tuple[int, int]) -> Dict[str, Any]:
+    """Labels of the line at position (caller holds _lock)."""
+    if phase not in _readers:
+        _readers[phase] = open(_directory / f'{phase}.jsonl', 'rb')
+    reader = _readers[phase]
+    reader.seek(position[0])
+    return json.loads(reader.read(position[1]))['labels']
+
+
+def lookup(phase: str, key: str) -> Optional[Dict[str, Any]]:
+    """Cached labels of a proposal, or None."""
+    if _directory is None:
+        return None
+    with _lock:
+        position = _load(phase).get(bytes.fromhex(key))
+        return None if position is None else _read(phase, position)
+
+
+def store(phase: str, items: List[Tuple[str, Dict[str, Any]]]):
+    """Add (key, labels) pairs, appending them to the phase's cache file."""
+    if _directory is None or not items:
+        return
+    with _lock:
+        index = _load(phase)
+        _directory.mkdir(parents=True, exist_ok=True)
+        with open(_directory / f'{phase}.jsonl', 'ab') as f:
+            offset = f.tell()
+            for key, labels in items:
+                digest = bytes.fromhex(key)
+                if digest in index:
+                    f.flush()  # The line may have been written by this call
+                    if _read(phase, index[digest]) == labels:
+                        continue
+                line = (json.dumps({'key': key, 'labels': labels}, default=str) + '\n').encode('utf-8')
+                f.write(line)
+                index[digest] = (offset, len(line))
+                offset += len(line)
@@ -0,0 +1,251 @@
+"""
+Pluggable LLM backends behind `call_llm`.
+
+A backend exposes `stream(**request)`, taking the same request as the
+Anthropic Messages API and returning a context manager that yields stream
+events (`type == 'text'` with `.text`, or `type == 'input_json'` with
+`.partial_json`) and provides `get_final_message()`.
+
+- AnthropicBackend: the real API (default)
+- StubBackend: an in-process fake that answers every prompt template with
+  schema-valid output, with configurable latency, error and rate-limit rates
+  and truncation. Used for offline runs and benchmarks (see benchmarks/).
+"""
+
+import json
+import math
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+from typing import List, Dict, Any, Optional
+from schemas import classification_tool
+
+
+class BackendError(Exception):
+    """API error raised by a non-Anthropic backend, with an HTTP-like status code."""
+
+    def __init__(self, message: str, status_code: int, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+# ============================================================================
+# Anthropic
+# ============================================================================
+
+class AnthropicBackend:
+    """The Anthropic Messages API (streaming)."""
+
+    name = 'anthropic'
+
+    def __init__(self, api_key: Optional[str] = None):
+        import anthropic  # Deferred: the SDK takes over a second to import
+        self.client = anthropic.Anthropic(api_key=api_key)
+
+    def stream(self, **request):
+        return self.client.messages.stream(**request)
+
+
+# ============================================================================
+# Stub
+# ============================================================================
+
+STUB_BUSINESS_TYPES = [
+    'Customer Service Agents', 'Claims Processing', 'Invoice Reconciliation', 'Document Generation',
+    'Knowledge Q&A', 'Fraud/Risk Detection', 'Data Extraction', 'Recommendations',
+    'Forecasting/Analytics', 'Contract Analysis', 'Medical Decision Support', 'Compliance Automation',
+    'Quality Control', 'Content Moderation', 'Scheduling Optimization',
+]
+
+STUB_ITERATION_SHAPES = [
+    'Fast-Iterating Single-Shot Systems', 'Human-Gated Workflow Systems', 'Regulated Decision Systems',
+    'Multi-System Integration Agents', 'Knowledge-Heavy Retrieval Systems', 'Real-Time Monitoring Systems',
+    'Delayed-Feedback Forecasting Systems', 'Expert-Evaluated Generation Systems',
+]
+
+
+class _StubStream:
+    """Replays a canned response as stream events."""
+
+    def __init__(self, text: str, tool: bool, stop_reason: str, usage: SimpleNamespace,
+                 first_token_delay: float, remaining_delay: float, chunk_size: int):
+        self.text = text
+        self.tool = tool
+        self.stop_reason = stop_reason
+        self.usage = usage
+        self.first_token_delay = first_token_delay
+        self.remaining_delay = remaining_delay
+        self.chunk_size = chunk_size
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def __iter__(self):
+        time.sleep(self.first_token_delay)
+        for i in range(0, len(self.text), self.chunk_size):
+            chunk = self.text[i:i + self.chunk_size]
+            if self.tool:
+                yield SimpleNamespace(type='input_json', partial_json=chunk)
+            else:
+                yield SimpleNamespace(type='text', text=chunk)
+        time.sleep(self.remaining_delay)
+
+    def get_final_message(self):
+        if self.tool:
+            try:
+                tool_input = json.loads(self.text)
+            except ValueError:
+                tool_input = {}
+            content = [SimpleNamespace(type='tool_use', input=tool_input)]
+        else:
+            content = [SimpleNamespace(type='text', text=self.text)]
+        return SimpleNamespace(content=content, stop_reason=self.stop_reason, usage=self.usage)
+
+
+class StubBackend:
+    """
+    In-process fake of the Messages API.
+
+    Recognizes every prompt template in prompts/ and answers with output
+    matching its schema (random but valid values), so the whole pipeline runs
+    without an API key.
+
+    Args:
+        latency_median: Median call latency in seconds
+        latency_sigma: Spread of the log-normal latency distribution (0 = fixed)
+        error_rate: Share of calls failing with a 500 error
+        rate_limit_rate: Share of calls failing with a 429 error
+        truncation_rate: Share of responses cut off with stop_reason 'max_tokens'
+        retry_after: Retry-after hint (seconds) attached to 429 errors
+        seed: Random seed
+    """
+
+    name = 'stub'
+
+    def __init__(self, latency_median: float = 0.0, latency_sigma: float = 0.5,
+                 error_rate: float = 0.0, rate_limit_rate: float = 0.0,
+                 truncation_rate: float = 0.0, retry_after: Optional[float] = None,
+                 chunk_size: int = 32, seed: int = 0):
+        self.latency_median = latency_median
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.truncation_rate = truncation_rate
+        self.retry_after = retry_after
+        self.chunk_size = chunk_size
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def stream(self, **request):
+        prompt = request['messages'][0]['content']
+        tools = request.get('tools')
+
+        with self._lock:
+            roll = self._rng.random()
+            latency = self.latency_median * math.exp(self.latency_sigma * self._rng.gauss(0, 1))
+            truncate = self._rng.random() < self.truncation_rate
+            cut = self._rng.uniform(0.3, 0.9)
+            seed = self._rng.random()
+
+        if roll < self.rate_limit_rate:
+            time.sleep(latency * 0.1)
+            raise BackendError("stub rate limit", status_code=429, retry_after=self.retry_after)
+        if roll < self.rate_limit_rate + self.error_rate:
+            time.sleep(latency * 0.5)
+            raise BackendError("stub server error", status_code=500)
+
+        text = respond(prompt, tools[0] if tools else None, random.Random(seed))
+
+        stop_reason = 'tool_use' if tools else 'end_turn'
+        max_chars = request['max_tokens'] * 4
+        if truncate or len(text) > max_chars:
+            text = text[:min(int(len(text) * cut), max_chars)]
+            stop_reason = 'max_tokens'
+
+        usage = SimpleNamespace(input_tokens=len(prompt) // 4, output_tokens=len(text) // 4,
+                                cache_creation_input_tokens=0, cache_read_input_tokens=0)
+        return _StubStream(text, bool(tools), stop_reason, usage,
+                           first_token_delay=latency * 0.2, remaining_delay=latency * 0.8,
+                           chunk_size=self.chunk_size)
+
+
+# Stub responses --------------------------------------------------------------
+
+def _fake_item(item_schema: Dict[str, Any], index: int, rng: random.Random) -> Dict[str, Any]:
+    item = {}
+    for field, spec in item_schema['properties'].items():
+        if spec['type'] == 'integer':
+            item[field] = index
+        elif spec['type'] == 'array':
+            allowed = spec['items']['enum']
+            item[field] = rng.sample(allowed, rng.randint(1, min(2, spec['maxItems'], len(allowed))))
+        else:
+            item[field] = rng.choice(spec['enum'])
+    return item
+
+
+def _fake_shapes(names: List[str], rng: random.Random) -> List[Dict[str, Any]]:
+    return [{
+        'shape_name': name,
+        'description': f"Systems whose iteration profile matches {name.lower()}",
+        'iteration_velocity': rng.choice(['Fast (hours-days)', 'Medium (days-weeks)', 'Slow (weeks-months)']),
+        'feedback_mechanism': rng.choice(['Automated metrics', 'Proxy metrics', 'Human evaluation']),
+        'failure_mode_complexity': rng.choice(['Simple', 'Moderate', 'Complex']),
+        'validation_requirements': rng.choice(['Minimal', 'Moderate', 'Extensive']),
+        'root_cause_difficulty': rng.choice(['Easy', 'Moderate', 'Hard']),
+        'change_impact_scope': rng.choice(['Narrow', 'Moderate', 'Broad']),
+        'iteration_strategy': 'Iterate with the feedback loop this shape supports.',
+        'example_characteristics': ['Stub characteristic'],
+        'estimated_proposals_matching': rng.randint(5, 100),
+    } for name in names]
+
+
+def _classify_template(prompt: str):
+    """Identify a classify prompt: (template name, template kwargs, number of proposals)."""
+    if prompt.startswith('Classify each proposal into ONE of these business use case types'):
+        header, _, body = prompt.partition('\nProposals:')
+        system_types = re.findall(r'^\d+\. (.+)$', header, re.M)
+        return ('business_clustering_classify.j2',
+                {'system_types': system_types, 'ask_confidence': 'Set confidence to "low"' in prompt},
+                len(re.findall(r'^\d+\. ', body, re.M)))
+
+    num_proposals = len(re.findall(r'^### Proposal \d+', prompt, re.M))
+    if 'SYSTEM ARCHITECTURE PATTERN' in prompt:
+        return 'architecture_classify.j2', {}, num_proposals
+    if 'DATA COMPLEXITY' in prompt:
+        return 'implementation_classify.j2', {'ask_confidence': 'Also rate your confidence' in prompt}, num_proposals
+    if 'most appropriate iteration shape' in prompt:
+        shapes = [{'shape_name': name} for name in re.findall(r'^### \d+\. (.+)$', prompt, re.M)]
+        return 'iteration_shape_classify.j2', {'iteration_shapes': shapes}, num_proposals
+    return None, {}, 0
+
+
+def respond(prompt: str, tool: Optional[Dict[str, Any]], rng: random.Random) -> str:
+    """Schema-valid response text (or tool input JSON) for a rendered prompt."""
+    template_name, template_kwargs, num_proposals = _classify_template(prompt)
+
+    if template_name is not None:
+        schema_tool = tool or classification_tool(template_name, **template_kwargs)
+        item_schema = schema_tool['input_schema']['properties']['classifications']['items']
+        items = [_fake_item(item_schema, i + 1, rng) for i in range(num_proposals)]
+        return json.dumps({'classifications': items} if tool else items)
+
+    # Discovery and reduce prompts
+    if 'proposed business use case categories for their shard' in prompt:
+        names = list(dict.fromkeys(re.findall(r'^- (.+)$', prompt, re.M)))
+        return json.dumps(names[:18])
+    if 'distinct business use case clusters' in prompt:
+        return json.dumps(rng.sample(STUB_BUSINESS_TYPES, 12))
+    if 'merge their candidates' in prompt:
+        names = list(dict.fromkeys(re.findall(r'^- \*\*(.+?)\*\*', prompt, re.M)))
+        return json.dumps(_fake_shapes(names[:12], rng))
+    if 'distinct **iteration shapes**' in prompt:
+        return json.dumps(_fake_shapes(rng.sample(STUB_ITERATION_SHAPES, 6), rng))
+
+    return '[]'
@@ -0,0 +1,195 @@
+"""
+Nearest-neighbor label propagation for near-duplicate proposals.
+
+Many companies submit near-identical proposals (invoice reconciliation,
+warranty claims, ...). Instead of sending every one of them to the LLM, the
+classification phases can copy labels from a highly similar proposal that is
+classified in the same run. A random share of propagated proposals is still
+sent to the LLM so the propagation quality can be audited.
+"""
+
+import math
+import random
+import re
+from collections import Counter, defaultdict
+from typing import List, Dict, Any, Optional, Tuple, Collection
+from utils import proposal_key
+
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Fields that make up the representation used for similarity search
+REPRESENTATION_FIELDS = ['proposal_name', 'functionality', 'problem_solving', 'current_state']
+
+DEFAULT_AUDIT_RATE = 0.05
+
+
+# ============================================================================
+# Vectorization
+# ============================================================================
+
+def proposal_text(proposal: Dict[str, Any]) -> str:
+    """Concatenate the fields used to compare proposals."""
+    return ' '.join(str(proposal.get(field, '') or '') for field in REPRESENTATION_FIELDS)
+
+
+def build_vectors(texts: List[str]) -> List[Dict[str, float]]:
+    """Build L2-normalized TF-IDF vectors (sparse dicts) for a list of texts."""
+    docs = [Counter(TOKEN_RE.findall(text.lower())) for text in texts]
+
+    doc_freq = Counter()
+    for doc in docs:
+        doc_freq.update(doc.keys())
+
+    n = len(docs)
+    vectors = []
+    for doc in docs:
+        vec = {
+            term: (1 + math.log(count)) * (math.log((1 + n) / (1 + doc_freq[term])) + 1)
+            for term, count in doc.items()
+        }
+        norm = math.sqrt(sum(w * w for w in vec.values())) or 1.0
+        vectors.append({term: w / norm for term, w in vec.items()})
+
+    return vectors
+
+
+def cosine(a: Dict[str, float], b: Dict[str, float]) -> float:
+    """Cosine similarity of two normalized sparse vectors."""
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(w * b.get(term, 0.0) for term, w in a.items())
+
+
+# ============================================================================
+# Index
+# ============================================================================
+
+class NeighborIndex:
+    """
+    Inverted index over sparse vectors for nearest-neighbor lookups.
+
+    Each vector is posted under its `max_terms` highest-weighted terms, so a
+    query only scores the entries sharing at least one salient term with it.
+    """
+
+    def __init__(self, max_terms: int = 24):
+        self.max_terms = max_terms
+        self.vectors: Dict[int, Dict[str, float]] = {}
+        self.postings: Dict[str, List[int]] = defaultdict(list)
+
+    def _top_terms(self, vector: Dict[str, float]) -> List[str]:
+        return sorted(vector, key=vector.get, reverse=True)[:self.max_terms]
+
+    def add(self, key: int, vector: Dict[str, float]):
+        """Add a vector under an integer key."""
+        self.vectors[key] = vector
+        for term in self._top_terms(vector):
+            self.postings[term].append(key)
+
+    def nearest(self, vector: Dict[str, float]) -> Tuple[Optional[int], float]:
+        """Return (key, similarity) of the most similar indexed vector."""
+        candidates = set()
+        for term in self._top_terms(vector):
+            candidates.update(self.postings.get(term, ()))
+
+        best_key, best_sim = None, 0.0
+        for key in candidates:
+            sim = cosine(vector, self.vectors[key])
+            if sim > best_sim:
+                best_key, best_sim = key, sim
+
+        return best_key, best_sim
+
+
+# ============================================================================
+# Propagation
+# ============================================================================
+
+class PropagationPlan:
+    """Which proposals copy their labels from which (by position in the list)."""
+
+    def __init__(self):
+        self.followers: Dict[int, int] = {}    # follower position -> leader position
+        self.similarity: Dict[int, float] = {}
+        self.audited: set = set()               # followers also sent to the LLM
+
+
+def plan_propagation(proposals: List[Dict[str, Any]], threshold: float,
+                     audit_rate: float = DEFAULT_AUDIT_RATE,
+                     seed: int = 0) -> PropagationPlan:
+    """
+    Greedily assign near-duplicate proposals to a leader.
+
+    Proposals are visited in order; a proposal whose nearest leader has a
+    cosine similarity >= threshold becomes a follower of that leader,
+    otherwise it becomes a leader itself. A random `audit_rate` share of
+    followers is marked for spot-check classification.
+    """
+    vectors = build_vectors([proposal_text(p) for p in proposals])
+    index = NeighborIndex()
+    rng = random.Random(seed)
+    plan = PropagationPlan()
+
+    for i, vector in enumerate(vectors):
+        leader, sim = index.nearest(vector)
+        if leader is not None and sim >= threshold:
+            plan.followers[i] = leader
+            plan.similarity[i] = sim
+            if rng.random() < audit_rate:
+                plan.audited.add(i)
+        else:
+            index.add(i, vector)
+
+    return plan
+
+
+def apply_propagation(proposals: List[Dict[str, Any]], plan: PropagationPlan,
+                      label_fields: List[str], flag_field: str,
+                      unlabeled: Collection[int] = ()) -> Dict[str, Any]:
+    """
+    Copy labels from leaders to followers and flag propagated records.
+
+    Audited followers keep their own LLM labels; their agreement with the
+    leader's labels is returned as audit statistics. Leaders in `unlabeled`
+    (positions of leaders that only got default labels) propagate nothing:
+    their followers keep whatever labels they were classified with.
+    """
+    for p in proposals:
+        p[flag_field] = ''
+
+    field_agreement = Counter()
+    audits = []
+    skipped = 0
+
+    for follower, leader in plan.followers.items():
+        source = proposals[leader]
+        target = proposals[follower]
+
+        if leader in unlabeled and follower not in plan.audited:
+            skipped += 1
+            continue
+        if follower in plan.audited:
+            matches = [f for f in label_fields if target.get(f) == source.get(f)]
+            field_agreement.update(matches)
+            audits.append({
+                'proposal': proposal_key(target),
+                'neighbor': proposal_key(source),
+                'similarity': round(plan.similarity[follower], 4),
+                'agreement': len(matches) / len(label_fields) if label_fields else 1.0,
+            })
+            continue
+
+        for field in label_fields:
+            target[field] = source.get(field, 'Unknown')
+        target[flag_field] = proposal_key(source)
+
+    num_audited = len(audits)
+    return {
+        'propagated': len(plan.followers) - num_audited - skipped,
+        'audited': num_audited,
+        'unlabeled_leader': skipped,
+        'mean_agreement': (sum(a['agreement'] for a in audits) / num_audited) if num_audited else None,
+        'field_agreement': {f: field_agreement[f] / num_audited for f in label_fields} if num_audited else {},
+        'audits': audits,
+    }
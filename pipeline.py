@@ -0,0 +1,213 @@
+"""
+Dependency-driven phase runner.
+
+analyze.py declares each phase as a Stage together with the stages it
+depends on. A stage starts as soon as all of its dependencies have finished,
+so independent phases (architecture and implementation classification)
+run concurrently instead of waiting for each other, and the
+run takes as long as its slowest dependency chain rather than the sum of all
+phases.
+
+Each stage works on its own copy of the proposals holding the input fields
+plus the fields written by its dependencies. When it finishes, only the
+fields it declares are merged back into the shared proposals, so concurrent
+stages never see each other's partial labels.
+"""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Any, Callable, Sequence
+import records
+from records import copy_record
+from utils import proposal_key
+
+
+class Stage:
+    """
+    A pipeline phase.
+
+    Args:
+        name: Stage name (used for dependencies and as output prefix)
+        run: Function(proposals) -> proposals; may return a different list
+            (e.g. loaded from disk), which is merged by proposal key
+        fields: Fields the stage writes
+        depends_on: Names of the stages whose fields this stage reads
+        reads_text: Whether the stage reads the long text fields (see records.py);
+            stages that do not get copies without them
+    """
+
+    def __init__(self, name: str, run: Callable[[List[Dict[str, Any]]], Any],
+                 fields: Sequence[str] = (), depends_on: Sequence[str] = (),
+                 reads_text: bool = True):
+        self.name = name
+        self.run = run
+        self.fields = list(fields)
+        self.depends_on = list(depends_on)
+        self.reads_text = reads_text
+
+
+# ============================================================================
+# Output
+# ============================================================================
+
+class _PrefixedOutput:
+    """
+    stdout wrapper that prefixes every line printed from a stage thread with
+    the stage name, so progress of concurrent stages stays readable. Partial
+    lines (print(..., end=' ')) are held until the line is complete.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def set_prefix(self, prefix: str):
+        self._local.prefix = prefix
+        self._local.buffer = ''
+
+    def write(self, text: str) -> int:
+        prefix = getattr(self._local, 'prefix', None)
+        if prefix is None:
+            return self.stream.write(text)
+
+        self._local.buffer += text
+        *lines, self._local.buffer = self._local.buffer.split('\n')
+        if lines:
+            with self._lock:
+                for line in lines:
+                    self.stream.write(f"[{prefix}] {line}\n" if line else "\n")
+        return len(text)
+
+    def flush_thread(self):
+        """Write out the current thread's incomplete line, if any."""
+        if getattr(self._local, 'buffer', ''):
+            self.write('\n')
+
+    def flush(self):
+        self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+# ============================================================================
+# Runner
+# ============================================================================
+
+def _ancestors(stage: Stage, by_name: Dict[str, Stage]) -> set:
+    names = set()
+    pending = list(stage.depends_on)
+    while pending:
+        name = pending.pop()
+        if name not in names:
+            names.add(name)
+            pending.extend(by_name[name].depends_on)
+    return names
+
+
+def _merge(proposals: List[Dict[str, Any]], result: List[Dict[str, Any]], fields: List[str]):
+    """Copy `fields` from a stage result into the shared proposals."""
+    if len(result) == len(proposals) and all(
+            proposal_key(a) == proposal_key(b) for a, b in zip(proposals, result)):
+        pairs = zip(proposals, result)
+    else:
+        by_key = {proposal_key(p): p for p in result}
+        pairs = ((p, by_key.get(proposal_key(p))) for p in proposals)
+
+    for proposal, labeled in pairs:
+        if labeled is None:
+            continue
+        for field in fields:
+            if field in labeled:
+                proposal[field] = labeled[field]
+
+
+def run_stages(proposals: List[Dict[str, Any]], stages: List[Stage],
+               sequential: bool = False, release_text: bool = False) -> List[Dict[str, Any]]:
+    """
+    Run stages in dependency order, independent stages concurrently.
+
+    Args:
+        proposals: Input proposals (stage fields are merged into them in place)
+        stages: Stages, in the order they run when sequential
+        sequential: Run one stage at a time (plain output, no prefixes)
+        release_text: Drop the long text fields of the proposals as soon as
+            every stage that reads them has finished
+
+    Returns:
+        The proposals with the fields of every stage
+    """
+    by_name = {stage.name: stage for stage in stages}
+    for stage in stages:
+        unknown = set(stage.depends_on) - set(by_name)
+        if unknown:
+            raise ValueError(f"Stage {stage.name} depends on unknown stages: {sorted(unknown)}")
+
+    # Fields a stage must not see: those of stages it does not depend on
+    # (its own fields stay visible, e.g. labels kept from an earlier run)
+    hidden = {}
+    for stage in stages:
+        visible = _ancestors(stage, by_name) | {stage.name}
+        hidden[stage.name] = {field for other in stages if other.name not in visible
+                              for field in other.fields}
+
+    output = None
+    if not sequential:
+        output = _PrefixedOutput(sys.stdout)
+        sys.stdout = output
+
+    def run_stage(stage: Stage, stage_proposals: List[Dict[str, Any]]):
+        if output is not None:
+            output.set_prefix(stage.name)
+        try:
+            return stage.run(stage_proposals)
+        finally:
+            if output is not None:
+                output.flush_thread()
+
+    started = time.perf_counter()
+    timings = {}
+    done_names = set()
+    waiting = list(stages)
+
+    try:
+        with ThreadPoolExecutor(max_workers=1 if sequential else len(stages)) as pool:
+            running = {}
+            while waiting or running:
+                for stage in [s for s in waiting if set(s.depends_on) <= done_names]:
+                    if sequential and running:
+                        break
+                    waiting.remove(stage)
+                    stage_proposals = [copy_record(p, hidden[stage.name], keep_text=stage.reads_text)
+                                       for p in proposals]
+                    running[pool.submit(run_stage, stage, stage_proposals)] = (stage, time.perf_counter())
+
+                if not running:
+                    raise ValueError(f"Stages with circular dependencies: {[s.name for s in waiting]}")
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage, stage_started = running.pop(future)
+                    result = future.result()
+                    if isinstance(result, list):
+                        _merge(proposals, result, stage.fields)
+                    timings[stage.name] = time.perf_counter() - stage_started
+                    done_names.add(stage.name)
+
+                if release_text and all(s.name in done_names for s in stages if s.reads_text):
+                    release_text = False
+                    records.release_text(proposals)
+    finally:
+        if output is not None:
+            sys.stdout = output.stream
+
+    total = time.perf_counter() - started
+    print(f"\n✓ {len(stages)} stages finished in {total:.1f}s "
+          f"(sum of stage times {sum(timings.values()):.1f}s)")
+    for name, seconds in timings.items():
+        print(f"  {name:16s} {seconds:8.1f}s")
+
+    return proposals
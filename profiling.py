@@ -0,0 +1,275 @@
+"""
+Opt-in profiling for analyze.py and visualize.py (--profile).
+
+Two layers, both off unless a run is started with start():
+- timing spans: wall and CPU time of each phase / create_* function,
+  including concurrent ones, saved as a Chrome trace (open in Perfetto or
+  chrome://tracing) and printed as a table
+- a sampling profiler (sample=True): a background thread records the stack
+  of every thread every few milliseconds. Its output is a collapsed-stack
+  file (input for flamegraph.pl, speedscope or inferno), a hotspot report
+  sorted by self and total time, and a breakdown of where time goes
+  (Jinja rendering, JSON, plotly, pandas, network, waiting)
+
+When no run is started, span() returns a shared no-op context manager and
+wrap() returns the function unchanged, so call sites cost nothing.
+"""
+
+import json
+import re
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Callable
+
+DEFAULT_INTERVAL = 0.005  # seconds between stack samples
+
+# A sample whose innermost frame is in these modules is an idle thread
+WAITING = ('threading.py', 'queue.py', 'concurrent/futures/', 'selectors.py')
+
+# Otherwise the innermost matching frame decides where its time goes
+CATEGORIES = [
+    ('Jinja rendering', ('jinja2/',)),
+    ('JSON', ('json/',)),
+    ('CSV', ('csv.py',)),
+    ('plotly', ('plotly/', '_plotly_utils/')),
+    ('pandas', ('pandas/',)),
+    ('network', ('anthropic/', 'httpx/', 'httpcore/', 'ssl.py', 'socket.py', 'llm_backends.py')),
+    ('imports', ('<frozen importlib',)),
+]
+
+_NULL_SPAN = nullcontext()
+_lock = threading.Lock()
+_local = threading.local()
+_run: Optional[Dict[str, Any]] = None
+
+
+# ============================================================================
+# Recording
+# ============================================================================
+
+def start(name: str, sample: bool = False, interval: float = DEFAULT_INTERVAL):
+    """
+    Start profiling a run.
+
+    Args:
+        name: Run name (prefix of the files in outputs/profile/)
+        sample: Also run the sampling profiler
+        interval: Seconds between stack samples
+    """
+    global _run
+    _run = {
+        'name': name,
+        'started': time.perf_counter(),
+        'spans': [],
+        'stacks': Counter(),
+        'samples': 0,
+        'sampler': None,
+        'stop': threading.Event(),
+    }
+    if sample:
+        sampler = threading.Thread(target=_sample_loop, args=(_run, interval),
+                                   name='profiler', daemon=True)
+        _run['sampler'] = sampler
+        sampler.start()
+
+
+def span(name: str):
+    """Time a block (wall and CPU time of the calling thread); a no-op unless profiling."""
+    if _run is None:
+        return _NULL_SPAN
+    return _span(name, _run)
+
+
+@contextmanager
+def _span(name: str, run: Dict[str, Any]):
+    stack = getattr(_local, 'spans', None)
+    if stack is None:
+        stack = _local.spans = []
+    stack.append(name)
+    started = time.perf_counter()
+    cpu_started = time.thread_time()
+    try:
+        yield
+    finally:
+        wall = time.perf_counter() - started
+        cpu = time.thread_time() - cpu_started
+        stack.pop()
+        with _lock:
+            run['spans'].append({
+                'name': '/'.join(stack + [name]),
+                'thread': threading.current_thread().name,
+                'tid': threading.get_ident(),
+                'start': started - run['started'],
+                'wall': wall,
+                'cpu': cpu,
+            })
+
+
+def wrap(name: str, func: Callable) -> Callable:
+    """func, timed as a span on every call when profiling (unchanged otherwise)."""
+    if _run is None:
+        return func
+
+    def timed(*args, **kwargs):
+        with span(name):
+            return func(*args, **kwargs)
+    return timed
+
+
+# ============================================================================
+# Sampling
+# ============================================================================
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename.replace('\\', '/')
+    for marker in ('site-packages/', 'lib/python'):
+        if marker in filename:
+            filename = filename.split(marker, 1)[1]
+            if marker == 'lib/python':
+                filename = filename.split('/', 1)[-1]
+            break
+    else:
+        filename = Path(filename).name
+    return f"{getattr(code, 'co_qualname', code.co_name)} ({filename}:{code.co_firstlineno})"
+
+
+def _sample_loop(run: Dict[str, Any], interval: float):
+    own = threading.get_ident()
+    while not run['stop'].wait(interval):
+        names = {t.ident: re.sub(r'_\d+$', '', t.name) for t in threading.enumerate()}
+        frames = sys._current_frames()
+        stacks = []
+        for ident, frame in frames.items():
+            if ident == own:
+                continue
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame))
+                frame = frame.f_back
+            labels.append(names.get(ident, 'thread'))
+            stacks.append(';'.join(reversed(labels)))
+        del frames
+        with _lock:
+            run['stacks'].update(stacks)
+            run['samples'] += 1
+
+
+def _category(stack: str) -> str:
+    labels = [label.rsplit('(', 1)[-1] for label in stack.split(';')[1:]]
+    if labels and any(marker in labels[-1] for marker in WAITING):
+        return 'waiting'
+    for filename in reversed(labels):
+        for category, markers in CATEGORIES:
+            if any(marker in filename for marker in markers):
+                return category
+    return 'other'
+
+
+def hotspots(stacks: Counter, top: int = 40) -> Dict[str, List[tuple]]:
+    """Functions by self samples (innermost frame) and total samples (anywhere on the stack)."""
+    self_counts = Counter()
+    total_counts = Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(';')[1:]
+        if not frames:
+            continue
+        self_counts[frames[-1]] += count
+        for label in set(frames):
+            total_counts[label] += count
+    return {'self': self_counts.most_common(top), 'total': total_counts.most_common(top)}
+
+
+# ============================================================================
+# Output
+# ============================================================================
+
+def stop(directory: Path) -> Optional[Dict[str, Path]]:
+    """
+    Stop profiling, print the span table and hotspots, and write the results
+    to directory.
+
+    Returns:
+        Paths of the written files by kind (None if profiling was not started)
+    """
+    global _run
+    run, _run = _run, None
+    if run is None:
+        return None
+    run['stop'].set()
+    if run['sampler'] is not None:
+        run['sampler'].join()
+
+    directory.mkdir(parents=True, exist_ok=True)
+    name = run['name']
+    files = {'trace': directory / f'{name}_trace.json'}
+
+    with open(files['trace'], 'w', encoding='utf-8') as f:
+        threads = {s['tid']: s['thread'] for s in run['spans']}
+        json.dump({'traceEvents': [{
+            'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': tid, 'args': {'name': thread},
+        } for tid, thread in threads.items()] + [{
+            'name': s['name'], 'ph': 'X', 'pid': 1, 'tid': s['tid'],
+            'ts': round(s['start'] * 1e6), 'dur': round(s['wall'] * 1e6),
+            'args': {'cpu_ms': round(s['cpu'] * 1000, 1)},
+        } for s in run['spans']]}, f)
+    print_spans(run['spans'])
+
+    if run['sampler'] is not None:
+        stacks = run['stacks']
+        active = Counter({s: c for s, c in stacks.items() if _category(s) != 'waiting'})
+        files['collapsed'] = directory / f'{name}.collapsed'
+        with open(files['collapsed'], 'w', encoding='utf-8') as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+        files['hotspots'] = directory / f'{name}_hotspots.txt'
+        with open(files['hotspots'], 'w', encoding='utf-8') as f:
+            f.write(format_report(stacks, active, run['samples']))
+        print(format_report(stacks, active, run['samples'], top=10))
+
+    for kind, path in files.items():
+        print(f"✓ Saved {path}")
+    return files
+
+
+def print_spans(spans: List[Dict[str, Any]]):
+    """Print spans aggregated by name: calls, wall and CPU time."""
+    totals = defaultdict(lambda: [0, 0.0, 0.0])
+    for s in spans:
+        total = totals[s['name']]
+        total[0] += 1
+        total[1] += s['wall']
+        total[2] += s['cpu']
+
+    print("\n" + "=" * 80)
+    print("PROFILE: TIMING SPANS")
+    print("=" * 80)
+    print(f"{'Span':44s} {'Calls':>6s} {'Wall s':>9s} {'CPU s':>9s}")
+    print("-" * 80)
+    for name, (calls, wall, cpu) in sorted(totals.items(), key=lambda item: -item[1][1]):
+        print(f"{name[:44]:44s} {calls:6d} {wall:9.2f} {cpu:9.2f}")
+
+
+def format_report(stacks: Counter, active: Counter, samples: int, top: int = 40) -> str:
+    """Category breakdown and hotspot tables of a sampling run."""
+    lines = ["", "=" * 80, "PROFILE: WHERE THE TIME GOES (sampled thread time)", "=" * 80]
+    total = sum(stacks.values()) or 1
+    by_category = Counter()
+    for stack, count in stacks.items():
+        by_category[_category(stack)] += count
+    for category, count in by_category.most_common():
+        lines.append(f"  {category:24s} {count * 100 / total:6.1f}%")
+    lines.append(f"  ({samples} samples; 'waiting' is idle threads)")
+
+    report = hotspots(active, top)
+    active_total = sum(active.values()) or 1
+    for kind, title in [('self', 'SELF TIME (innermost frame)'), ('total', 'TOTAL TIME (anywhere on the stack)')]:
+        lines += ["", f"Hotspots by {title}, excluding waiting", "-" * 80]
+        for label, count in report[kind]:
+            lines.append(f"  {count * 100 / active_total:6.1f}%  {label[:100]}")
+    return '\n'.join(lines) + '\n'
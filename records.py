@@ -0,0 +1,413 @@
+"""
+Compact proposal records.
+
+Plain dicts cost over a kilobyte per proposal before any value is stored,
+every classified proposal carries its own copy of ~20 categorical strings
+('Human Approval Gate', ...), and the long text fields are kept in memory for
+the whole run although only the classification prompts read them. At 100k+
+proposals that dominates memory.
+
+`Proposal` is a dict-compatible record (a MutableMapping) with __slots__:
+- categorical values (classification dimensions, company, dedup and
+  propagation links) are interned, so all records share one string object
+  per distinct value
+- long text fields are written to a TextStore (a temporary file) and the
+  record only keeps their positions; a field is read back when accessed.
+  Copies share the positions, and release_text() drops them once no later
+  step needs the text
+- any other key goes to a small overflow dict
+
+Existing code keeps working unchanged: p['field'], p.get(), `in`, dict(p),
+template access (prop.field) and save_json/save_csv.
+
+For vectorized counting over many records, encode_dimension() turns a field
+into numpy value codes and split_values() expands the values of multi-value
+fields (see field_values).
+"""
+
+import os
+import sys
+import tempfile
+import threading
+from collections.abc import MutableMapping
+from typing import List, Dict, Any, Iterable, Optional, Tuple
+from schemas import MULTI_VALUE_FIELDS
+
+
+ID_FIELDS = ('company', 'proposal_name')
+
+# Long free-text fields from extraction (read by the classification prompts)
+TEXT_FIELDS = (
+    'current_state', 'problems', 'impact', 'target_persona', 'existing_tooling',
+    'functionality', 'problem_solving', 'risk_assessment',
+)
+
+# Fields with few distinct values, interned on assignment
+CATEGORICAL_FIELDS = (
+    'business_use_case',
+    'architecture_pattern', 'reasoning_pattern', 'execution_pattern', 'knowledge_representation',
+    'input_modalities', 'tool_integration', 'human_oversight', 'architecture_confidence',
+    'data_complexity', 'integration_complexity', 'prompt_complexity', 'chain_depth',
+    'schema_complexity', 'state_management', 'error_handling', 'evaluation_complexity',
+    'domain_expertise', 'latency_requirements', 'regulatory_requirements', 'rerepresentation_type',
+    'iteration_shape', 'iteration_shape_confidence',
+    'duplicate_of', 'business_propagated_from', 'architecture_propagated_from',
+    'implementation_propagated_from', 'iteration_shape_propagated_from',
+)
+
+# Classification dimensions of phases 2-4 (the explorer axes, company
+# profiles and indexed database columns)
+CLASSIFICATION_DIMENSIONS = (
+    'business_use_case',
+    'architecture_pattern', 'reasoning_pattern', 'execution_pattern', 'knowledge_representation',
+    'input_modalities', 'tool_integration', 'human_oversight',
+    'data_complexity', 'integration_complexity', 'prompt_complexity', 'chain_depth',
+    'schema_complexity', 'state_management', 'error_handling', 'evaluation_complexity',
+    'domain_expertise', 'latency_requirements', 'regulatory_requirements', 'rerepresentation_type',
+)
+
+# Other fields set on most records
+OTHER_FIELDS = ('duplicate_count', 'iteration_shape_reasoning')
+
+_SLOT_FIELDS = ID_FIELDS + CATEGORICAL_FIELDS + OTHER_FIELDS
+_SLOT_SET = frozenset(_SLOT_FIELDS)
+_TEXT_SET = frozenset(TEXT_FIELDS)
+_TEXT_INDEX = {field: i for i, field in enumerate(TEXT_FIELDS)}
+_INTERNED = frozenset(CATEGORICAL_FIELDS) | {'company'}
+
+
+# ============================================================================
+# Text Store
+# ============================================================================
+
+class TextStore:
+    """
+    Append-only temporary file holding the text fields of records.
+
+    Reads go through the OS page cache, so the text costs no process memory
+    and reading a field back is a single system call.
+    """
+
+    def __init__(self):
+        self._file = tempfile.TemporaryFile()
+        self._fd = self._file.fileno()
+        self._lock = threading.Lock()
+        self._end = 0
+
+    def put(self, data: bytes) -> int:
+        """Append data; returns its offset."""
+        with self._lock:
+            offset = self._end
+            self._end += len(data)
+            if hasattr(os, 'pwrite'):
+                os.pwrite(self._fd, data, offset)
+            else:
+                self._file.seek(offset)
+                self._file.write(data)
+                self._file.flush()
+        return offset
+
+    def get(self, offset: int, length: int) -> bytes:
+        """Read length bytes at offset."""
+        if hasattr(os, 'pread'):
+            return os.pread(self._fd, length, offset)
+        with self._lock:
+            self._file.seek(offset)
+            return self._file.read(length)
+
+    def close(self):
+        """Delete the file."""
+        self._file.close()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def text_store() -> TextStore:
+    """The process-wide TextStore (created on first use)."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = TextStore()
+    return _store
+
+
+def reset_text_store():
+    """
+    Delete the process-wide TextStore; text written from now on goes to a new one.
+
+    The store is append-only, so a long-running process (analyze.py --watch)
+    calls this between updates. Records still holding text positions must not
+    be read afterwards (release_text them first).
+    """
+    global _store
+    with _store_lock:
+        store, _store = _store, None
+    if store is not None:
+        store.close()
+
+
+def _pack_text(values: Dict[str, str]) -> Optional[Tuple[int, ...]]:
+    """
+    Write text fields to the store as one block.
+
+    Returns (offset, size of each TEXT_FIELDS entry); a field that is not
+    set has its size stored as ~size (negative), so positions stay valid
+    when a field is removed later.
+    """
+    if not values:
+        return None
+    encoded = [values[field].encode('utf-8') if field in values else b'' for field in TEXT_FIELDS]
+    sizes = tuple(len(data) if field in values else ~len(data)
+                  for field, data in zip(TEXT_FIELDS, encoded))
+    return (text_store().put(b''.join(encoded)),) + sizes
+
+
+def _unpack_field(text: Tuple[int, ...], i: int) -> Optional[str]:
+    """Read one text field (by TEXT_FIELDS position); None if not set."""
+    size = text[i + 1]
+    if size < 0:
+        return None
+    offset = text[0] + sum(s if s >= 0 else ~s for s in text[1:i + 1])
+    return text_store().get(offset, size).decode('utf-8')
+
+
+class Proposal(MutableMapping):
+    """
+    Memory-lean, dict-compatible proposal record.
+
+    Args:
+        data: Mapping (or iterable of key/value pairs) to copy
+        keep_text: Keep the long text fields (False drops them on load)
+    """
+
+    __slots__ = _SLOT_FIELDS + ('_text', '_extra')
+
+    def __init__(self, data: Any = (), keep_text: bool = True):
+        self._text = None
+        self._extra = None
+        text = {}
+        for key, value in (data.items() if hasattr(data, 'items') else data):
+            if key in _TEXT_SET and isinstance(value, str):
+                if keep_text:
+                    text[key] = value
+            else:
+                self[key] = value
+        self._text = _pack_text(text)
+
+    def _text_fields(self) -> Dict[str, str]:
+        if self._text is None:
+            return {}
+        values = {field: _unpack_field(self._text, i) for i, field in enumerate(TEXT_FIELDS)}
+        return {field: value for field, value in values.items() if value is not None}
+
+    def __getitem__(self, key: str) -> Any:
+        if key in _SLOT_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if key in _TEXT_SET and self._text is not None:
+            value = _unpack_field(self._text, _TEXT_INDEX[key])
+            if value is not None:
+                return value
+        if self._extra is None:
+            raise KeyError(key)
+        return self._extra[key]
+
+    def __setitem__(self, key: str, value: Any):
+        if key in _SLOT_SET:
+            if key in _INTERNED and type(value) is str:
+                value = sys.intern(value)
+            setattr(self, key, value)
+        elif key in _TEXT_SET and isinstance(value, str):
+            # Rare after loading: the record's text block is written anew
+            self._text = _pack_text({**self._text_fields(), key: value})
+            if self._extra is not None:
+                self._extra.pop(key, None)
+        else:
+            if key in _TEXT_SET and key in self:
+                del self[key]
+            if self._extra is None:
+                self._extra = {}
+            self._extra[key] = value
+
+    def __delitem__(self, key: str):
+        if key in _SLOT_SET:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        elif self._extra is not None and key in self._extra:
+            del self._extra[key]
+        elif key in _TEXT_SET and self._text is not None and self._text[_TEXT_INDEX[key] + 1] >= 0:
+            i = _TEXT_INDEX[key] + 1
+            self._text = self._text[:i] + (~self._text[i],) + self._text[i + 1:]
+        else:
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        if key in _SLOT_SET:
+            return hasattr(self, key)
+        if key in _TEXT_SET and self._text is not None and self._text[_TEXT_INDEX[key] + 1] >= 0:
+            return True
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self):
+        # Identity, text, labels, then anything else (the CSV column order)
+        for key in ID_FIELDS:
+            if hasattr(self, key):
+                yield key
+        if self._text is not None:
+            yield from [field for i, field in enumerate(TEXT_FIELDS) if self._text[i + 1] >= 0]
+        for key in CATEGORICAL_FIELDS + OTHER_FIELDS:
+            if hasattr(self, key):
+                yield key
+        if self._extra is not None:
+            yield from list(self._extra)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"Proposal({dict(self)!r})"
+
+    def copy(self, exclude: Iterable[str] = (), keep_text: bool = True) -> 'Proposal':
+        """Shallow copy without the `exclude` fields (and without text if keep_text is False)."""
+        exclude = set(exclude)
+        record = Proposal()
+        for key in _SLOT_FIELDS:
+            if key not in exclude and hasattr(self, key):
+                setattr(record, key, getattr(self, key))
+        if keep_text and self._text is not None:
+            # The text block is shared; excluded fields are only marked unset
+            record._text = self._text
+            for field in exclude & _TEXT_SET:
+                if field in record:
+                    del record[field]
+        if self._extra is not None:
+            record._extra = {k: v for k, v in self._extra.items() if k not in exclude}
+        return record
+
+    def release_text(self):
+        """Drop the long text fields."""
+        self._text = None
+
+
+# ============================================================================
+# Conversion
+# ============================================================================
+
+def to_records(proposals: Iterable[Dict[str, Any]], keep_text: bool = True) -> List[Proposal]:
+    """Convert proposal dicts (e.g. from load_json or iter_json_array) to Proposal records."""
+    return [Proposal(p, keep_text=keep_text) for p in proposals]
+
+
+def load_classified_proposals(keep_text: bool = True) -> List[Proposal]:
+    """
+    Classified proposals of the last analyze.py run (with implementation
+    labels if available), as records.
+
+    Raises:
+        FileNotFoundError: No classified proposals in OUTPUTS_DIR
+    """
+    from utils import iter_json_array  # records.py does not depend on utils otherwise
+    for filename in ('proposals_with_implementation.json', 'proposals_complete.json'):
+        try:
+            return to_records(iter_json_array(filename), keep_text=keep_text)
+        except (OSError, ValueError):
+            continue
+    raise FileNotFoundError("No classified proposals in outputs/. Run analyze.py first.")
+
+
+def copy_record(record: Dict[str, Any], exclude: Iterable[str] = (),
+                keep_text: bool = True) -> Dict[str, Any]:
+    """Shallow copy of a Proposal or plain dict without the `exclude` fields."""
+    if isinstance(record, Proposal):
+        return record.copy(exclude, keep_text=keep_text)
+    exclude = set(exclude) if keep_text else set(exclude) | _TEXT_SET
+    return {k: v for k, v in record.items() if k not in exclude}
+
+
+def release_text(proposals: Iterable[Dict[str, Any]]) -> int:
+    """
+    Drop the long text fields of every record once no later step needs them.
+
+    Returns:
+        Number of records whose text was released
+    """
+    released = 0
+    for p in proposals:
+        if isinstance(p, Proposal):
+            if p._text is not None:
+                p.release_text()
+                released += 1
+        else:
+            for field in TEXT_FIELDS:
+                p.pop(field, None)
+            released += 1
+    return released
+
+
+# ============================================================================
+# Columnar Encoding
+# ============================================================================
+
+def encode_dimension(proposals: List[Dict[str, Any]], field: str):
+    """
+    Dictionary-encode a field.
+
+    Returns:
+        (values, codes): distinct values in order of first appearance, and a
+        numpy array with the index of every proposal's value
+    """
+    import numpy as np
+    index = {}
+    codes = np.fromiter((index.setdefault(p.get(field) or 'Unknown', len(index)) for p in proposals),
+                        dtype=np.int64, count=len(proposals))
+    return list(index), codes
+
+
+def field_values(field: str, value: Any) -> List[Any]:
+    """
+    Values a label counts as: the comma-separated values of a multi-value
+    field (schemas.MULTI_VALUE_FIELDS), else the label itself (enum values
+    such as 'Multimodal, Complex' contain commas too).
+    """
+    if field in MULTI_VALUE_FIELDS and isinstance(value, str):
+        return value.split(', ')
+    return [value]
+
+
+def split_values(field: str, labels: List[Any], codes, exclude: Iterable[str] = ()):
+    """
+    Expand an encoded field to one row per (proposal, value): a label of a
+    multi-value field yields a row for each of its values (see field_values).
+
+    Args:
+        field: The field encoded
+        labels: Distinct values of the field (see encode_dimension)
+        codes: Every proposal's value code (see encode_dimension)
+        exclude: Values to leave out (e.g. 'Unknown')
+
+    Returns:
+        (values, rows, value_codes): distinct split values in order of first
+        appearance, and numpy arrays with the proposal index and value code
+        of every row, ordered by proposal
+    """
+    import numpy as np
+    exclude = set(exclude)
+    # Every label's values (most labels hold one), flattened
+    index = {}
+    label_values = [[index.setdefault(v, len(index)) for v in field_values(field, str(label)) if v not in exclude]
+                    for label in labels]
+    lengths = np.array([len(v) for v in label_values], dtype=np.int64)
+    flat = np.array([v for values in label_values for v in values], dtype=np.int64)
+    starts = np.cumsum(lengths) - lengths
+
+    per_proposal = lengths[codes]
+    rows = np.repeat(np.arange(len(codes)), per_proposal)
+    offsets = np.arange(len(rows)) - np.repeat(np.cumsum(per_proposal) - per_proposal, per_proposal)
+    return list(index), rows, flat[starts[codes[rows]] + offsets]
@@ -0,0 +1,135 @@
+"""
+Company-stratified sampling with bootstrap confidence intervals.
+
+analyze.py --sample classifies a sample of the corpus instead of every
+proposal. Proposals are put in a seeded order in which every prefix is a
+proportionally stratified sample by company: a company with k of the N
+proposals has about n*k/N of them among the first n. A sample of n is the
+first n proposals of that order, so a larger sample with the same seed
+contains the smaller one. Extending a sample therefore only classifies the
+proposals added (the others keep their labels, see analyze.run_sample and
+label_cache.py).
+
+Distributions estimated from a sample are reported with percentile
+bootstrap confidence intervals. Companies are resampled rather than single
+proposals, because proposals of one company tend to share labels and
+resampling them independently would understate the error.
+"""
+
+import random
+from collections import defaultdict
+from typing import List, Dict, Any, Optional, Union
+from records import field_values
+
+DEFAULT_SEED = 0
+CONFIDENCE = 0.95
+BOOTSTRAP_SAMPLES = 1000
+BOOTSTRAP_CHUNK = 50  # Replicates drawn at once (bounds memory with many companies)
+
+
+# ============================================================================
+# Sampling
+# ============================================================================
+
+def sample_size(spec: Union[int, float], population: int) -> int:
+    """Number of proposals for --sample: a count, or a fraction of the population if below 1."""
+    if spec < 1:
+        return max(1, round(spec * population))
+    return min(int(spec), population)
+
+
+def stratified_order(proposals: List[Dict[str, Any]], seed: int = DEFAULT_SEED) -> List[int]:
+    """
+    Indices of proposals in sampling order: every prefix is stratified by company.
+
+    Each company's proposals are shuffled and spread evenly over [0, 1) from a
+    random offset (systematic sampling within the company); sorting all
+    proposals by that position interleaves the companies in proportion to
+    their size.
+    """
+    rng = random.Random(seed)
+    by_company = defaultdict(list)
+    for i, p in enumerate(proposals):
+        by_company[p.get('company')].append(i)
+
+    positions = []
+    for company in sorted(by_company, key=str):
+        indices = by_company[company]
+        rng.shuffle(indices)
+        offset = rng.random()
+        positions.extend(((j + offset) / len(indices), rng.random(), i) for j, i in enumerate(indices))
+    positions.sort()
+    return [i for _, _, i in positions]
+
+
+def stratified_sample(proposals: List[Dict[str, Any]], size: int,
+                      seed: int = DEFAULT_SEED) -> List[Dict[str, Any]]:
+    """The first `size` proposals of stratified_order."""
+    return [proposals[i] for i in stratified_order(proposals, seed)[:size]]
+
+
+# ============================================================================
+# Confidence Intervals
+# ============================================================================
+
+def bootstrap_intervals(proposals: List[Dict[str, Any]], field: str,
+                        population: Optional[int] = None,
+                        samples: int = BOOTSTRAP_SAMPLES, confidence: float = CONFIDENCE,
+                        seed: int = DEFAULT_SEED) -> Dict[Any, Dict[str, float]]:
+    """
+    Share of proposals with each value of a field, with a bootstrap confidence interval.
+
+    Args:
+        proposals: The classified sample
+        field: Field to count (values of multi-value fields counted individually)
+        population: Corpus size, to also estimate counts in the whole corpus
+        samples: Bootstrap replicates
+        confidence: Confidence level of the intervals
+        seed: Seed of the resampling
+
+    Returns:
+        {value: {'share', 'low', 'high'[, 'estimated_count']}}, most frequent value first
+    """
+    import numpy as np
+
+    companies, values = {}, {}
+    cells = defaultdict(int)
+    totals = defaultdict(int)
+    for p in proposals:
+        company = companies.setdefault(p.get('company'), len(companies))
+        totals[company] += 1
+        for value in field_values(field, p.get(field, 'Unknown')):
+            cells[company, values.setdefault(value, len(values))] += 1
+    if not proposals:
+        return {}
+
+    counts = np.zeros((len(companies), len(values)))
+    for (company, value), count in cells.items():
+        counts[company, value] = count
+    company_totals = np.array([totals[c] for c in range(len(companies))], dtype=float)
+
+    # Resample companies with replacement: each replicate weights every company
+    # by the number of times it was drawn
+    rng = np.random.default_rng(seed)
+    uniform = np.full(len(companies), 1 / len(companies))
+    replicates = []
+    for start in range(0, samples, BOOTSTRAP_CHUNK):
+        weights = rng.multinomial(len(companies), uniform, size=min(BOOTSTRAP_CHUNK, samples - start))
+        replicates.append((weights @ counts) / (weights @ company_totals)[:, None])
+    low, high = np.quantile(np.vstack(replicates), [(1 - confidence) / 2, (1 + confidence) / 2], axis=0)
+    shares = counts.sum(axis=0) / company_totals.sum()
+
+    intervals = {}
+    for value, i in sorted(values.items(), key=lambda item: -shares[item[1]]):
+        interval = {'share': round(float(shares[i]), 4), 'low': round(float(low[i]), 4),
+                    'high': round(float(high[i]), 4)}
+        if population is not None:
+            interval['estimated_count'] = round(float(shares[i]) * population)
+        intervals[value] = interval
+    return intervals
+
+
+def widest_interval(intervals: Dict[str, Dict[Any, Dict[str, float]]]) -> float:
+    """Width of the widest interval in {distribution: bootstrap_intervals(...)}."""
+    return max((v['high'] - v['low'] for distribution in intervals.values() for v in distribution.values()),
+               default=0.0)
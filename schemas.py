@@ -0,0 +1,201 @@
+"""
+JSON schemas for structured (tool-use) classification responses.
+
+Each classify template is paired with a tool whose input schema lists the
+allowed values of every dimension as enums. In structured mode the model is
+forced to call that tool, so responses arrive as validated JSON instead of
+free text that has to be sliced and parsed.
+"""
+
+from typing import List, Dict, Any, Tuple
+
+
+TOOL_NAME = 'record_classifications'
+
+CONFIDENCE_VALUES = ['high', 'medium', 'low']
+
+# Allowed values per dimension (kept in sync with the classify templates)
+ARCHITECTURE_VALUES = {
+    'architecture_pattern': [
+        'Basic RAG', 'Agentic RAG', 'ReAct Agent', 'Tool-Using Agent', 'Planning Agent',
+        'Multi-Agent System', 'Sequential Pipeline', 'Single-Shot Inference', 'Workflow Orchestration',
+    ],
+    'reasoning_pattern': [
+        'Chain-of-Thought (CoT)', 'Few-Shot', 'Zero-Shot', 'Reflection/Self-Critique',
+        'Planning/Decomposition', 'Ensemble/Multi-Path', 'Direct/None',
+    ],
+    'execution_pattern': [
+        'Single-Shot', 'Sequential Chain', 'Iterative Loop', 'Parallel',
+        'Conditional Branching', 'Human-in-Loop', 'Event-Driven',
+    ],
+    'knowledge_representation': [
+        'Vector Embeddings', 'Knowledge Graph', 'Structured Database', 'Document Store',
+        'Hybrid Vector+Graph', 'Hybrid Vector+DB', 'Policy Rules', 'API/External',
+    ],
+    'input_modalities': [
+        'Text Only', 'Text + Images', 'Text + Audio', 'Text + Video',
+        'Multimodal (Text + Images + Audio)', 'Structured Data', 'Sensor/Telemetry',
+    ],
+    'tool_integration': [
+        'No Tools', 'Read-Only APIs', 'Write/Action APIs', 'Multi-System Integration', 'Workflow Automation',
+    ],
+    'human_oversight': [
+        'Fully Autonomous', 'Human Approval Gate', 'Human Escalation', 'Human Monitoring', 'Co-Pilot',
+    ],
+    'confidence': CONFIDENCE_VALUES,
+}
+
+IMPLEMENTATION_VALUES = {
+    'data_complexity': [
+        'Single Source, Structured', 'Multiple Sources, Structured', 'Multimodal, Simple',
+        'Multimodal, Complex', 'Streaming/Real-time', 'Sparse/Incomplete',
+    ],
+    'integration_complexity': [
+        'No External Integration', 'Read-Only (1-3 systems)', 'Read-Only (4+ systems)',
+        'Write/Action (1-3 systems)', 'Write/Action (4+ systems)', 'Bidirectional with Compensation',
+    ],
+    'prompt_complexity': [
+        'Single Static Prompt', 'Few Static Prompts (2-5)', 'Many Static Prompts (6+)',
+        'Dynamic Prompt Assembly', 'Adaptive/Self-Modifying', 'Meta-Prompted',
+    ],
+    'chain_depth': [
+        'Single-Shot', 'Sequential (2-3 steps)', 'Sequential (4-7 steps)', 'Sequential (8+ steps)',
+        'Branching (2-5 paths)', 'Branching (6+ paths)', 'Cyclic/Iterative', 'DAG (Directed Acyclic Graph)',
+    ],
+    'schema_complexity': [
+        'Unstructured Text', 'Simple Structured (flat JSON)', 'Nested Structured (2-3 levels)',
+        'Deep Structured (4+ levels)', 'Graph/Relational', 'Hybrid (Structured + Unstructured)',
+        'Streaming/Progressive',
+    ],
+    'state_management': [
+        'Stateless', 'Session State (Short-term)', 'User State (Long-term)',
+        'Complex State Machine', 'Distributed State', 'Event Sourcing',
+    ],
+    'error_handling': [
+        'Best Effort', 'Retry with Backoff', 'Graceful Degradation',
+        'Compensation/Rollback', 'Mission Critical', 'Human Escalation Required',
+    ],
+    'evaluation_complexity': [
+        'Ground Truth Available (Exact Match)', 'Ground Truth Available (Similarity)', 'Proxy Metrics',
+        'Human Evaluation Required (Simple)', 'Human Evaluation Required (Complex)',
+        'Multi-Dimensional Scoring', 'Delayed/Indirect Feedback',
+    ],
+    'domain_expertise': [
+        'General Knowledge', 'Professional Knowledge', 'Specialist Knowledge',
+        'Expert Knowledge with Complex Rules', 'Cutting-Edge Research',
+    ],
+    'latency_requirements': [
+        'Batch/Async (hours-days)', 'Near Real-time (minutes)', 'Interactive (<5 seconds)',
+        'Real-time (<1 second)', 'Sub-second (<200ms)', 'Burst Handling Required',
+    ],
+    'regulatory_requirements': [
+        'No Special Requirements', 'Basic Audit Trail', 'Full Auditability', 'Explainability Required',
+        'PII/Sensitive Data', 'Highly Regulated (HIPAA/SOX/etc.)', 'Safety-Critical',
+    ],
+    'rerepresentation_type': [
+        'None/Text Description', 'Linear Flow Diagram', 'Decision Tree', 'State Machine',
+        'DAG (Directed Acyclic Graph)', 'Entity-Relationship Diagram',
+        'Process + Data Model (Combined)', 'Network/Graph Structure',
+    ],
+}
+
+# Dimensions answered with an array of values: field -> max items
+MULTI_VALUE_FIELDS = {
+    'knowledge_representation': 2,
+    'input_modalities': len(ARCHITECTURE_VALUES['input_modalities']),
+    'rerepresentation_type': 2,
+}
+
+
+# ============================================================================
+# Schemas
+# ============================================================================
+
+def _item_schema(index_field: str, values: Dict[str, List[str]]) -> Dict[str, Any]:
+    properties = {index_field: {'type': 'integer', 'minimum': 1}}
+    for field, allowed in values.items():
+        if field in MULTI_VALUE_FIELDS:
+            properties[field] = {
+                'type': 'array',
+                'items': {'type': 'string', 'enum': allowed},
+                'minItems': 1,
+                'maxItems': MULTI_VALUE_FIELDS[field],
+            }
+        else:
+            properties[field] = {'type': 'string', 'enum': allowed}
+
+    return {
+        'type': 'object',
+        'properties': properties,
+        'required': [index_field] + list(values),
+    }
+
+
+def template_schema(template_name: str, **template_kwargs) -> Tuple[str, Dict[str, List[str]]]:
+    """
+    Return (index_field, allowed values per dimension) for a classify template.
+
+    Raises:
+        ValueError: If the template has no structured-output schema
+    """
+    # Templates without a confidence field ask for one with ask_confidence=True
+    confidence = {'confidence': CONFIDENCE_VALUES} if template_kwargs.get('ask_confidence') else {}
+
+    if template_name == 'business_clustering_classify.j2':
+        return 'idx', {'type': list(template_kwargs['system_types']), **confidence}
+    if template_name == 'architecture_classify.j2':
+        return 'proposal_index', ARCHITECTURE_VALUES
+    if template_name == 'implementation_classify.j2':
+        return 'proposal_index', {**IMPLEMENTATION_VALUES, **confidence}
+    if template_name == 'iteration_shape_classify.j2':
+        return 'idx', {
+            'iteration_shape': [shape['shape_name'] for shape in template_kwargs['iteration_shapes']],
+            'confidence': CONFIDENCE_VALUES,
+        }
+    raise ValueError(f"No structured-output schema for template {template_name}")
+
+
+def classification_tool(template_name: str, **template_kwargs) -> Dict[str, Any]:
+    """Tool definition whose input is the list of classifications for a batch."""
+    index_field, values = template_schema(template_name, **template_kwargs)
+    return {
+        'name': TOOL_NAME,
+        'description': 'Record the classification of every proposal in the batch, one entry per proposal.',
+        'input_schema': {
+            'type': 'object',
+            'properties': {
+                'classifications': {
+                    'type': 'array',
+                    'items': _item_schema(index_field, values),
+                },
+            },
+            'required': ['classifications'],
+        },
+    }
+
+
+# ============================================================================
+# Validation
+# ============================================================================
+
+def validate_classification(classification: Dict[str, Any],
+                            values: Dict[str, List[str]]) -> List[str]:
+    """
+    Replace values outside the allowed enums with 'Unknown' (in place).
+
+    Returns:
+        Names of the fields that held invalid values
+    """
+    invalid = []
+    for field, allowed in values.items():
+        value = classification.get(field)
+        if field in MULTI_VALUE_FIELDS:
+            items = value if isinstance(value, list) else [value]
+            valid = [v for v in items if v in allowed]
+            if len(valid) != len(items) or not valid:
+                invalid.append(field)
+            classification[field] = valid or ['Unknown']
+        elif value not in allowed:
+            invalid.append(field)
+            classification[field] = 'Unknown'
+    return invalid
@@ -2,22 +2,203 @@
 """
 Simple HTTP server to view the dashboard locally.
 This avoids CORS issues when loading data files.
+
+/events streams the progress of a running analyze.py (batches, labels,
+throughput, ETA, errors; see events.py) to the dashboard as Server-Sent Events.
+
+/api/similar-companies?company=NAME&k=10 answers "companies like NAME" from
+outputs/company_index.npz (see company_index.py) as JSON.
+
+/api/group-by?dimensions=A,B[&unique=1][&company=NAME] and /api/sql?q=SELECT...
+query outputs/proposals.db (see database.py, read-only) as JSON.
 """
 
 import http.server
+import json
 import socketserver
 import webbrowser
 import argparse
 import socket
+import time
+import zipfile
 from pathlib import Path
+from urllib.parse import unquote, urlsplit, parse_qs
+from utils import output_path, EVENTS_FILE
+import company_index
+import database
 
 DEFAULT_PORT = 8000
 DIRECTORY = Path(__file__).parent
+OUTPUTS = DIRECTORY / "outputs"
+EVENT_POLL_INTERVAL = 0.5  # seconds between checks for new pipeline events
+KEEPALIVE_INTERVAL = 15.0  # seconds between comments on an idle event stream
 
 class MyHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory=str(DIRECTORY), **kwargs)
 
+    def do_GET(self):
+        """
+        Route a request:
+        - /events: live pipeline progress (send_events)
+        - /api/similar-companies: send_similar_companies
+        - /api/group-by and /api/sql: send_database_query
+        - outputs/X.json when X.jsonl is the current file: send_jsonl_as_array
+        - anything else: the static file
+        """
+        url = urlsplit(self.path)
+        path = unquote(url.path)
+        if path == '/events':
+            self.send_events()
+            return
+        if path == '/api/similar-companies':
+            self.send_similar_companies(parse_qs(url.query))
+            return
+        if path in ('/api/group-by', '/api/sql'):
+            self.send_database_query(path, parse_qs(url.query))
+            return
+        if path.startswith('/outputs/') and path.endswith('.json') and '/' not in path[len('/outputs/'):]:
+            source = output_path(path[len('/outputs/'):], OUTPUTS)
+            if source.suffix == '.jsonl':
+                self.send_jsonl_as_array(source)
+                return
+        super().do_GET()
+
+    def send_jsonl_as_array(self, source: Path):
+        """
+        Serve outputs/X.json from X.jsonl when that is the current file
+        (analyze.py --output-format jsonl), streamed as one JSON array, so
+        the dashboard reads either format.
+        """
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Last-Modified", self.date_time_string(int(source.stat().st_mtime)))
+        self.end_headers()
+        chunk = bytearray(b'[')
+        separator = b''
+        with open(source, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    chunk += separator + line
+                    separator = b','
+                if len(chunk) >= 1 << 16:
+                    self.wfile.write(chunk)
+                    chunk.clear()
+        chunk += b']'
+        self.wfile.write(chunk)
+
+    def send_json(self, data, status: int = 200):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_similar_companies(self, query):
+        """The companies most similar to ?company= (top ?k=, default 10) as JSON."""
+        company = query.get('company', [''])[0]
+        try:
+            k = int(query.get('k', [company_index.DEFAULT_TOP_K])[0])
+        except ValueError:
+            self.send_json({'error': 'k must be a number'}, 400)
+            return
+        try:
+            index = company_index.load_index(OUTPUTS)
+        except OSError:
+            self.send_json({'error': 'No company index yet: run analyze.py or '
+                                     '"python company_index.py --build"'}, 404)
+            return
+        except (ValueError, zipfile.BadZipFile) as e:
+            self.send_json({'error': f'Could not read the company index: {e}'}, 503)
+            return
+        try:
+            results = company_index.similar_companies(index, company, k)
+        except KeyError as e:
+            self.send_json({'error': e.args[0]}, 404)
+            return
+        name = index['companies'][company_index.find_company(index, company)]
+        self.send_json({'company': name, 'results': results})
+
+    def send_database_query(self, path: str, query):
+        """
+        /api/group-by: proposals per combination of ?dimensions= (comma-separated),
+        optionally only canonical ones (?unique=1) or one ?company=.
+        /api/sql: the rows of a read-only SQL statement ?q= (at most
+        database.SERVER_QUERY_ROWS, `truncated` if there were more; statements
+        running longer than database.SERVER_QUERY_TIMEOUT are interrupted).
+        """
+        try:
+            connection = database.connect(OUTPUTS)
+        except FileNotFoundError as e:
+            self.send_json({'error': str(e)}, 404)
+            return
+        try:
+            if path == '/api/group-by':
+                dimensions = [d for d in query.get('dimensions', [''])[0].split(',') if d]
+                if not dimensions:
+                    self.send_json({'error': 'dimensions is required'}, 400)
+                    return
+                where = {'company': query['company'][0]} if 'company' in query else None
+                rows = database.group_counts(connection, dimensions, unique=query.get('unique') == ['1'],
+                                             where=where)
+                self.send_json({'columns': dimensions + ['proposals'], 'rows': rows})
+            else:
+                columns, rows, truncated = database.query(connection, query.get('q', [''])[0],
+                                                          limit=database.SERVER_QUERY_ROWS,
+                                                          timeout=database.SERVER_QUERY_TIMEOUT)
+                self.send_json({'columns': columns, 'rows': rows, 'truncated': truncated})
+        except (ValueError, database.sqlite3.Error) as e:
+            self.send_json({'error': str(e)}, 400)
+        finally:
+            connection.close()
+
+    def send_events(self):
+        """
+        Stream outputs/pipeline_events.jsonl as Server-Sent Events: the lines
+        already written, then every new line as analyze.py appends it. A new
+        file means a new run, which is streamed from the start.
+        """
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        identity = None
+        position = 0
+        last_write = time.monotonic()
+        try:
+            while True:
+                try:
+                    stat = EVENTS_FILE.stat()
+                except FileNotFoundError:
+                    stat = None
+                current = (stat.st_dev, stat.st_ino) if stat is not None else None
+                if current != identity or (stat is not None and stat.st_size < position):
+                    identity, position = current, 0
+
+                if stat is not None and stat.st_size > position:
+                    with open(EVENTS_FILE, 'rb') as f:
+                        f.seek(position)
+                        data = f.read(stat.st_size - position)
+                    # Only complete lines; a partial one is sent on the next check
+                    data = data[:data.rfind(b'\n') + 1]
+                    position += len(data)
+                    if data:
+                        self.wfile.write(b''.join(b'data: ' + line + b'\n\n'
+                                                  for line in data.splitlines() if line.strip()))
+                        self.wfile.flush()
+                        last_write = time.monotonic()
+
+                if time.monotonic() - last_write >= KEEPALIVE_INTERVAL:
+                    self.wfile.write(b': keepalive\n\n')
+                    self.wfile.flush()
+                    last_write = time.monotonic()
+                time.sleep(EVENT_POLL_INTERVAL)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # Dashboard closed
+
     def log_message(self, format, *args):
         """Suppress logging for cleaner output (optional)."""
         pass  # Comment this line out if you want to see request logs
@@ -59,7 +240,7 @@ def serve_dashboard(port=None, no_browser=False):
         return 1
 
     # Check if data exists
-    data_file = DIRECTORY / "outputs" / "proposals_with_implementation.json"
+    data_file = output_path("proposals_with_implementation.json", OUTPUTS)
     if not data_file.exists():
         print("⚠️  Warning: proposals_with_implementation.json not found")
         print("   Dashboard may have limited functionality")
@@ -90,10 +271,12 @@ def serve_dashboard(port=None, no_browser=False):
     Handler = MyHTTPRequestHandler
 
     # Allow port reuse to avoid "Address already in use" on restart
-    socketserver.TCPServer.allow_reuse_address = True
+    socketserver.ThreadingTCPServer.allow_reuse_address = True
+    # One thread per request: event streams stay open while files are served
+    socketserver.ThreadingTCPServer.daemon_threads = True
 
     try:
-        with socketserver.TCPServer(("", port), Handler) as httpd:
+        with socketserver.ThreadingTCPServer(("", port), Handler) as httpd:
             url = f"http://localhost:{port}/dashboard.html"
             print(f"\n{'='*80}")
             print(f"🚀 Dashboard Server Running")
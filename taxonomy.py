@@ -0,0 +1,131 @@
+"""
+Versioned taxonomy registry.
+
+Discovery prompts (business use case clusters, iteration shapes) return a
+different list on every run, and labels assigned against one list are not
+comparable with labels assigned against another. Discovered taxonomies are
+therefore stored as immutable versions under outputs/taxonomies/:
+
+    index.json               every version of every kind (number, content hash, source)
+    business_v1.json         the items of one version
+    iteration_shape_v1.json
+
+Classification pins to a version (the latest unless one is chosen with
+--taxonomy KIND=VERSION) and discovery only runs when no version exists yet
+or --rediscover asks for it. Registering a list identical to an existing
+version returns that version instead of adding a new one.
+"""
+
+import hashlib
+import json
+import time
+from typing import List, Dict, Any, Optional
+from utils import load_json, save_json
+
+KINDS = ('business', 'iteration_shape')
+TAXONOMY_DIR = 'taxonomies'  # under OUTPUTS_DIR
+INDEX_FILE = f'{TAXONOMY_DIR}/index.json'
+
+
+def content_hash(items: Any) -> str:
+    """Short hash of a taxonomy's items (independent of key order)."""
+    canonical = json.dumps(items, sort_keys=True, ensure_ascii=False, separators=(',', ':'))
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:12]
+
+
+def list_versions(kind: str) -> List[Dict[str, Any]]:
+    """Registered versions of a taxonomy kind, oldest first."""
+    try:
+        index = load_json(INDEX_FILE)
+    except (OSError, ValueError):
+        return []
+    return index.get(kind, [])
+
+
+def resolve(kind: str, spec: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Find a registered version.
+
+    Args:
+        kind: Taxonomy kind (see KINDS)
+        spec: Version number ('3' or 'v3'), content hash prefix, or
+            None/'latest' for the newest version
+
+    Returns:
+        The index entry, or None if no version of this kind exists and none was requested
+
+    Raises:
+        ValueError: If spec does not match a registered version
+    """
+    versions = list_versions(kind)
+    if spec in (None, 'latest'):
+        return versions[-1] if versions else None
+
+    number = spec[1:] if spec.lower().startswith('v') else spec
+    for entry in versions:
+        if number.isdigit() and entry['version'] == int(number):
+            return entry
+    matches = [entry for entry in versions if entry['hash'].startswith(spec)]
+    if len(matches) == 1:
+        return matches[0]
+    known = ', '.join(f"v{e['version']} ({e['hash']})" for e in versions) or 'none'
+    raise ValueError(f"Unknown {kind} taxonomy version '{spec}' (registered: {known})")
+
+
+def load(kind: str, spec: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Load a registered version (see resolve for spec).
+
+    Returns:
+        The version record (version, hash, created, source, items), or None
+        if no version of this kind exists
+    """
+    entry = resolve(kind, spec)
+    if entry is None:
+        return None
+    return load_json(entry['file'])
+
+
+def register(kind: str, items: List[Any], source: str) -> Dict[str, Any]:
+    """
+    Store a taxonomy as a new version, unless an identical one exists.
+
+    Args:
+        kind: Taxonomy kind (see KINDS)
+        items: The taxonomy (e.g. business use case names)
+        source: How it was obtained (e.g. 'discovery', 'map-reduce discovery')
+
+    Returns:
+        The version record, including its items
+    """
+    digest = content_hash(items)
+    versions = list_versions(kind)
+    for entry in versions:
+        if entry['hash'] == digest:
+            return load_json(entry['file'])
+
+    version = versions[-1]['version'] + 1 if versions else 1
+    entry = {
+        'version': version,
+        'hash': digest,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'source': source,
+        'size': len(items),
+        'file': f'{TAXONOMY_DIR}/{kind}_v{version}.json',
+    }
+    record = {'kind': kind, **entry, 'items': items}
+    save_json(record, entry['file'])
+
+    try:
+        index = load_json(INDEX_FILE)
+    except (OSError, ValueError):
+        index = {}
+    index.setdefault(kind, []).append(entry)
+    save_json(index, INDEX_FILE)
+    print(f"✓ Registered {kind} taxonomy v{version} ({digest}, {len(items)} items)")
+    return record
+
+
+def describe(record: Dict[str, Any]) -> str:
+    """One-line description of a version record."""
+    return f"v{record['version']} ({record['hash']}, {record['source']}, {record['created']})"
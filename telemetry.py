@@ -0,0 +1,201 @@
+"""
+Per-call LLM telemetry.
+
+Every `call_llm` invocation is recorded with its wall time, time to first
+token, token usage, retries, stop reason and the phase/batch it belongs to.
+Records are appended to a JSONL trace file and summarized per phase at the
+end of a run (latency percentiles, throughput, estimated cost, failure rate).
+"""
+
+import json
+import math
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+
+# USD per million tokens: (input, output, cache write, cache read)
+MODEL_PRICING = {
+    'claude-sonnet-4-5': (3.00, 15.00, 3.75, 0.30),
+    'claude-sonnet-4': (3.00, 15.00, 3.75, 0.30),
+    'claude-haiku-4-5': (1.00, 5.00, 1.25, 0.10),
+    'claude-3-5-haiku': (0.80, 4.00, 1.00, 0.08),
+    'claude-opus-4': (15.00, 75.00, 18.75, 1.50),
+}
+
+_lock = threading.Lock()
+_local = threading.local()
+_records: List[Dict[str, Any]] = []
+_trace_path: Optional[Path] = None
+_run_id: Optional[str] = None
+
+
+# ============================================================================
+# Recording
+# ============================================================================
+
+def start_run(trace_path: Optional[Path] = None) -> str:
+    """Start a new telemetry run, appending records to trace_path (JSONL)."""
+    global _trace_path, _run_id
+    if trace_path is not None:
+        Path(trace_path).parent.mkdir(parents=True, exist_ok=True)
+    with _lock:
+        _records.clear()
+        _trace_path = trace_path
+        _run_id = uuid.uuid4().hex[:12]
+    return _run_id
+
+
+@contextmanager
+def context(**fields):
+    """Attach fields (e.g. phase, batch) to every call recorded in this block."""
+    previous = getattr(_local, 'fields', {})
+    _local.fields = {**previous, **fields}
+    try:
+        yield
+    finally:
+        _local.fields = previous
+
+
+def current_context() -> Dict[str, Any]:
+    """Fields attached by the enclosing context() blocks of this thread."""
+    return dict(getattr(_local, 'fields', {}))
+
+
+def estimate_cost(model: str, input_tokens: int, output_tokens: int,
+                  cache_write_tokens: int = 0, cache_read_tokens: int = 0) -> Optional[float]:
+    """Estimated USD cost of a call, or None for models without known pricing."""
+    for prefix, (p_in, p_out, p_write, p_read) in MODEL_PRICING.items():
+        if model.startswith(prefix):
+            return (input_tokens * p_in + output_tokens * p_out +
+                    cache_write_tokens * p_write + cache_read_tokens * p_read) / 1_000_000
+    return None
+
+
+def record_call(model: str, started: float, first_token: Optional[float] = None,
+                message: Any = None, retries: int = 0,
+                error: Optional[BaseException] = None) -> Dict[str, Any]:
+    """
+    Record one LLM call.
+
+    Args:
+        model: Model name
+        started: time.perf_counter() when the call (including retries) started
+        first_token: time.perf_counter() when the first text arrived, if known
+        message: The API response message (for usage and stop reason)
+        retries: Number of retries before the call succeeded or failed
+        error: Exception raised by the call, if it failed
+    """
+    ended = time.perf_counter()
+    usage = getattr(message, 'usage', None)
+
+    record = {
+        'run_id': _run_id,
+        'timestamp': time.time(),
+        **getattr(_local, 'fields', {}),
+        'model': model,
+        'wall_time': round(ended - started, 4),
+        'time_to_first_token': round(first_token - started, 4) if first_token else None,
+        'input_tokens': getattr(usage, 'input_tokens', 0) or 0,
+        'output_tokens': getattr(usage, 'output_tokens', 0) or 0,
+        'cache_write_tokens': getattr(usage, 'cache_creation_input_tokens', 0) or 0,
+        'cache_read_tokens': getattr(usage, 'cache_read_input_tokens', 0) or 0,
+        'retries': retries,
+        'stop_reason': getattr(message, 'stop_reason', None),
+        'status': 'error' if error is not None else 'ok',
+        'error': f"{type(error).__name__}: {str(error)[:200]}" if error is not None else None,
+    }
+    record['cost'] = estimate_cost(model, record['input_tokens'], record['output_tokens'],
+                                   record['cache_write_tokens'], record['cache_read_tokens'])
+
+    with _lock:
+        _records.append(record)
+        if _trace_path is not None:
+            with open(_trace_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(record) + '\n')
+
+    return record
+
+
+def get_records() -> List[Dict[str, Any]]:
+    """Records of the current run."""
+    with _lock:
+        return list(_records)
+
+
+# ============================================================================
+# Summary
+# ============================================================================
+
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of a list of values."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(records: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Dict[str, Any]]:
+    """Per-phase statistics over telemetry records (defaults to the current run)."""
+    if records is None:
+        records = get_records()
+
+    by_phase = defaultdict(list)
+    for r in records:
+        by_phase[r.get('phase') or 'other'].append(r)
+
+    summary = {}
+    for phase, rows in by_phase.items():
+        ok = [r for r in rows if r['status'] == 'ok']
+        latencies = [r['wall_time'] for r in ok]
+        ttfts = [r['time_to_first_token'] for r in ok if r['time_to_first_token'] is not None]
+        output_tokens = sum(r['output_tokens'] for r in ok)
+        costs = [r['cost'] for r in rows if r['cost'] is not None]
+
+        summary[phase] = {
+            'calls': len(rows),
+            'failures': len(rows) - len(ok),
+            'failure_rate': (len(rows) - len(ok)) / len(rows),
+            'retries': sum(r['retries'] for r in rows),
+            'p50_latency': percentile(latencies, 50),
+            'p95_latency': percentile(latencies, 95),
+            'p50_ttft': percentile(ttfts, 50),
+            'input_tokens': sum(r['input_tokens'] for r in rows),
+            'output_tokens': output_tokens,
+            'cached_tokens': sum(r['cache_read_tokens'] for r in rows),
+            'tokens_per_sec': output_tokens / sum(latencies) if latencies and sum(latencies) else None,
+            'estimated_cost': sum(costs) if costs else None,
+            'max_tokens_stops': sum(1 for r in ok if r['stop_reason'] == 'max_tokens'),
+        }
+
+    return summary
+
+
+def print_summary(summary: Optional[Dict[str, Dict[str, Any]]] = None):
+    """Print a per-phase telemetry table."""
+    if summary is None:
+        summary = summarize()
+    if not summary:
+        return
+
+    def fmt(value, spec):
+        return format(value, spec) if value is not None else '-'
+
+    print("\nLLM CALL TELEMETRY")
+    print("-" * 100)
+    print(f"  {'Phase':30s} {'Calls':>6s} {'Fail%':>6s} {'Retry':>6s} {'p50 s':>7s} {'p95 s':>7s} "
+          f"{'TTFT s':>7s} {'In tok':>9s} {'Out tok':>9s} {'tok/s':>7s} {'Cost $':>8s}")
+    for phase, s in summary.items():
+        print(f"  {phase[:30]:30s} {s['calls']:6d} {s['failure_rate'] * 100:6.1f} {s['retries']:6d} "
+              f"{fmt(s['p50_latency'], '7.2f')} {fmt(s['p95_latency'], '7.2f')} {fmt(s['p50_ttft'], '7.2f')} "
+              f"{s['input_tokens']:9d} {s['output_tokens']:9d} {fmt(s['tokens_per_sec'], '7.1f')} "
+              f"{fmt(s['estimated_cost'], '8.3f')}")
+
+    total_cost = [s['estimated_cost'] for s in summary.values() if s['estimated_cost'] is not None]
+    if total_cost:
+        print(f"\n  Estimated total cost: ${sum(total_cost):.2f}")
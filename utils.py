@@ -1,112 +1,345 @@
 """
 Core utilities for AI system proposal analysis.
 Provides common functions for API calls, file I/O, and data processing.
+
+Importing this module is cheap and has no side effects: the Anthropic SDK,
+Jinja2 and python-dotenv are imported on first use, and output directories
+are created when something is written to them.
 """
 
 import json
 import csv
 import os
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Dict, Any, Optional
-import anthropic
-from jinja2 import Environment, FileSystemLoader
+from collections.abc import Mapping
+from typing import List, Dict, Any, Optional, Callable, Tuple, Iterator, Iterable, Sequence
+import telemetry
+from llm_backends import AnthropicBackend, StubBackend, BackendError
+import compression
 
 
 # ============================================================================
 # Configuration
 # ============================================================================
 
-# Try loading .env file if it exists (fallback for API key)
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass  # python-dotenv not installed, use env vars only
-
-API_KEY = os.environ.get('ANTHROPIC_API_KEY')
 MODEL = "claude-sonnet-4-5-20250929"
+FAST_MODEL = "claude-haiku-4-5-20251001"
 MAX_TOKENS = 8192
 
+# Default model tiers of a classification cascade (cheapest first, see --cascade)
+CASCADE_MODELS = [FAST_MODEL, MODEL]
+
+# Status codes retried with exponential backoff (server errors, rate limits, overload)
+RETRYABLE_STATUS_CODES = {429, 500, 529}
+RETRY_BASE_DELAY = 1.0  # seconds; doubles on every attempt
+
 # Directories
 BASE_DIR = Path(__file__).parent
 PROMPTS_DIR = BASE_DIR / "prompts"
 OUTPUTS_DIR = BASE_DIR / "outputs"
 VIZ_DIR = BASE_DIR / "visualizations"
 
+# Per-call LLM telemetry (JSONL, one record per call)
+TRACE_FILE = OUTPUTS_DIR / "llm_trace.jsonl"
+
+# Live progress events streamed to the dashboard (JSONL, see events.py)
+EVENTS_FILE = OUTPUTS_DIR / "pipeline_events.jsonl"
+
 # Data directory (button-data repo with company proposals)
 # Default: sibling directory ../button-data
-# Override with BUTTON_DATA_PATH environment variable
+# Override with BUTTON_DATA_PATH environment variable (or in .env)
 DATA_REPO_PATH = os.environ.get('BUTTON_DATA_PATH', str(BASE_DIR.parent / 'button-data'))
 DEFAULT_COMPANIES_DIR = Path(DATA_REPO_PATH) / "companies"
 
-# Ensure directories exist
-OUTPUTS_DIR.mkdir(exist_ok=True)
-VIZ_DIR.mkdir(exist_ok=True)
+_env_loaded = False
+
+
+def load_env():
+    """
+    Load the .env file (once), if python-dotenv is installed.
+
+    Called before the API key or data directory is needed, so settings in
+    .env apply without importing dotenv for every script.
+    """
+    global _env_loaded, DATA_REPO_PATH, DEFAULT_COMPANIES_DIR
+    if _env_loaded:
+        return
+    _env_loaded = True
+
+    try:
+        from dotenv import load_dotenv
+        load_dotenv()
+    except ImportError:
+        return  # python-dotenv not installed, use env vars only
+
+    DATA_REPO_PATH = os.environ.get('BUTTON_DATA_PATH', DATA_REPO_PATH)
+    DEFAULT_COMPANIES_DIR = Path(DATA_REPO_PATH) / "companies"
+
+
+def get_api_key() -> Optional[str]:
+    """The Anthropic API key from the environment or .env."""
+    load_env()
+    return os.environ.get('ANTHROPIC_API_KEY')
+
+
+def __getattr__(name):
+    # utils.API_KEY is resolved on access so .env is only read when needed
+    if name == 'API_KEY':
+        return get_api_key()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ============================================================================
 # Jinja2 Template Loading
 # ============================================================================
 
-jinja_env = Environment(loader=FileSystemLoader(str(PROMPTS_DIR)))
+_jinja_env = None
+
+
+def get_jinja_env():
+    """The Jinja2 environment for prompts/ (created on first use)."""
+    global _jinja_env
+    if _jinja_env is None:
+        from jinja2 import Environment, FileSystemLoader
+        _jinja_env = Environment(loader=FileSystemLoader(str(PROMPTS_DIR)))
+        _jinja_env.filters['fit'] = compression.fit
+    return _jinja_env
 
 
 def render_prompt(template_name: str, **kwargs) -> str:
     """Render a Jinja2 prompt template."""
-    template = jinja_env.get_template(template_name)
+    template = get_jinja_env().get_template(template_name)
     return template.render(**kwargs)
 
 
+# ============================================================================
+# LLM Backend
+# ============================================================================
+
+_backend = None
+
+
+def set_backend(backend):
+    """Use a backend (see llm_backends.py) for all subsequent LLM calls."""
+    global _backend
+    _backend = backend
+
+
+def get_backend():
+    """The current LLM backend (the Anthropic API unless another was set)."""
+    global _backend
+    if _backend is None:
+        _backend = AnthropicBackend(api_key=get_api_key())
+    return _backend
+
+
+def create_backend(name: str, **options):
+    """
+    Create a backend by name.
+
+    Args:
+        name: 'anthropic' or 'stub'
+        **options: Backend options (e.g. latency_median, error_rate for the stub)
+    """
+    if name == 'anthropic':
+        return AnthropicBackend(api_key=get_api_key())
+    if name == 'stub':
+        return StubBackend(**options)
+    raise ValueError(f"Unknown LLM backend: {name}")
+
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    """Seconds to wait before retrying: the server's retry-after hint or exponential backoff."""
+    retry_after = getattr(error, 'retry_after', None)
+    response = getattr(error, 'response', None)
+    if retry_after is None and response is not None:
+        try:
+            retry_after = float(response.headers.get('retry-after'))
+        except (TypeError, ValueError):
+            pass
+    if retry_after is not None:
+        return retry_after
+    return RETRY_BASE_DELAY * 2 ** attempt
+
+
 # ============================================================================
 # LLM API Calls
 # ============================================================================
 
-def call_llm(prompt: str, max_tokens: int = MAX_TOKENS, max_retries: int = 3) -> str:
+def _create_message(prompt: str, max_tokens: int, max_retries: int,
+                    make_text_handler: Optional[Callable[[], Callable[[str], None]]] = None,
+                    tool: Optional[Dict[str, Any]] = None, model: Optional[str] = None):
     """
-    Call Claude API with a prompt and automatic retry on transient errors.
+    Stream one message from the current backend with retry and telemetry.
 
     Args:
         prompt: The prompt to send to the API
         max_tokens: Maximum tokens in response
-        max_retries: Maximum number of retry attempts for 500 errors (default: 3)
+        max_retries: Maximum number of attempts (retrying 429/500/529 errors)
+        make_text_handler: Optional factory called at the start of every attempt;
+            the handler it returns receives each streamed text chunk (or, when
+            a tool is forced, each chunk of the tool input JSON)
+        tool: Optional tool definition the model is forced to call
+        model: Model to call (default: MODEL)
 
     Returns:
-        The API response text
-
-    Raises:
-        anthropic.APIError: If all retries are exhausted or non-retryable error
+        The final API message
     """
-    client = anthropic.Anthropic(api_key=API_KEY)
+    import anthropic  # Only for its error types; deferred to keep imports cheap
+
+    backend = get_backend()
+    model = model or MODEL
+    started = time.perf_counter()
+
+    request = {
+        'model': model,
+        'max_tokens': max_tokens,
+        'messages': [{"role": "user", "content": prompt}],
+    }
+    if tool is not None:
+        request['tools'] = [tool]
+        request['tool_choice'] = {'type': 'tool', 'name': tool['name']}
 
     for attempt in range(max_retries):
+        first_token = None
+        on_text = make_text_handler() if make_text_handler else None
         try:
-            message = client.messages.create(
-                model=MODEL,
-                max_tokens=max_tokens,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            return message.content[0].text
-
-        except anthropic.APIStatusError as e:
-            # Retry on 500 errors (server-side issues)
-            if e.status_code == 500 and attempt < max_retries - 1:
-                wait_time = 2 ** attempt  # Exponential backoff: 1s, 2s, 4s
-                print(f"⚠️  API 500 error, retrying in {wait_time}s... (attempt {attempt + 1}/{max_retries})")
+            with backend.stream(**request) as stream:
+                for event in stream:
+                    if event.type == 'text':
+                        chunk = event.text
+                    elif event.type == 'input_json':
+                        chunk = event.partial_json
+                    else:
+                        continue
+                    if first_token is None:
+                        first_token = time.perf_counter()
+                    if on_text is not None:
+                        on_text(chunk)
+                message = stream.get_final_message()
+
+            telemetry.record_call(model, started, first_token, message=message, retries=attempt)
+            return message
+
+        except (anthropic.APIStatusError, BackendError) as e:
+            # Retry on server errors, rate limits and overload
+            if e.status_code in RETRYABLE_STATUS_CODES and attempt < max_retries - 1:
+                wait_time = _retry_delay(e, attempt)  # Exponential backoff: 1s, 2s, 4s
+                print(f"⚠️  API {e.status_code} error, retrying in {wait_time:g}s... "
+                      f"(attempt {attempt + 1}/{max_retries})")
                 time.sleep(wait_time)
                 continue
             # Re-raise if not retryable or out of retries
+            telemetry.record_call(model, started, first_token, retries=attempt, error=e)
             raise
         except anthropic.APIError as e:
-            # Don't retry other API errors (rate limits, auth, etc.)
+            # Don't retry other API errors (auth, bad requests, connection, etc.)
+            telemetry.record_call(model, started, first_token, retries=attempt, error=e)
             raise
 
 
+def call_llm(prompt: str, max_tokens: int = MAX_TOKENS, max_retries: int = 3,
+             model: Optional[str] = None) -> str:
+    """
+    Call Claude API with a prompt and automatic retry on transient errors.
+
+    The response is streamed so time to first token can be measured; every
+    call is recorded in the telemetry trace (see telemetry.py). Calls go to
+    the backend selected with set_backend() (the Anthropic API by default).
+
+    Args:
+        prompt: The prompt to send to the API
+        max_tokens: Maximum tokens in response
+        max_retries: Maximum number of retry attempts for 429/500/529 errors (default: 3)
+        model: Model to call (default: MODEL)
+
+    Returns:
+        The API response text
+
+    Raises:
+        anthropic.APIError (or BackendError): If all retries are exhausted or non-retryable error
+    """
+    message = _create_message(prompt, max_tokens, max_retries, model=model)
+    return message.content[0].text
+
+
+def call_llm_tool(prompt: str, tool: Dict[str, Any], max_tokens: int = MAX_TOKENS,
+                  max_retries: int = 3, model: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Call Claude API forcing it to answer through a tool (structured output).
+
+    Args:
+        prompt: The prompt to send to the API
+        tool: Tool definition with the JSON schema of the expected answer
+        max_tokens: Maximum tokens in response
+        max_retries: Maximum number of retry attempts for 429/500/529 errors (default: 3)
+        model: Model to call (default: MODEL)
+
+    Returns:
+        The tool input (a dict matching the tool's input schema), or {} if
+        the response was cut off before the tool call
+
+    Raises:
+        anthropic.APIError (or BackendError): If all retries are exhausted or non-retryable error
+    """
+    message = _create_message(prompt, max_tokens, max_retries, tool=tool, model=model)
+    for block in message.content:
+        if block.type == 'tool_use':
+            return block.input
+    return {}
+
+
+def call_llm_stream(prompt: str, on_item: Callable[[Any], None],
+                    max_tokens: int = MAX_TOKENS, max_retries: int = 3,
+                    tool: Optional[Dict[str, Any]] = None,
+                    model: Optional[str] = None) -> Tuple[List[Any], Optional[str]]:
+    """
+    Call Claude API and hand over each element of the JSON array response as
+    soon as it is complete.
+
+    If an attempt is retried, its elements are delivered again, so on_item
+    should be idempotent.
+
+    Args:
+        prompt: The prompt to send to the API (asking for a JSON array)
+        on_item: Called with each completed array element
+        max_tokens: Maximum tokens in response
+        max_retries: Maximum number of retry attempts for 429/500/529 errors (default: 3)
+        tool: Optional tool to force; its input's first array is streamed instead
+        model: Model to call (default: MODEL)
+
+    Returns:
+        (items, stop_reason) - stop_reason is 'max_tokens' if the response was truncated
+
+    Raises:
+        anthropic.APIError (or BackendError): If all retries are exhausted or non-retryable error
+    """
+    items = []
+
+    def make_text_handler():
+        parser = IncrementalJSONArrayParser()
+        items.clear()
+
+        def on_text(text):
+            for item in parser.feed(text):
+                items.append(item)
+                on_item(item)
+
+        return on_text
+
+    message = _create_message(prompt, max_tokens, max_retries, make_text_handler, tool=tool, model=model)
+    return items, message.stop_reason
+
+
 def call_llm_batch(prompts: List[str], max_tokens: int = MAX_TOKENS,
                    show_progress: bool = True, max_retries: int = 3) -> List[str]:
     """
     Call Claude API with multiple prompts in sequence.
-    Automatically retries on 500 errors with exponential backoff.
+    Automatically retries on 429/500/529 errors with exponential backoff.
     """
     responses = []
 
@@ -115,7 +348,8 @@ def call_llm_batch(prompts: List[str], max_tokens: int = MAX_TOKENS,
             print(f"  Processing batch {i+1}/{len(prompts)}...", end=' ', flush=True)
 
         try:
-            response = call_llm(prompt, max_tokens=max_tokens, max_retries=max_retries)
+            with telemetry.context(batch=i + 1):
+                response = call_llm(prompt, max_tokens=max_tokens, max_retries=max_retries)
             responses.append(response)
             if show_progress:
                 print("✓")
@@ -127,36 +361,64 @@ def call_llm_batch(prompts: List[str], max_tokens: int = MAX_TOKENS,
     return responses
 
 
+def call_llm_parallel(prompts: List[Any], max_tokens: int = MAX_TOKENS,
+                      max_workers: int = 4, max_retries: int = 3) -> List[Optional[str]]:
+    """
+    Call Claude API with multiple prompts concurrently.
+
+    A prompt may also be a function returning the prompt; it is rendered
+    only when its call starts, so large prompt sets are never all held in
+    memory at once.
+
+    Returns responses in prompt order (None for prompts that failed). Each
+    call is recorded in telemetry with the caller's context and its
+    1-based position as batch id.
+    """
+    fields = telemetry.current_context()
+
+    def call(i, prompt):
+        try:
+            if callable(prompt):
+                prompt = prompt()
+            with telemetry.context(**fields, batch=i + 1):
+                return call_llm(prompt, max_tokens=max_tokens, max_retries=max_retries)
+        except Exception as e:
+            print(f"  ✗ Call {i + 1}/{len(prompts)} failed ({str(e)[:40]})")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers),
+                            thread_name_prefix=fields.get('phase', 'llm')) as pool:
+        return list(pool.map(call, range(len(prompts)), prompts))
+
+
 # ============================================================================
 # Data Extraction from Companies
 # ============================================================================
 
-def extract_proposals_from_companies(
-    companies_dir: Optional[Path] = None,
-    text_limits: Optional[Dict[str, int]] = None
-) -> List[Dict[str, Any]]:
+DEFAULT_TEXT_LIMITS = {
+    'current_state': 2000,
+    'problems': 1500,
+    'impact': 1500,
+    'existing_tooling': 1000,
+    'functionality': 2000,
+    'problem_solving': 1000,
+    'risk_assessment': 1000
+}
+
+
+def company_proposal_files(companies_dir: Optional[Path] = None) -> Dict[str, Path]:
     """
-    Extract all proposals from company directories.
+    Proposal file of every company, preferring refined proposals.
 
     Args:
         companies_dir: Path to companies directory (defaults to DEFAULT_COMPANIES_DIR)
-        text_limits: Optional dict specifying character limits for each field
 
     Returns:
-        List of proposal dictionaries
+        Dict of company name -> proposals file, sorted by file path
     """
     if companies_dir is None:
+        load_env()
         companies_dir = DEFAULT_COMPANIES_DIR
-    if text_limits is None:
-        text_limits = {
-            'current_state': 2000,
-            'problems': 1500,
-            'impact': 1500,
-            'existing_tooling': 1000,
-            'functionality': 2000,
-            'problem_solving': 1000,
-            'risk_assessment': 1000
-        }
 
     # Try refined proposals first, fallback to original proposals
     refined_files = sorted(companies_dir.glob("*/self-refinement/refined_proposals.json"))
@@ -171,46 +433,70 @@ def extract_proposals_from_companies(
         company = f.parent.parent.name
         proposal_files_map[company] = f  # Override with refined version
 
-    proposal_files = sorted(proposal_files_map.values())
-    all_proposals = []
+    return dict(sorted(proposal_files_map.items(), key=lambda item: item[1]))
 
-    refined_count = len(refined_files)
-    original_count = len(proposal_files) - refined_count
-    print(f"Found {len(proposal_files)} companies with proposals ({refined_count} refined, {original_count} original)")
 
-    for proposal_file in proposal_files:
-        company_name = proposal_file.parent.parent.name
+def extract_company_proposals(company_name: str, proposal_file: Path,
+                              text_limits: Optional[Dict[str, int]] = None) -> List[Dict[str, Any]]:
+    """Extract the proposals of one company from its proposals file."""
+    if text_limits is None:
+        text_limits = DEFAULT_TEXT_LIMITS
+
+    with open(proposal_file, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    company_proposals = []
+    for proposal in data.get('proposals', []):
+        proposal_entry = {
+            'company': company_name,
+            'proposal_name': proposal.get('Proposal Name', ''),
+            'current_state': proposal.get('Current State Understanding', '')[:text_limits['current_state']],
+            'problems': proposal.get('Problems Identified', '')[:text_limits['problems']],
+            'impact': proposal.get('Impact Analysis', '')[:text_limits['impact']],
+            'target_persona': proposal.get('Target Persona', ''),
+            'existing_tooling': proposal.get('Existing Tooling', '')[:text_limits['existing_tooling']],
+        }
 
-        try:
-            with open(proposal_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-            proposals = data.get('proposals', [])
-
-            for proposal in proposals:
-                proposal_entry = {
-                    'company': company_name,
-                    'proposal_name': proposal.get('Proposal Name', ''),
-                    'current_state': proposal.get('Current State Understanding', '')[:text_limits['current_state']],
-                    'problems': proposal.get('Problems Identified', '')[:text_limits['problems']],
-                    'impact': proposal.get('Impact Analysis', '')[:text_limits['impact']],
-                    'target_persona': proposal.get('Target Persona', ''),
-                    'existing_tooling': proposal.get('Existing Tooling', '')[:text_limits['existing_tooling']],
-                }
-
-                # Extract proposed system functionality
-                proposed_system = proposal.get('Proposed System', {})
-                if isinstance(proposed_system, dict):
-                    proposal_entry['functionality'] = proposed_system.get('Functionality', '')[:text_limits['functionality']]
-                    proposal_entry['problem_solving'] = proposed_system.get('Problem Solving', '')[:text_limits['problem_solving']]
-                    proposal_entry['risk_assessment'] = proposed_system.get('Risk Assessment', '')[:text_limits['risk_assessment']]
-                else:
-                    proposal_entry['functionality'] = ''
-                    proposal_entry['problem_solving'] = ''
-                    proposal_entry['risk_assessment'] = ''
+        # Extract proposed system functionality
+        proposed_system = proposal.get('Proposed System', {})
+        if isinstance(proposed_system, dict):
+            proposal_entry['functionality'] = proposed_system.get('Functionality', '')[:text_limits['functionality']]
+            proposal_entry['problem_solving'] = proposed_system.get('Problem Solving', '')[:text_limits['problem_solving']]
+            proposal_entry['risk_assessment'] = proposed_system.get('Risk Assessment', '')[:text_limits['risk_assessment']]
+        else:
+            proposal_entry['functionality'] = ''
+            proposal_entry['problem_solving'] = ''
+            proposal_entry['risk_assessment'] = ''
+
+        company_proposals.append(proposal_entry)
+
+    return company_proposals
+
+
+def extract_proposals_from_companies(
+    companies_dir: Optional[Path] = None,
+    text_limits: Optional[Dict[str, int]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Extract all proposals from company directories.
+
+    Args:
+        companies_dir: Path to companies directory (defaults to DEFAULT_COMPANIES_DIR)
+        text_limits: Optional dict specifying character limits for each field
+
+    Returns:
+        List of proposal dictionaries
+    """
+    proposal_files_map = company_proposal_files(companies_dir)
+    all_proposals = []
 
-                all_proposals.append(proposal_entry)
+    refined_count = sum(1 for f in proposal_files_map.values() if f.parent.name == 'self-refinement')
+    original_count = len(proposal_files_map) - refined_count
+    print(f"Found {len(proposal_files_map)} companies with proposals ({refined_count} refined, {original_count} original)")
 
+    for company_name, proposal_file in proposal_files_map.items():
+        try:
+            all_proposals.extend(extract_company_proposals(company_name, proposal_file, text_limits))
         except Exception as e:
             print(f"Error processing {company_name}: {e}")
             continue
@@ -219,6 +505,11 @@ def extract_proposals_from_companies(
     return all_proposals
 
 
+def proposal_key(proposal: Dict[str, Any]) -> str:
+    """Human-readable identifier of a proposal ("company: proposal name")."""
+    return f"{proposal['company']}: {proposal['proposal_name']}"
+
+
 # ============================================================================
 # JSON Parsing from LLM Responses
 # ============================================================================
@@ -251,42 +542,282 @@ def extract_json_from_response(response: str) -> Optional[Any]:
         return None
 
 
+class IncrementalJSONArrayParser:
+    """
+    Incrementally parse the first JSON array in a stream of text.
+
+    feed() returns the array elements (objects, arrays or strings) completed
+    by each chunk, so a response cut off mid-way still yields every element
+    that was fully written.
+    """
+
+    def __init__(self):
+        self.buffer = ''
+        self.pos = 0
+        self.in_array = False
+        self.done = False
+        self.depth = 0          # Nesting depth inside the top-level array
+        self.in_string = False
+        self.escape = False
+        self.item_start = None
+
+    def _emit(self, end: int, completed: List[Any]):
+        try:
+            completed.append(json.loads(self.buffer[self.item_start:end]))
+        except ValueError:
+            pass  # Skip malformed elements, keep parsing the rest
+        self.item_start = None
+
+    def feed(self, chunk: str) -> List[Any]:
+        """Add text and return the array elements completed by it."""
+        self.buffer += chunk
+        completed = []
+
+        while self.pos < len(self.buffer) and not self.done:
+            ch = self.buffer[self.pos]
+
+            if not self.in_array:
+                self.in_array = ch == '['
+            elif self.in_string:
+                if self.escape:
+                    self.escape = False
+                elif ch == '\\':
+                    self.escape = True
+                elif ch == '"':
+                    self.in_string = False
+                    if self.depth == 0:
+                        self._emit(self.pos + 1, completed)
+            elif ch == '"':
+                self.in_string = True
+                if self.depth == 0:
+                    self.item_start = self.pos
+            elif ch in '{[':
+                if self.depth == 0:
+                    self.item_start = self.pos
+                self.depth += 1
+            elif ch in '}]':
+                if self.depth == 0:
+                    self.done = True  # End of the top-level array
+                else:
+                    self.depth -= 1
+                    if self.depth == 0:
+                        self._emit(self.pos + 1, completed)
+
+            self.pos += 1
+
+        return completed
+
+
+def parse_json_array_items(response: str) -> List[Any]:
+    """Return every complete element of the first JSON array in a (possibly truncated) response."""
+    return IncrementalJSONArrayParser().feed(response)
+
+
 # ============================================================================
 # File I/O
 # ============================================================================
 
-def save_json(data: Any, filename: str, directory: Path = OUTPUTS_DIR):
-    """Save data as JSON."""
-    filepath = directory / filename
-    with open(filepath, 'w', encoding='utf-8') as f:
-        json.dump(data, f, indent=2)
+# Format of the per-phase proposal files written by save_proposals():
+# 'json' (one JSON array) or 'jsonl' (one record per line)
+PROPOSALS_FORMAT = 'json'
+
+
+def set_proposals_format(fmt: str):
+    """Write proposal files as 'json' or 'jsonl' from now on."""
+    global PROPOSALS_FORMAT
+    if fmt not in ('json', 'jsonl'):
+        raise ValueError(f"Unknown proposals format: {fmt}")
+    PROPOSALS_FORMAT = fmt
+
+
+@contextmanager
+def atomic_write(filepath: Path, newline: Optional[str] = None):
+    """
+    Open a file for writing so it is replaced atomically.
+
+    Writes go to a temporary file in the same directory, which is fsynced
+    and renamed over filepath when the block finishes. Readers see either
+    the old or the new file, and an error (or crash) mid-write leaves the
+    old file untouched.
+    """
+    filepath = Path(filepath)
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=filepath.parent, prefix=f'.{filepath.name}.', suffix='.tmp')
+    try:
+        with open(fd, 'w', encoding='utf-8', newline=newline) as f:
+            yield f
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def output_path(filename: str, directory: Optional[Path] = None) -> Path:
+    """
+    Path of an output file to read.
+
+    For X.json, returns X.jsonl instead if only that exists or it is newer
+    (written with PROPOSALS_FORMAT = 'jsonl'), so readers accept either format.
+    """
+    filepath = (directory or OUTPUTS_DIR) / filename
+    if filepath.suffix == '.json':
+        jsonl = filepath.with_suffix('.jsonl')
+        if jsonl.exists() and (not filepath.exists()
+                               or jsonl.stat().st_mtime >= filepath.stat().st_mtime):
+            return jsonl
+    return filepath
+
+
+def save_json(data: Any, filename: str, directory: Optional[Path] = None):
+    """Save data as JSON (in OUTPUTS_DIR unless a directory is given), atomically."""
+    filepath = (directory or OUTPUTS_DIR) / filename
+    with atomic_write(filepath) as f:
+        json.dump(data, f, indent=2, default=_json_default)
+    print(f"✓ Saved {filepath}")
+
+
+def save_jsonl(records: Iterable[Any], filename: str, directory: Optional[Path] = None):
+    """Save records as JSON Lines (one record per line), streamed and atomic."""
+    filepath = (directory or OUTPUTS_DIR) / filename
+    with atomic_write(filepath) as f:
+        for record in records:
+            f.write(json.dumps(record, default=_json_default))
+            f.write('\n')
     print(f"✓ Saved {filepath}")
 
 
-def load_json(filename: str, directory: Path = OUTPUTS_DIR) -> Any:
-    """Load data from JSON."""
-    filepath = directory / filename
+def _json_default(obj: Any) -> Any:
+    """Serialize dict-like records (see records.Proposal) as JSON objects."""
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def load_json(filename: str, directory: Optional[Path] = None) -> Any:
+    """
+    Load data from JSON (in OUTPUTS_DIR unless a directory is given).
+
+    A JSON Lines file (X.jsonl, or X.jsonl in place of X.json, see
+    output_path) is loaded as a list of records.
+    """
+    filepath = output_path(filename, directory)
+    if filepath.suffix == '.jsonl':
+        return list(_iter_jsonl(filepath))
     with open(filepath, 'r', encoding='utf-8') as f:
         return json.load(f)
 
 
-def save_csv(data: List[Dict[str, Any]], filename: str, directory: Path = OUTPUTS_DIR):
-    """Save data as CSV."""
-    if not data:
-        print(f"No data to save to {filename}")
+def _iter_jsonl(filepath: Path) -> Iterator[Any]:
+    with open(filepath, 'r', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_json_array(filename: str, directory: Optional[Path] = None,
+                    chunk_size: int = 1 << 20) -> Iterator[Any]:
+    """
+    Yield the elements of a JSON array file (or the records of a JSON Lines
+    file, see output_path) one at a time.
+
+    Unlike load_json, the file is read in chunks and never held in memory
+    as a whole, so callers can convert each element (e.g. to a compact
+    record) before the next one is parsed.
+    """
+    filepath = output_path(filename, directory)
+    if filepath.suffix == '.jsonl':
+        yield from _iter_jsonl(filepath)
         return
 
-    filepath = directory / filename
-    fieldnames = data[0].keys()
+    decoder = json.JSONDecoder()
+    buffer = ''
+    pos = 0
+    started = False
+
+    with open(filepath, 'r', encoding='utf-8') as f:
+        eof = False
+        while True:
+            # Skip whitespace, the opening bracket and separators
+            while pos < len(buffer) and (buffer[pos].isspace() or buffer[pos] == ','
+                                         or (buffer[pos] == '[' and not started)):
+                started = started or buffer[pos] == '['
+                pos += 1
+            if pos < len(buffer) and buffer[pos] == ']':
+                return
+
+            try:
+                if pos >= len(buffer):
+                    raise ValueError("need more data")
+                item, end = decoder.raw_decode(buffer, pos)
+            except ValueError:
+                if eof:
+                    if buffer[pos:].strip():
+                        raise ValueError(f"Truncated JSON array in {filepath}")
+                    return
+                chunk = f.read(chunk_size)
+                eof = not chunk
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                continue
+
+            yield item
+            pos = end
 
-    with open(filepath, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
+
+def table_columns(rows: Iterable[Mapping]) -> List[str]:
+    """Every key of the rows, in first-seen order."""
+    columns = {}
+    for row in rows:
+        for key in row:
+            if key not in columns:
+                columns[key] = None
+    return list(columns)
+
+
+def save_csv(data: Iterable[Dict[str, Any]], filename: str, directory: Optional[Path] = None,
+             fieldnames: Optional[Sequence[str]] = None):
+    """
+    Save data as CSV, streamed and atomic.
+
+    Args:
+        data: Rows (any iterable if fieldnames is given, else a list)
+        filename: File name (in OUTPUTS_DIR unless a directory is given)
+        directory: Output directory
+        fieldnames: Declared columns (default: every key of the rows, in
+            first-seen order); missing values are written empty
+    """
+    if fieldnames is None:
+        if not data:
+            print(f"No data to save to {filename}")
+            return
+        fieldnames = table_columns(data)
+
+    filepath = (directory or OUTPUTS_DIR) / filename
+    with atomic_write(filepath, newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(fieldnames), restval='')
         writer.writeheader()
+        # Rows are converted and written one at a time
         writer.writerows(data)
 
     print(f"✓ Saved {filepath}")
 
 
+def save_proposals(proposals: List[Dict[str, Any]], name: str, directory: Optional[Path] = None,
+                   fieldnames: Optional[Sequence[str]] = None):
+    """Save proposals as <name>.json (or .jsonl, see PROPOSALS_FORMAT) and <name>.csv (see save_csv)."""
+    if PROPOSALS_FORMAT == 'jsonl':
+        save_jsonl(proposals, f'{name}.jsonl', directory)
+    else:
+        save_json(proposals, f'{name}.json', directory)
+    save_csv(proposals, f'{name}.csv', directory, fieldnames=fieldnames)
+
+
 # ============================================================================
 # Batching
 # ============================================================================
@@ -348,7 +879,8 @@ def validate_environment(require_api_key: bool = True) -> bool:
     warnings = []
 
     # Check API key (only if required)
-    if require_api_key and not API_KEY:
+    load_env()
+    if require_api_key and not get_api_key():
         errors.append("❌ ANTHROPIC_API_KEY not found")
         errors.append("   Set it with: export ANTHROPIC_API_KEY='your-key-here'")
         errors.append("   Or create a .env file with: ANTHROPIC_API_KEY=your-key-here")
@@ -409,6 +941,10 @@ def validate_environment(require_api_key: bool = True) -> bool:
 # Summary Generation
 # ============================================================================
 
+# Columns of the rows returned by generate_cluster_summary
+CLUSTER_SUMMARY_COLUMNS = ['cluster', 'count', 'percentage', 'num_companies', 'companies', 'example_proposals']
+
+
 def generate_cluster_summary(proposals: List[Dict[str, Any]],
                             cluster_field: str = 'system_type') -> List[Dict[str, Any]]:
     """Generate summary statistics for clusters."""
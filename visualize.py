@@ -6,44 +6,63 @@ This script creates interactive HTML visualizations:
 - Dashboard overview
 - Business use case treemap
 - Architecture pattern sunburst
-- Network graph of relationships
+- Co-occurrence networks (business use cases or any other dimension)
 - Heatmaps
 - Distribution charts
+- Proposal explorer (WebGL scatter of every proposal)
 
 Usage:
     python visualize.py                # Generate all visualizations
     python visualize.py --only dashboard  # Generate only dashboard
+    python visualize.py --only network --network-dimension architecture_pattern  # Another network
+    python visualize.py --profile sample  # Also write a profile to outputs/profile/
 """
 
 import argparse
+import base64
+import json
 import math
 from collections import Counter, defaultdict
 import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-import pandas as pd
 from utils import *
+from records import to_records, encode_dimension, field_values, split_values, CLASSIFICATION_DIMENSIONS
+import profiling
+
+# pandas, plotly.express and plotly.subplots are imported inside the
+# functions that use them: together they take most of a second to import,
+# which `--only heatmap` or `--only network` never need.
 
 
 # ============================================================================
-# Load Data
+# Load and Save
 # ============================================================================
 
 def load_proposals() -> List[Dict[str, Any]]:
-    """Load complete proposals with all classifications."""
+    """
+    Load complete proposals with all classifications (as compact records,
+    without text) from proposals_complete.json or .jsonl, whichever is newer.
+    """
     try:
-        return load_json('proposals_complete.json')
+        return to_records(iter_json_array('proposals_complete.json'), keep_text=False)
     except:
         print("Error: proposals_complete.json not found. Run analyze.py first.")
         exit(1)
 
 
+def save_figure(fig, filename: str, post_script: Optional[str] = None):
+    """Write a figure as HTML to VIZ_DIR (created if needed), with an optional script run after plotting."""
+    VIZ_DIR.mkdir(parents=True, exist_ok=True)
+    with profiling.span('write_html'):
+        fig.write_html(str(VIZ_DIR / filename), post_script=post_script)
+
+
 # ============================================================================
 # Visualization 1: Dashboard Overview
 # ============================================================================
 
 def create_dashboard(proposals: List[Dict[str, Any]]):
     """Create combined dashboard with multiple views."""
+    from plotly.subplots import make_subplots
     print("Creating dashboard overview...")
 
     fig = make_subplots(
@@ -152,7 +171,7 @@ def create_dashboard(proposals: List[Dict[str, Any]]):
         showlegend=False
     )
 
-    fig.write_html(str(VIZ_DIR / 'dashboard.html'))
+    save_figure(fig, 'dashboard.html')
     print(f"✓ Saved dashboard.html")
 
 
@@ -162,6 +181,7 @@ def create_dashboard(proposals: List[Dict[str, Any]]):
 
 def create_treemap(proposals: List[Dict[str, Any]]):
     """Create hierarchical treemap."""
+    import pandas as pd
     print("Creating treemap...")
 
     # Prepare data
@@ -214,7 +234,7 @@ def create_treemap(proposals: List[Dict[str, Any]]):
         height=900
     )
 
-    fig.write_html(str(VIZ_DIR / 'treemap.html'))
+    save_figure(fig, 'treemap.html')
     print(f"✓ Saved treemap.html")
 
 
@@ -224,6 +244,8 @@ def create_treemap(proposals: List[Dict[str, Any]]):
 
 def create_sunburst(proposals: List[Dict[str, Any]]):
     """Create sunburst chart."""
+    import pandas as pd
+    import plotly.express as px
     print("Creating sunburst chart...")
 
     df = pd.DataFrame([{
@@ -242,7 +264,7 @@ def create_sunburst(proposals: List[Dict[str, Any]]):
 
     fig.update_traces(textinfo='label+percent parent')
 
-    fig.write_html(str(VIZ_DIR / 'sunburst.html'))
+    save_figure(fig, 'sunburst.html')
     print(f"✓ Saved sunburst.html")
 
 
@@ -250,92 +272,181 @@ def create_sunburst(proposals: List[Dict[str, Any]]):
 # Visualization 4: Network Graph
 # ============================================================================
 
-def create_network_graph(proposals: List[Dict[str, Any]]):
-    """Create network graph showing relationships."""
-    print("Creating network graph...")
-
-    # Build co-occurrence matrix for business use cases
-    company_systems = defaultdict(set)
-    for p in proposals:
-        company_systems[p['company']].add(p.get('business_use_case', 'Unknown'))
-
-    # Count co-occurrences
-    system_types = list(set(p.get('business_use_case', 'Unknown') for p in proposals))
-    cooccurrence = defaultdict(int)
-
-    for company, systems in company_systems.items():
-        systems_list = list(systems)
-        for i, s1 in enumerate(systems_list):
-            for s2 in systems_list[i+1:]:
-                pair = tuple(sorted([s1, s2]))
-                cooccurrence[pair] += 1
-
-    # Create edges (only if 2+ companies have both)
-    edges = [(s1, s2, weight) for (s1, s2), weight in cooccurrence.items() if weight >= 2]
-
-    # Calculate node sizes
-    node_sizes = count_values(proposals, 'business_use_case')
-
-    # Create circular layout
-    n = len(system_types)
-    positions = {}
-    for i, st in enumerate(system_types):
-        angle = 2 * math.pi * i / n
-        positions[st] = (math.cos(angle), math.sin(angle))
-
-    # Create edge traces
-    edge_traces = []
-    for s1, s2, weight in edges:
-        if s1 in positions and s2 in positions:
-            x0, y0 = positions[s1]
-            x1, y1 = positions[s2]
-            edge_traces.append(
-                go.Scatter(
-                    x=[x0, x1, None],
-                    y=[y0, y1, None],
-                    mode='lines',
-                    line=dict(width=weight*0.5, color='rgba(125,125,125,0.3)'),
-                    hoverinfo='none',
-                    showlegend=False
-                )
-            )
-
-    # Create node trace
-    node_x = [positions[st][0] for st in system_types if st in positions]
-    node_y = [positions[st][1] for st in system_types if st in positions]
-    node_size = [node_sizes.get(st, 1) for st in system_types if st in positions]
-
-    node_trace = go.Scatter(
-        x=node_x,
-        y=node_y,
-        mode='markers+text',
-        text=[st[:25] for st in system_types if st in positions],
-        textposition='top center',
-        marker=dict(
-            size=[s*0.5 for s in node_size],
-            color=node_size,
-            colorscale='Viridis',
-            showscale=True,
-            colorbar=dict(title="Proposals"),
-            line=dict(width=2, color='white')
-        ),
-        hovertemplate='<b>%{text}</b><br>Proposals: %{marker.color}<extra></extra>'
-    )
+NETWORK_DIMENSIONS = ['business_use_case']  # Default of --network-dimension
+NETWORK_MIN_COMPANIES = 2    # Edges need at least this many companies with both values
+NETWORK_MAX_NODES = 150      # Most frequent values shown (the layout is quadratic in nodes)
+LAYOUT_ITERATIONS = 300
+INCIDENCE_CHUNK_CELLS = 1 << 24  # Incidence matrix cells multiplied at once
+
+
+def incidence(proposals: List[Dict[str, Any]], field: str):
+    """
+    Company × value incidence of a field (multi-value labels split).
+
+    Returns:
+        (values, companies, value_codes, proposal_counts): distinct values, and
+        for every distinct (company, value) pair the company and value code
+        (sorted by company), plus the number of proposals with each value
+    """
+    import numpy as np
+    values, rows, value_codes = split_values(field, *encode_dimension(proposals, field))
+    _, company_codes = encode_dimension(proposals, 'company')
+    proposal_counts = np.bincount(value_codes, minlength=len(values))
+
+    pairs = np.unique(company_codes[rows] * len(values) + value_codes)
+    return values, pairs // len(values), pairs % len(values), proposal_counts
+
+
+def cooccurrence(companies, value_codes, num_values: int):
+    """
+    Companies with both values of every pair, as the product BᵀB of the
+    binary company × value incidence matrix B (in chunks of companies).
+    The diagonal holds the companies with each value.
+    """
+    import numpy as np
+    counts = np.zeros((num_values, num_values))
+    if len(companies) == 0:
+        return counts
+    num_companies = int(companies[-1]) + 1
+    chunk = max(1, INCIDENCE_CHUNK_CELLS // max(num_values, 1))
+    for first in range(0, num_companies, chunk):
+        lo, hi = np.searchsorted(companies, [first, first + chunk])
+        block = np.zeros((min(chunk, num_companies - first), num_values), dtype=np.float32)
+        block[companies[lo:hi] - first, value_codes[lo:hi]] = 1
+        counts += block.T @ block
+    return counts
+
+
+def force_layout(weights, iterations: int = LAYOUT_ITERATIONS, seed: int = 0):
+    """
+    Fruchterman-Reingold layout of a weighted graph, vectorized over all node
+    pairs: nodes repel each other, edges pull their nodes together in
+    proportion to their weight, and a weak pull toward the center keeps
+    unconnected nodes in view.
+
+    Args:
+        weights: Symmetric (n, n) array of edge weights (0: no edge)
+
+    Returns:
+        numpy array of shape (n, 2) scaled to [-1, 1]
+    """
+    import numpy as np
+    n = len(weights)
+    if n < 2:
+        return np.zeros((n, 2))
+    rng = np.random.default_rng(seed)
+    positions = rng.uniform(-1, 1, (n, 2))
+    attraction = weights / weights.max() if weights.max() > 0 else weights
+    k = 2 / math.sqrt(n)  # Ideal distance between nodes in the [-1, 1] square
+    temperature = 0.2
+
+    for _ in range(iterations):
+        delta = positions[:, None, :] - positions[None, :, :]
+        distance = np.maximum(np.linalg.norm(delta, axis=-1), 1e-3)
+        force = k * k / distance ** 2 - attraction * distance / k
+        np.fill_diagonal(force, 0)
+        displacement = (delta * force[..., None]).sum(axis=1) - 0.05 * positions / k
+        length = np.maximum(np.linalg.norm(displacement, axis=1, keepdims=True), 1e-9)
+        positions += displacement / length * np.minimum(length, temperature)
+        temperature -= 0.2 / iterations
+
+    positions -= positions.mean(axis=0)
+    return positions / (np.abs(positions).max() or 1)
+
+
+def create_network_graph(proposals: List[Dict[str, Any]], dimensions: Optional[List[str]] = None):
+    """
+    Create a co-occurrence network per dimension: one node per value, edges
+    between values that at least NETWORK_MIN_COMPANIES companies both have.
+
+    Args:
+        proposals: Classified proposals
+        dimensions: Fields to draw (default: NETWORK_DIMENSIONS); network.html
+            for business_use_case, network_<field>.html for the others
+    """
+    import numpy as np
+
+    for field in dimensions or NETWORK_DIMENSIONS:
+        title = field.replace('_', ' ').title()
+        print(f"Creating network graph ({title})...")
+
+        values, companies, value_codes, proposal_counts = incidence(proposals, field)
+        shown = np.argsort(-proposal_counts, kind='stable')[:NETWORK_MAX_NODES]
+        if len(values) > len(shown):
+            print(f"  Showing the {len(shown)} most frequent of {len(values)} values")
+        remap = np.full(len(values), -1)
+        remap[shown] = np.arange(len(shown))
+        kept = remap[value_codes] >= 0
+        counts = cooccurrence(companies[kept], remap[value_codes[kept]], len(shown))
+
+        np.fill_diagonal(counts, 0)
+        weights = np.where(counts >= NETWORK_MIN_COMPANIES, counts, 0)
+        positions = force_layout(weights)
+        labels = [str(values[i]) for i in shown]
+        sizes = proposal_counts[shown]
+
+        # All edges in one trace (None separates the segments), with a hover
+        # marker at each edge's midpoint
+        sources, targets = np.nonzero(np.triu(weights))
+        edge_x = np.full(3 * len(sources), None, dtype=object)
+        edge_y = np.full(3 * len(sources), None, dtype=object)
+        edge_x[0::3], edge_x[1::3] = positions[sources, 0], positions[targets, 0]
+        edge_y[0::3], edge_y[1::3] = positions[sources, 1], positions[targets, 1]
+        edge_weights = weights[sources, targets]
+        edge_trace = go.Scatter(
+            x=edge_x.tolist(),
+            y=edge_y.tolist(),
+            mode='lines',
+            line=dict(width=1, color='rgba(125,125,125,0.3)'),
+            hoverinfo='none',
+            showlegend=False
+        )
+        midpoint_trace = go.Scatter(
+            x=(positions[sources, 0] + positions[targets, 0]) / 2,
+            y=(positions[sources, 1] + positions[targets, 1]) / 2,
+            mode='markers',
+            marker=dict(size=4 + 8 * np.sqrt(edge_weights / edge_weights.max()) if len(sources) else 4,
+                        color='rgba(125,125,125,0.5)'),
+            text=[f"{labels[a]} — {labels[b]}" for a, b in zip(sources, targets)],
+            customdata=edge_weights.astype(int),
+            hovertemplate='%{text}<br>Companies with both: %{customdata}<extra></extra>',
+            showlegend=False
+        )
 
-    fig = go.Figure(data=edge_traces + [node_trace])
+        node_trace = go.Scatter(
+            x=positions[:, 0],
+            y=positions[:, 1],
+            mode='markers+text',
+            text=[label[:25] for label in labels],
+            customdata=labels,
+            textposition='top center',
+            marker=dict(
+                size=10 + 40 * np.sqrt(sizes / max(sizes.max(), 1)),
+                color=sizes,
+                colorscale='Viridis',
+                showscale=True,
+                colorbar=dict(title="Proposals"),
+                line=dict(width=2, color='white')
+            ),
+            hovertemplate='<b>%{customdata}</b><br>Proposals: %{marker.color}<extra></extra>'
+        )
 
-    fig.update_layout(
-        title='Network View: Business Use Case Co-occurrence<br><sub>Node size = # proposals; Edge thickness = # companies with both types</sub>',
-        showlegend=False,
-        hovermode='closest',
-        width=1300,
-        height=1300,
-        xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
-        yaxis=dict(showgrid=False, zeroline=False, showticklabels=False)
-    )
+        fig = go.Figure(data=[edge_trace, midpoint_trace, node_trace])
+        fig.update_layout(
+            title=f'Network View: {title} Co-occurrence<br><sub>Node size = # proposals; '
+                  f'edges join values that {NETWORK_MIN_COMPANIES}+ companies both have '
+                  f'(hover an edge midpoint for the count)</sub>',
+            showlegend=False,
+            hovermode='closest',
+            width=1300,
+            height=1300,
+            xaxis=dict(showgrid=False, zeroline=False, showticklabels=False),
+            yaxis=dict(showgrid=False, zeroline=False, showticklabels=False)
+        )
 
-    fig.write_html(str(VIZ_DIR / 'network.html'))
-    print(f"✓ Saved network.html")
+        filename = 'network.html' if field == 'business_use_case' else f'network_{field}.html'
+        save_figure(fig, filename)
+        print(f"✓ Saved {filename} ({len(labels)} nodes, {len(sources)} edges)")
 
 
 # ============================================================================
@@ -380,7 +491,7 @@ def create_heatmap(proposals: List[Dict[str, Any]]):
         xaxis=dict(tickangle=-45)
     )
 
-    fig.write_html(str(VIZ_DIR / 'heatmap.html'))
+    save_figure(fig, 'heatmap.html')
     print(f"✓ Saved heatmap.html")
 
 
@@ -390,6 +501,7 @@ def create_heatmap(proposals: List[Dict[str, Any]]):
 
 def create_architecture_breakdown(proposals: List[Dict[str, Any]]):
     """Create detailed architecture breakdown."""
+    from plotly.subplots import make_subplots
     print("Creating architecture breakdown...")
 
     fig = make_subplots(
@@ -497,48 +609,253 @@ def create_architecture_breakdown(proposals: List[Dict[str, Any]]):
         showlegend=False
     )
 
-    fig.write_html(str(VIZ_DIR / 'architecture_breakdown.html'))
+    save_figure(fig, 'architecture_breakdown.html')
     print(f"✓ Saved architecture_breakdown.html")
 
 
+# ============================================================================
+# Visualization 7: Proposal Explorer
+# ============================================================================
+
+EXPLORER_COLOR = 'architecture_pattern'  # One trace (and legend entry) per value
+EXPLORER_MAX_TRACES = 12                 # Rarer values share an 'Other' trace
+EXPLORER_JITTER = 0.01                   # Std. dev. of jitter, as a share of each axis' spread
+MAX_TABLE_CELLS = 1 << 24                # Larger contingency tables are summed in chunks
+
+# Shows the details of the hovered proposal in a panel. They are stored as one
+# JSON string (names plus dimension value codes, base64) that is only parsed
+# on the first hover, so the plot renders as fast as without them.
+EXPLORER_HOVER_SCRIPT = """
+var plot = document.getElementById('{plot_id}');
+var panel = document.createElement('div');
+panel.style.cssText = 'position:fixed;top:90px;right:24px;max-width:380px;padding:10px 14px;' +
+    'background:rgba(255,255,255,0.95);border:1px solid #ccc;border-radius:6px;' +
+    'font:12px sans-serif;display:none;z-index:10;pointer-events:none';
+document.body.appendChild(panel);
+var details = null, codes = {};
+function escapeHtml(text) {
+    return String(text).replace(/[&<>"]/g, function (c) {
+        return {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'}[c];
+    });
+}
+function valueCode(field, index) {
+    if (!codes[field]) {
+        var bytes = Uint8Array.from(atob(details.codes[field]), function (c) { return c.charCodeAt(0); });
+        codes[field] = new window[details.code_type](bytes.buffer);
+    }
+    return codes[field][index];
+}
+plot.on('plotly_hover', function (event) {
+    if (details === null) {
+        details = JSON.parse(EXPLORER_DETAILS);
+        details.names = details.names.split('\\n');
+    }
+    var index = event.points[0].customdata;
+    var rows = details.fields.map(function (field) {
+        return '<tr><td style="color:#7f8c8d;padding-right:8px">' + escapeHtml(details.titles[field]) +
+            '</td><td>' + escapeHtml(details.labels[field][valueCode(field, index)]) + '</td></tr>';
+    });
+    panel.innerHTML = '<b>' + escapeHtml(details.names[index]) + '</b><table>' + rows.join('') + '</table>';
+    panel.style.display = 'block';
+});
+plot.on('plotly_unhover', function () { panel.style.display = 'none'; });
+"""
+
+
+def _value_features(field: str, values: List[str]):
+    """
+    Features of a dimension (its values, multi-value labels split) and the
+    weight of each feature in each value, scaled so every value is a unit vector.
+    """
+    import numpy as np
+    features = {}
+    parts = [field_values(field, str(value)) for value in values]
+    for items in parts:
+        for item in items:
+            features.setdefault(item, len(features))
+    weights = np.zeros((len(values), len(features)))
+    for row, items in enumerate(parts):
+        for item in items:
+            weights[row, features[item]] += 1 / math.sqrt(len(items))
+    return weights
+
+
+def _contingency(codes_a, size_a: int, codes_b, size_b: int):
+    """Proposals per (value of a, value of b)."""
+    import numpy as np
+    if size_a * size_b <= MAX_TABLE_CELLS:
+        return np.bincount(codes_a * size_b + codes_b, minlength=size_a * size_b).reshape(size_a, size_b)
+    # Too many cells to count at once: count the pairs that occur
+    cells, counts = np.unique(codes_a * size_b + codes_b, return_counts=True)
+    table = {}
+    for cell, count in zip(cells.tolist(), counts.tolist()):
+        table[divmod(cell, size_b)] = count
+    return table
+
+
+def project_dimensions(proposals: List[Dict[str, Any]], dimensions: List[str]):
+    """
+    Project proposals onto the first two principal components of their
+    classification vectors.
+
+    Each dimension contributes one feature per value (the labels of
+    multi-value fields split). The covariance of the features is assembled from the contingency
+    tables of every pair of dimensions, so the proposals × features matrix is
+    never built and time grows linearly with the number of proposals.
+
+    Returns:
+        numpy array of shape (len(proposals), 2)
+    """
+    import numpy as np
+    n = len(proposals)
+    encoded = [encode_dimension(proposals, field) for field in dimensions]
+    weights = [_value_features(field, values) for field, (values, _) in zip(dimensions, encoded)]
+    bounds = np.cumsum([0] + [w.shape[1] for w in weights])
+    gram = np.zeros((bounds[-1], bounds[-1]))
+    mean = np.zeros(bounds[-1])
+
+    for a, ((values_a, codes_a), w_a) in enumerate(zip(encoded, weights)):
+        block_a = slice(bounds[a], bounds[a + 1])
+        counts = np.bincount(codes_a, minlength=len(values_a))
+        mean[block_a] = counts @ w_a / n
+        gram[block_a, block_a] = w_a.T @ (counts[:, None] * w_a)
+        for b in range(a + 1, len(encoded)):
+            (values_b, codes_b), w_b = encoded[b], weights[b]
+            table = _contingency(codes_a, len(values_a), codes_b, len(values_b))
+            if isinstance(table, dict):
+                block = sum(count * np.outer(w_a[i], w_b[j]) for (i, j), count in table.items())
+            else:
+                block = w_a.T @ table @ w_b
+            gram[block_a, bounds[b]:bounds[b + 1]] = block
+            gram[bounds[b]:bounds[b + 1], block_a] = block.T
+
+    covariance = gram / n - np.outer(mean, mean)
+    _, vectors = np.linalg.eigh(covariance)
+    components = vectors[:, [-1, -2]]  # Largest eigenvalue first
+
+    coordinates = np.tile(-(mean @ components), (n, 1))
+    for (_, codes), w, start, end in zip(encoded, weights, bounds, bounds[1:]):
+        coordinates += (w @ components[start:end])[codes]
+    return coordinates
+
+
+def create_explorer(proposals: List[Dict[str, Any]]):
+    """
+    Create a per-proposal scatter of the 2-D projection of all classification
+    dimensions (WebGL, so it stays interactive at 1M points).
+    """
+    import numpy as np
+    print("Creating proposal explorer...")
+
+    coordinates = project_dimensions(proposals, CLASSIFICATION_DIMENSIONS)
+    # Proposals with identical classifications would hide each other
+    rng = np.random.default_rng(0)
+    coordinates += rng.normal(size=coordinates.shape) * (EXPLORER_JITTER * coordinates.std(axis=0) + 1e-9)
+    coordinates = coordinates.astype(np.float32)
+
+    colors, color_codes = encode_dimension(proposals, EXPLORER_COLOR)
+    counts = np.bincount(color_codes, minlength=len(colors))
+    order = np.argsort(-counts, kind='stable')
+    shown = order[:EXPLORER_MAX_TRACES]
+    groups = [(colors[code], np.flatnonzero(color_codes == code)) for code in shown]
+    if len(order) > EXPLORER_MAX_TRACES:
+        groups.append(('Other', np.flatnonzero(~np.isin(color_codes, shown))))
+
+    traces = [
+        go.Scattergl(
+            x=coordinates[indices, 0],
+            y=coordinates[indices, 1],
+            customdata=indices.astype(np.int32),
+            mode='markers',
+            name=f"{label[:40]} ({len(indices):,})",
+            marker=dict(size=4, opacity=0.6),
+            hoverinfo='none'
+        )
+        for label, indices in groups
+    ]
+
+    # Hover details: names and the value code of every dimension (smallest unsigned type)
+    encoded = {field: encode_dimension(proposals, field) for field in CLASSIFICATION_DIMENSIONS}
+    largest = max(len(values) for values, _ in encoded.values())
+    code_type, dtype = next((name, t) for name, t, limit in
+                            [('Uint8Array', np.uint8, 1 << 8), ('Uint16Array', np.uint16, 1 << 16),
+                             ('Uint32Array', np.uint32, 1 << 32)] if largest <= limit)
+    details = {
+        'names': '\n'.join(f"{p.get('company')}: {p.get('proposal_name')}".replace('\n', ' ') for p in proposals),
+        'fields': CLASSIFICATION_DIMENSIONS,
+        'titles': {field: field.replace('_', ' ').title() for field in CLASSIFICATION_DIMENSIONS},
+        'labels': {field: values for field, (values, _) in encoded.items()},
+        'codes': {field: base64.b64encode(codes.astype(dtype).tobytes()).decode('ascii')
+                  for field, (_, codes) in encoded.items()},
+        'code_type': code_type,
+    }
+    # A JS string literal holding the JSON (parsed on first hover; '</' would end the <script>)
+    source = json.dumps(json.dumps(details, ensure_ascii=False, separators=(',', ':'))).replace('</', '<\\/')
+
+    fig = go.Figure(data=traces)
+    fig.update_layout(
+        title=f'Proposal Explorer: {len(proposals):,} proposals by classification similarity'
+              f'<br><sub>2-D projection of all {len(CLASSIFICATION_DIMENSIONS)} dimensions; '
+              f'color = {EXPLORER_COLOR.replace("_", " ").title()}; hover a point for its details</sub>',
+        width=1400,
+        height=1000,
+        hovermode='closest',
+        legend=dict(itemsizing='constant'),
+        xaxis=dict(title='Component 1', zeroline=False),
+        yaxis=dict(title='Component 2', zeroline=False)
+    )
+
+    save_figure(fig, 'explorer.html',
+                post_script=f"var EXPLORER_DETAILS = {source};\n{EXPLORER_HOVER_SCRIPT}")
+    print(f"✓ Saved explorer.html")
+
+
 # ============================================================================
 # Main
 # ============================================================================
 
+# --only names, in generation order
+VISUALIZATIONS = {
+    'dashboard': create_dashboard,
+    'treemap': create_treemap,
+    'sunburst': create_sunburst,
+    'network': create_network_graph,
+    'heatmap': create_heatmap,
+    'architecture': create_architecture_breakdown,
+    'explorer': create_explorer,
+}
+
+
 def main():
     parser = argparse.ArgumentParser(description='Generate visualizations')
-    parser.add_argument('--only', choices=['dashboard', 'treemap', 'sunburst', 'network', 'heatmap', 'architecture'],
+    parser.add_argument('--only', choices=list(VISUALIZATIONS),
                        help='Generate only specific visualization')
+    parser.add_argument('--network-dimension', action='append', metavar='FIELD',
+                        help='Draw the co-occurrence network of this field (repeatable; default: '
+                             f'{", ".join(NETWORK_DIMENSIONS)})')
+    parser.add_argument('--profile', nargs='?', const='spans', choices=['spans', 'sample'],
+                        help='Time every visualization; "--profile sample" also samples stacks for a '
+                             'flamegraph and hotspot report (written to outputs/profile/)')
 
     args = parser.parse_args()
+    if args.profile:
+        profiling.start('visualize', sample=args.profile == 'sample')
 
     print("\n" + "="*80)
     print("GENERATING VISUALIZATIONS")
     print("="*80)
 
-    proposals = load_proposals()
+    with profiling.span('load_proposals'):
+        proposals = load_proposals()
     print(f"\nLoaded {len(proposals)} proposals")
 
-    if args.only:
-        if args.only == 'dashboard':
-            create_dashboard(proposals)
-        elif args.only == 'treemap':
-            create_treemap(proposals)
-        elif args.only == 'sunburst':
-            create_sunburst(proposals)
-        elif args.only == 'network':
-            create_network_graph(proposals)
-        elif args.only == 'heatmap':
-            create_heatmap(proposals)
-        elif args.only == 'architecture':
-            create_architecture_breakdown(proposals)
-    else:
-        create_dashboard(proposals)
-        create_treemap(proposals)
-        create_sunburst(proposals)
-        create_network_graph(proposals)
-        create_heatmap(proposals)
-        create_architecture_breakdown(proposals)
+    options = {'network': {'dimensions': args.network_dimension}}
+    for name, create in VISUALIZATIONS.items():
+        if args.only in (None, name):
+            with profiling.span(create.__name__):
+                create(proposals, **options.get(name, {}))
+
+    profiling.stop(OUTPUTS_DIR / 'profile')
 
     print("\n" + "="*80)
     print("VISUALIZATIONS COMPLETE!")
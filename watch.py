@@ -0,0 +1,68 @@
+"""
+Change detection for the companies directory (analyze.py --watch).
+
+Polls the proposal file of every company (see company_proposal_files) and
+reports which companies changed: a file was added, removed, replaced by a
+refined version, or modified. Polling a few hundred small files every few
+seconds is cheap and works the same on every platform and on network
+mounts, where inotify events are unreliable.
+
+New proposals usually arrive as a burst of writes (git pull, a batch of
+refinement runs), so changes are debounced: a change is only reported once
+the directory has been quiet for `debounce` seconds.
+"""
+
+import time
+from pathlib import Path
+from typing import Dict, Set, Tuple, Optional
+from utils import company_proposal_files
+
+DEFAULT_INTERVAL = 5.0   # seconds between polls
+DEFAULT_DEBOUNCE = 10.0  # seconds without changes before an update runs
+
+# company -> (proposals file, mtime in ns, size)
+Snapshot = Dict[str, Tuple[str, int, int]]
+
+
+def snapshot(companies_dir: Optional[Path] = None) -> Snapshot:
+    """Current proposal file, modification time and size of every company."""
+    state = {}
+    for company, path in company_proposal_files(companies_dir).items():
+        try:
+            stat = path.stat()
+        except OSError:
+            continue  # Removed between glob and stat
+        state[company] = (str(path), stat.st_mtime_ns, stat.st_size)
+    return state
+
+
+def changed_companies(before: Snapshot, after: Snapshot) -> Set[str]:
+    """Companies added, removed or modified between two snapshots."""
+    return {company for company in before.keys() | after.keys()
+            if before.get(company) != after.get(company)}
+
+
+def wait_for_changes(before: Snapshot, companies_dir: Optional[Path] = None,
+                     interval: float = DEFAULT_INTERVAL,
+                     debounce: float = DEFAULT_DEBOUNCE) -> Tuple[Snapshot, Set[str]]:
+    """
+    Block until companies changed and the directory has been quiet for
+    `debounce` seconds.
+
+    Returns:
+        The new snapshot and the companies that changed since `before`
+    """
+    current = before
+    last_change = None
+    while True:
+        time.sleep(interval)
+        latest = snapshot(companies_dir)
+        if latest != current:
+            current = latest
+            last_change = time.monotonic()
+        elif last_change is not None and time.monotonic() - last_change >= debounce:
+            changed = changed_companies(before, current)
+            if changed:
+                return current, changed
+            # Changes were reverted before the debounce expired
+            last_change = None